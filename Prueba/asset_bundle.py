@@ -0,0 +1,253 @@
+# ========================================
+# PAQUETE DE IMÁGENES DEL ARCADE
+# ========================================
+# Este módulo junta todas las imágenes de Prueba/images en un solo archivo
+# (images.bundle) para las máquinas con almacenamiento flash lento:
+# - Paso de construcción: cada imagen se guarda tal cual (PNG) y, opcional-
+#   mente, ya escalada y decodificada (píxeles ARGB32 listos para Qt) para
+#   los tamaños en que la muestra la interfaz
+# - Un índice al final del archivo da nombre, variante, tamaño y posición
+#   de cada entrada
+# - En ejecución el paquete se mapea en memoria una sola vez (lectura
+#   secuencial anticipada) y las imágenes se construyen directamente sobre
+#   los bytes mapeados: no hay una apertura de archivo por imagen
+#
+# Si el paquete no existe (o le falta una imagen) get_bundle().pixmap()
+# devuelve None y la interfaz carga el archivo de images/ como antes.
+#
+# Formato (little endian):
+# - Cabecera: b"ARCB", versión (u8), número de entradas (u32), posición del
+#   índice (u64)
+# - Datos de cada entrada, alineados a 16 bytes
+# - Índice: por entrada, largo del nombre (u16), nombre (UTF-8), tipo (u8),
+#   ancho (u16), alto (u16), bytes por línea (u32), posición (u64), tamaño (u64)
+#
+# Uso:
+#     python asset_bundle.py                     # images/ -> images.bundle
+#     python asset_bundle.py --scale 300 --scale 150
+#     python asset_bundle.py --no-raw            # solo los PNG originales
+
+import argparse                                # Opciones de la línea de comandos
+import mmap                                    # Lectura sin copias del paquete
+import os                                      # Rutas y escritura atómica
+import struct                                  # Cabecera e índice binarios
+
+# ========================================
+# CONSTANTES DEL FORMATO
+# ========================================
+MAGIA = b"ARCB"                 # Firma del paquete
+VERSION = 1                     # Versión del formato
+ALINEACION = 16                 # Alineación de los datos de cada entrada
+TAMANOS_POR_DEFECTO = (300,)    # Tamaños pre-escalados (show_character usa 300x300)
+
+# Tipos de entrada
+PNG = 0                         # Archivo original, sin tocar
+RAW = 1                         # Píxeles ARGB32 premultiplicados ya escalados
+
+CABECERA = struct.Struct("<4sBIQ")      # magia, versión, entradas, posición del índice
+LARGO_NOMBRE = struct.Struct("<H")      # largo del nombre
+ENTRADA = struct.Struct("<BHHIQQ")      # tipo, ancho, alto, bytes por línea, posición, tamaño
+
+CARPETA_IMAGENES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+RUTA_PAQUETE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images.bundle")
+
+# ========================================
+# CONSTRUCCIÓN DEL PAQUETE
+# ========================================
+def build_bundle(carpeta=CARPETA_IMAGENES, destino=RUTA_PAQUETE, tamanos=TAMANOS_POR_DEFECTO,
+                 raw=True):
+    """
+    Empaqueta todas las imágenes de una carpeta en un solo archivo
+    Args:
+        carpeta: Carpeta con las imágenes (images/)
+        destino: Archivo del paquete a escribir
+        tamanos: Lados máximos de las variantes pre-escaladas (se conserva
+                 la proporción, como hace show_character)
+        raw: Incluir las variantes pre-escaladas y decodificadas
+    Returns:
+        list: (nombre, tipo, ancho, alto, tamaño) de cada entrada escrita
+    """
+    from PyQt5.QtCore import Qt                # Solo hace falta al construir
+    from PyQt5.QtGui import QImage
+
+    datos = bytearray(CABECERA.size)
+    entradas = []
+
+    def agregar(nombre, tipo, ancho, alto, por_linea, contenido):
+        # Alinear el inicio de cada entrada (las líneas RAW quedan alineadas)
+        datos.extend(bytes(-len(datos) % ALINEACION))
+        entradas.append((nombre, tipo, ancho, alto, por_linea, len(datos), len(contenido)))
+        datos.extend(contenido)
+
+    for nombre in sorted(os.listdir(carpeta)):
+        ruta = os.path.join(carpeta, nombre)
+        if not os.path.isfile(ruta):
+            continue
+        with open(ruta, "rb") as archivo:
+            original = archivo.read()
+        imagen = QImage()
+        if not imagen.loadFromData(original):
+            continue                           # No es una imagen que Qt pueda leer
+        agregar(nombre, PNG, imagen.width(), imagen.height(), 0, original)
+
+        if raw:
+            for lado in tamanos:
+                escalada = imagen.scaled(lado, lado, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                escalada = escalada.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+                bits = escalada.constBits()
+                bits.setsize(escalada.byteCount())
+                agregar(nombre, RAW, escalada.width(), escalada.height(),
+                        escalada.bytesPerLine(), bytes(bits))
+
+    # Índice al final y cabecera con su posición
+    posicion_indice = len(datos)
+    for nombre, tipo, ancho, alto, por_linea, posicion, tamano in entradas:
+        nombre_utf8 = nombre.encode("utf-8")
+        datos.extend(LARGO_NOMBRE.pack(len(nombre_utf8)) + nombre_utf8)
+        datos.extend(ENTRADA.pack(tipo, ancho, alto, por_linea, posicion, tamano))
+    CABECERA.pack_into(datos, 0, MAGIA, VERSION, len(entradas), posicion_indice)
+
+    # Escritura atómica: una interfaz abierta nunca ve un paquete a medias
+    temporal = destino + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(datos)
+    os.replace(temporal, destino)
+    return [(nombre, tipo, ancho, alto, tamano) for nombre, tipo, ancho, alto, _, _, tamano in entradas]
+
+# ========================================
+# LECTURA EN EJECUCIÓN
+# ========================================
+class AssetBundle:
+    """
+    Paquete de imágenes mapeado en memoria
+
+    Uso:
+        pixmap = get_bundle().pixmap("mario.png", 300)   # None si no está
+    """
+
+    def __init__(self, ruta=RUTA_PAQUETE):
+        """
+        Mapea el paquete y lee su índice
+        Args:
+            ruta: Archivo construido por build_bundle()
+        Raises:
+            OSError: Si el archivo no existe
+            ValueError: Si no es un paquete de imágenes
+        """
+        with open(ruta, "rb") as archivo:
+            self.mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        # Pedir al sistema que lea todo el archivo de una vez, en orden
+        if hasattr(self.mapa, "madvise"):
+            self.mapa.madvise(mmap.MADV_WILLNEED)
+        magia, version, cantidad, posicion = CABECERA.unpack_from(self.mapa, 0)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError(f"not an image bundle: {ruta}")
+
+        self.entradas = {}    # (nombre, tipo, lado) -> (ancho, alto, bytes por línea, posición, tamaño)
+        for _ in range(cantidad):
+            (largo,) = LARGO_NOMBRE.unpack_from(self.mapa, posicion)
+            posicion += LARGO_NOMBRE.size
+            nombre = self.mapa[posicion:posicion + largo].decode("utf-8")
+            posicion += largo
+            tipo, ancho, alto, por_linea, inicio, tamano = ENTRADA.unpack_from(self.mapa, posicion)
+            posicion += ENTRADA.size
+            lado = max(ancho, alto) if tipo == RAW else None
+            self.entradas[(nombre, tipo, lado)] = (ancho, alto, por_linea, inicio, tamano)
+
+    def datos(self, nombre):
+        """
+        Bytes originales (PNG) de una imagen, sin copiarlos
+        Returns:
+            memoryview: Porción del mapa, o None si la imagen no está
+        """
+        entrada = self.entradas.get((nombre, PNG, None))
+        if entrada is None:
+            return None
+        _, _, _, inicio, tamano = entrada
+        return memoryview(self.mapa)[inicio:inicio + tamano]
+
+    def image(self, nombre, lado):
+        """
+        Variante pre-escalada de una imagen, construida sobre el mapa
+        Args:
+            nombre: Nombre del archivo en images/
+            lado: Lado máximo con el que se construyó el paquete
+        Returns:
+            QImage: Imagen que usa los bytes mapeados (sin decodificar ni
+                    copiar), o None si el paquete no tiene esa variante
+        """
+        from PyQt5.QtGui import QImage
+        entrada = self.entradas.get((nombre, RAW, lado))
+        if entrada is None:
+            return None
+        ancho, alto, por_linea, inicio, tamano = entrada
+        # La QImage apunta al mapa, que vive tanto como el paquete
+        return QImage(memoryview(self.mapa)[inicio:inicio + tamano], ancho, alto, por_linea,
+                      QImage.Format_ARGB32_Premultiplied)
+
+    def pixmap(self, nombre, lado=None):
+        """
+        Pixmap listo para mostrar, desde el paquete
+        Args:
+            nombre: Nombre del archivo en images/
+            lado: Lado máximo deseado (proporción conservada); None = original
+        Returns:
+            QPixmap: La imagen, o None si no está en el paquete. Sin variante
+                     pre-escalada se decodifica el PNG y se escala aquí
+        """
+        from PyQt5.QtCore import Qt
+        from PyQt5.QtGui import QPixmap
+        if lado is not None:
+            imagen = self.image(nombre, lado)
+            if imagen is not None:
+                return QPixmap.fromImage(imagen)
+        datos = self.datos(nombre)
+        if datos is None:
+            return None
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(bytes(datos)):
+            return None
+        if lado is not None:
+            pixmap = pixmap.scaled(lado, lado, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return pixmap
+
+# ========================================
+# PAQUETE GLOBAL DEL PROCESO
+# ========================================
+_paquete_global = None
+_paquete_buscado = False
+
+def get_bundle():
+    """
+    Paquete de imágenes del proceso, abierto la primera vez que se pide
+    Returns:
+        AssetBundle: El paquete, o None si no se construyó (se usan los
+                     archivos de images/)
+    """
+    global _paquete_global, _paquete_buscado
+    if not _paquete_buscado:
+        _paquete_buscado = True
+        try:
+            _paquete_global = AssetBundle()
+        except (OSError, ValueError):
+            _paquete_global = None
+    return _paquete_global
+
+# ========================================
+# PUNTO DE ENTRADA (PASO DE CONSTRUCCIÓN)
+# ========================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pack the arcade images into one bundle file")
+    parser.add_argument("--images", default=CARPETA_IMAGENES, help="folder with the images")
+    parser.add_argument("--output", default=RUTA_PAQUETE, help="bundle file to write")
+    parser.add_argument("--scale", type=int, action="append",
+                        help="pre-scaled size to include (repeatable, default 300)")
+    parser.add_argument("--no-raw", action="store_true",
+                        help="only pack the original files, without pre-scaled variants")
+    opciones = parser.parse_args()
+
+    for nombre, tipo, ancho, alto, tamano in build_bundle(
+            opciones.images, opciones.output, tuple(opciones.scale or TAMANOS_POR_DEFECTO),
+            not opciones.no_raw):
+        print(f"{nombre:20} {'png' if tipo == PNG else 'raw':4} {ancho:5}x{alto:<5} {tamano:>10} bytes")
+    print(f"{opciones.output}: {os.path.getsize(opciones.output)} bytes")
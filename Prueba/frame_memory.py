@@ -0,0 +1,186 @@
+"""
+========================================
+FRAME ALLOCATION COUNTERS AND GC CONTROL
+========================================
+
+This file keeps garbage collection pauses out of the game loop and makes
+per-frame allocations visible:
+
+- Allocation-free mode (controlar_gc=True): once setup is done, every
+  object alive is moved to the permanent generation with gc.freeze(), the
+  cyclic collector is disabled for the whole game, and a collection only
+  runs between pieces (right after a frame showing a new locked piece)
+- Counters: after every presented frame, the net growth of live memory
+  blocks (sys.getallocatedblocks()) and of objects tracked by the cyclic
+  collector (gc.get_count()) since the previous frame are stored in a
+  preallocated ring, so counting allocates nothing itself; with the
+  collector disabled, garbage that only a collection can free (reference
+  cycles) shows up as steady growth
+- A report gives per-frame percentiles, the number of collections and the
+  collection pauses, so allocation regressions show up as numbers
+
+Both counters are process-wide: allocations made by the simulation thread
+are included. Blocks freed within the same frame do not count, only the
+ones still alive when the next frame is presented.
+
+Author: Game Implementation
+Purpose: Keep GC pauses from dropping frames and catch allocation regressions
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import array        # Preallocated sample rings
+import gc           # Freeze, disable and collect
+import json         # Report output
+import sys          # Allocated block count and report to stdout
+import time         # Collection pauses
+
+from input_latency import percentil
+
+# ========================================
+# MEASUREMENT CONFIGURATION CONSTANTS
+# ========================================
+
+FRAMES_MAXIMOS = 10000    # Most recent frames kept in the sample rings
+
+# ========================================
+# FRAME MEMORY CLASS
+# ========================================
+
+class MemoriaFrames:
+    """
+    Per-frame allocation counters with optional GC control.
+
+    Usage in a game loop:
+        memoria.preparar()             # setup done, play starts
+        ...
+        pygame.display.flip()
+        memoria.frame()                # one sample per presented frame
+        if a_piece_locked:
+            memoria.entre_piezas()     # the only collections during play
+        ...
+        memoria.terminar()
+    """
+
+    def __init__(self, controlar_gc=True, frames=FRAMES_MAXIMOS):
+        """
+        Initialize the counters.
+
+        Args:
+            controlar_gc (bool): Freeze, disable and collect between pieces
+                (False only counts, with the collector left as it is)
+            frames (int): Number of frame samples kept
+        """
+        self.controlar_gc = controlar_gc
+        self._bloques = array.array("q", bytes(8 * frames))   # Block growth per frame
+        self._objetos = array.array("q", bytes(8 * frames))   # GC object growth per frame
+        self._frames = 0                                      # Frames counted so far
+        self._ultimos_bloques = 0
+        self._ultimos_objetos = 0
+        self._ultimas_colecciones = 0
+        self.colecciones = 0          # Collections during play (any trigger)
+        self.pausas = []              # Seconds spent in each collection
+        self._inicio_coleccion = 0.0
+        self.congelados = 0           # Objects moved to the permanent generation
+
+    # ========================================
+    # GAME LOOP HOOKS
+    # ========================================
+
+    def preparar(self):
+        """Setup is done: freeze what exists and stop automatic collections."""
+        if self.controlar_gc:
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+            self.congelados = gc.get_freeze_count()
+        gc.callbacks.append(self._coleccion)
+        self._ultimos_bloques = sys.getallocatedblocks()
+        self._ultimos_objetos = gc.get_count()[0]
+
+    def frame(self):
+        """Record the allocations since the previous presented frame."""
+        bloques = sys.getallocatedblocks()
+        objetos = gc.get_count()[0]
+        indice = self._frames % len(self._bloques)
+        self._bloques[indice] = bloques - self._ultimos_bloques
+        # The generation 0 count restarts at every collection
+        if self.colecciones != self._ultimas_colecciones:
+            self._objetos[indice] = objetos
+            self._ultimas_colecciones = self.colecciones
+        else:
+            self._objetos[indice] = objetos - self._ultimos_objetos
+        self._ultimos_bloques = bloques
+        self._ultimos_objetos = objetos
+        self._frames += 1
+
+    def entre_piezas(self):
+        """A piece locked: collect now, outside of any frame."""
+        if self.controlar_gc:
+            gc.collect()
+            # Neither the collection nor its pause list count as frame allocations
+            self._ultimos_bloques = sys.getallocatedblocks()
+            self._ultimos_objetos = gc.get_count()[0]
+            self._ultimas_colecciones = self.colecciones
+
+    def terminar(self):
+        """Play is over: give the collector back its normal behaviour."""
+        gc.callbacks.remove(self._coleccion)
+        if self.controlar_gc:
+            gc.enable()
+            gc.unfreeze()
+
+    def _coleccion(self, fase, info):
+        """gc.callbacks hook: time every collection."""
+        if fase == "start":
+            self._inicio_coleccion = time.perf_counter()
+        else:
+            self.colecciones += 1
+            self.pausas.append(time.perf_counter() - self._inicio_coleccion)
+
+    # ========================================
+    # REPORTING
+    # ========================================
+
+    def informe(self):
+        """
+        Build the allocation report.
+
+        Returns:
+            dict: Frames counted, per-frame growth percentiles (blocks and
+                GC-tracked objects), collections and their pauses
+        """
+        cantidad = min(self._frames, len(self._bloques))
+        bloques = self._bloques[:cantidad].tolist()
+        objetos = self._objetos[:cantidad].tolist()
+        return {
+            "gc_controlado": self.controlar_gc,
+            "frames": self._frames,
+            "bloques_por_frame_p50": percentil(bloques, 0.50),
+            "bloques_por_frame_p99": percentil(bloques, 0.99),
+            "bloques_por_frame_max": max(bloques, default=0),
+            "bloques_por_frame_media": sum(bloques) / cantidad if cantidad else 0.0,
+            "objetos_gc_por_frame_p50": percentil(objetos, 0.50),
+            "objetos_gc_por_frame_p99": percentil(objetos, 0.99),
+            "objetos_gc_por_frame_max": max(objetos, default=0),
+            "objetos_congelados": self.congelados,
+            "colecciones": self.colecciones,
+            "pausa_gc_total_ms": sum(self.pausas) * 1000,
+            "pausa_gc_max_ms": max(self.pausas, default=0.0) * 1000,
+        }
+
+    def escribir_informe(self, ruta):
+        """
+        Write the report as JSON.
+
+        Args:
+            ruta (str): Output path, or "-" for stdout
+        """
+        texto = json.dumps(self.informe(), indent=2)
+        if ruta == "-":
+            print(texto, file=sys.stdout)
+        else:
+            with open(ruta, "w") as archivo:
+                archivo.write(texto + "\n")
@@ -15,6 +15,12 @@ from PyQt5.QtGui import (QPainter, QPolygonF, QBrush, QColor, QPen, QPainterPath
 import math                                            # Matemáticas para cálculos trigonométricos
 import random                                          # Generación de números aleatorios
 import os                                             # Operaciones del sistema de archivos
+import profiling                                      # Perfilado opcional (ARCADE_PROFILE)
+import score_store                                    # Historial de puntuaciones y giros (SQLite)
+import telemetry                                      # Eventos estructurados (ARCADE_TELEMETRY)
+import time                                           # Duración de cada giro
+import tracing                                        # Línea de tiempo opcional (ARCADE_TRACE)
+import asset_bundle                                   # Imágenes empaquetadas y mapeadas en memoria
 
 # ========================================
 # CLASE PRINCIPAL - PANTALLA DE JUEGO DE RULETA
@@ -279,12 +285,15 @@ class GameScreen(QMainWindow):
         """
         if not self.spinning:
             self.spinning = True                    # Marcar que está girando
+            self.spin_start = time.perf_counter()   # Inicio del giro (telemetría)
+            self.spin_trace_start = tracing.ahora() # Inicio del giro (línea de tiempo)
             self.spin_timer.start(30)              # Iniciar timer cada 30ms
             QTimer.singleShot(4000, self.stop_spin)  # Detener después de 4 segundos
 
     # ========================================
     # FUNCIÓN DE ACTUALIZACIÓN DEL GIRO
     # ========================================
+    @profiling.profiled
     def update_spin(self):
         """
         Actualiza la rotación de la rueda durante el giro
@@ -293,6 +302,11 @@ class GameScreen(QMainWindow):
         - Aplica transformaciones a todos los segmentos
         - Mantiene el texto legible durante la rotación
         """
+        # Cada tick es un tramo en la línea de tiempo (solo si ARCADE_TRACE)
+        traza = tracing.get_tracer("arcade")
+        if traza:
+            inicio_tick = tracing.ahora()
+        
         self.current_angle += 15  # Incrementar ángulo de rotación
         
         # Definir constantes para el centro y radio de posicionamiento del texto
@@ -347,6 +361,9 @@ class GameScreen(QMainWindow):
                 # Aplicar la misma transformación al texto y su fondo
                 text_item.setTransform(common_text_transform)
                 text_outline_item.setTransform(common_text_transform)
+        
+        if traza:
+            traza.completo("spin_tick", inicio_tick, categoria="spin", angle=self.current_angle)
 
     # ========================================
     # FUNCIÓN PARA DETENER EL GIRO Y SELECCIONAR JUEGO
@@ -358,7 +375,7 @@ class GameScreen(QMainWindow):
         - Calcula el ángulo final de rotación
         - Determina qué segmento está apuntando la flecha (270°)
         - Muestra información del juego seleccionado
-        - Incluye información de debug en consola
+        - Registra el resultado en la telemetría (sin escribir en consola)
         """
         self.spinning = False  # Marcar que ya no está girando
         self.spin_timer.stop()  # Detener el temporizador de animación
@@ -392,16 +409,28 @@ class GameScreen(QMainWindow):
         selected_game = self.games[selected_index]
 
         # ========================================
-        # INFORMACIÓN DE DEBUG (OPCIONAL)
-        # ========================================
-        print(f"--- Stop Spin Debug ---")
-        print(f"Final Wheel Rotation (self.current_angle): {self.current_angle:.2f}")
-        print(f"Normalized Final Rotation (final_rotation_angle): {final_rotation_angle:.2f}")
-        print(f"Angle on Original Wheel at Arrow (angle_at_arrow_on_original_wheel): {angle_at_arrow_on_original_wheel:.2f}")
-        print(f"Segment Angle Span: {segment_angle_span:.2f}")
-        print(f"Calculated Selected Index: {selected_index}")
-        print(f"Selected Game Name (from self.games[selected_index]): {selected_game['name']}")
-        print(f"--- End Debug ---")
+        # TELEMETRÍA DEL GIRO (OPCIONAL)
+        # ========================================
+        # Solo guarda el evento en memoria; un hilo lo escribe al archivo JSONL
+        telemetria = telemetry.get_telemetry("arcade")
+        if telemetria:
+            duracion = time.perf_counter() - self.spin_start
+            telemetria.evento("spin_result",
+                              current_angle=self.current_angle,
+                              final_rotation_angle=final_rotation_angle,
+                              angle_at_arrow=angle_at_arrow_on_original_wheel,
+                              segment_angle_span=segment_angle_span,
+                              selected_index=selected_index,
+                              game=selected_game['name'],
+                              duration_s=duracion)
+            telemetria.contar("spins")
+            telemetria.contar("picked:" + selected_game['name'])
+            telemetria.medir("spin", duracion)
+        
+        # Giro completo en la línea de tiempo (solo si ARCADE_TRACE)
+        traza = tracing.get_tracer("arcade")
+        if traza:
+            traza.completo("spin", self.spin_trace_start, categoria="spin", game=selected_game['name'])
         
         # ========================================
         # MOSTRAR INFORMACIÓN DEL JUEGO SELECCIONADO
@@ -409,9 +438,18 @@ class GameScreen(QMainWindow):
         self.character_label.clear()  # Limpiar información anterior
         self.show_character(selected_game)  # Mostrar nuevo juego seleccionado
 
+        # Registrar el juego elegido (se escribe en segundo plano, sin bloquear la UI)
+        score_store.get_store().record_spin(selected_game['name'])
+
+        # Instantánea de memoria tras cada giro (solo si ARCADE_PROFILE_TRACEMALLOC=1)
+        perfilador = profiling.get_profiler("arcade")
+        if perfilador:
+            perfilador.snapshot("spin result")
+
     # ========================================
     # FUNCIÓN PARA MOSTRAR INFORMACIÓN DEL PERSONAJE/JUEGO
     # ========================================
+    @profiling.profiled
     def show_character(self, game):
         """
         Muestra la información completa del juego seleccionado
@@ -420,6 +458,9 @@ class GameScreen(QMainWindow):
         - Nombre del juego
         - Descripción del juego
         - Manejo de errores si no se encuentra la imagen
+        La imagen sale del paquete mapeado en memoria (images.bundle, ya
+        escalada si se construyó con ese tamaño); sin paquete se lee el
+        archivo de images/
         """
         # ========================================
         # CREACIÓN DEL WIDGET CONTENEDOR
@@ -433,13 +474,17 @@ class GameScreen(QMainWindow):
         # ========================================
         # Crear etiqueta para mostrar la imagen del personaje
         image_label = QLabel()
+        bundle = asset_bundle.get_bundle()
+        scaled_pixmap = bundle.pixmap(game["character"], 300) if bundle else None
         image_path = os.path.join(os.path.dirname(__file__), 'images', game["character"])
         
-        # Verificar si la imagen existe y cargarla
-        if os.path.exists(image_path):
+        # Sin paquete: verificar si la imagen existe y cargarla del archivo
+        if scaled_pixmap is None and os.path.exists(image_path):
             pixmap = QPixmap(image_path)
             # Escalar imagen manteniendo proporciones
             scaled_pixmap = pixmap.scaled(300, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        
+        if scaled_pixmap is not None:
             image_label.setPixmap(scaled_pixmap)
             image_label.setAlignment(Qt.AlignCenter)
         else:
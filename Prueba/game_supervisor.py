@@ -0,0 +1,242 @@
+# ========================================
+# SUPERVISOR DE PROCESOS DE JUEGO
+# ========================================
+# Esta clase lanza los juegos (Tetris, ...) como procesos hijos sin bloquear
+# el bucle de eventos de Qt:
+# - Cada juego es un QProcess; su fin llega como señal, nunca con wait()
+# - Se registra la vida de cada hijo: inicio, fin, código de salida
+# - Se muestrea CPU y memoria (RSS) de cada hijo leyendo /proc (Linux)
+# - Los juegos colgados se terminan tras un tiempo máximo configurable
+#   (ARCADE_GAME_TIMEOUT en segundos, sin límite por defecto)
+# - Las señales game_finished / all_games_finished permiten restaurar la
+#   pantalla de inicio
+# - Con ARCADE_TRACE, el clic -> proceso creado y la vida de cada hijo son
+#   tramos de la línea de tiempo compartida con los juegos (tracing.py); el
+#   hijo recibe el momento del clic en ARCADE_LAUNCH_TIME
+#
+# Uso:
+#     supervisor = GameSupervisor()
+#     supervisor.all_games_finished.connect(ventana.show)
+#     supervisor.launch("Tetris", [sys.executable, "tetris.py"])
+
+from PyQt5.QtCore import (QObject, QProcess, QProcessEnvironment, QTimer,  # Procesos y señales de Qt
+                          pyqtSignal)
+import os                                                      # /proc y variables de entorno
+import time                                                    # Duración de cada partida
+import telemetry                                               # Eventos estructurados (ARCADE_TELEMETRY)
+import tracing                                                 # Línea de tiempo opcional (ARCADE_TRACE)
+
+# ========================================
+# CONSTANTES DE CONFIGURACIÓN
+# ========================================
+INTERVALO_MUESTREO_MS = 1000    # Cada cuánto se leen CPU y RSS de los hijos
+GRACIA_TERMINAR_MS = 3000       # Espera entre terminate() y kill() de un juego colgado
+
+# Ticks de reloj por segundo usados en /proc/<pid>/stat
+TICKS_POR_SEGUNDO = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# ========================================
+# LECTURA DE MÉTRICAS DESDE /proc
+# ========================================
+def read_proc_metrics(pid):
+    """
+    Lee el uso de recursos de un proceso desde /proc (solo Linux)
+    Args:
+        pid: Identificador del proceso
+    Returns:
+        tuple: (segundos de CPU usuario+sistema, RSS en kB) o None si no
+               hay /proc o el proceso ya no existe
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as archivo:
+            # El nombre del comando (campo 2) puede tener espacios: se corta
+            # después del último paréntesis
+            campos = archivo.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as archivo:
+            rss = next((int(linea.split()[1]) for linea in archivo if linea.startswith("VmRSS:")), 0)
+    except (OSError, IndexError, ValueError):
+        return None
+    # utime y stime son los campos 14 y 15 (11 y 12 tras el corte)
+    cpu = (int(campos[11]) + int(campos[12])) / TICKS_POR_SEGUNDO
+    return cpu, rss
+
+# ========================================
+# CLASE PRINCIPAL - SUPERVISOR DE JUEGOS
+# ========================================
+class GameSupervisor(QObject):
+    # Señales para la interfaz (siempre emitidas en el hilo de Qt)
+    game_started = pyqtSignal(str, int)        # nombre, pid
+    game_finished = pyqtSignal(str, dict)      # nombre, resumen del hijo
+    game_failed = pyqtSignal(str, str)         # nombre, mensaje de error
+    all_games_finished = pyqtSignal()          # Ya no queda ningún juego activo
+
+    def __init__(self, timeout=None, parent=None):
+        """
+        Constructor del supervisor
+        Args:
+            timeout: Segundos máximos por partida; None lee ARCADE_GAME_TIMEOUT
+                     (vacío o 0 = sin límite)
+            parent: QObject padre opcional
+        """
+        super().__init__(parent)
+        if timeout is None:
+            timeout = float(os.environ.get("ARCADE_GAME_TIMEOUT") or 0)
+        self.timeout = timeout or None
+        self.children = {}     # QProcess -> registro del hijo activo
+        self.history = []      # Resúmenes de los hijos ya terminados
+
+        # Temporizador único que muestrea todos los hijos y vigila el tiempo máximo
+        self.sample_timer = QTimer(self)
+        self.sample_timer.timeout.connect(self.sample_children)
+
+    # ========================================
+    # LANZAMIENTO DE JUEGOS
+    # ========================================
+    def launch(self, name, command, clicked=None):
+        """
+        Lanza un juego como proceso hijo sin bloquear
+        Args:
+            name: Nombre del juego (para métricas y señales)
+            command: Lista [ejecutable, argumentos...]
+            clicked: tracing.ahora() del clic que pidió el juego (None = ahora)
+        Returns:
+            QProcess: El proceso lanzado
+        """
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ForwardedChannels)  # Salida del juego a la consola
+        record = {
+            "name": name,
+            "pid": None,
+            "launch": time.perf_counter(),   # Clic -> proceso creado
+            "clicked": clicked or tracing.ahora(),  # Mismo reloj que los juegos
+            "started": None,
+            "start": None,
+            "cpu_s": 0.0,
+            "rss_kb": 0,
+            "rss_max_kb": 0,
+            "killed": False,
+        }
+        self.children[process] = record
+
+        # Conectar señales del proceso (cada lambda captura su proceso)
+        process.started.connect(lambda p=process: self.on_started(p))
+        process.finished.connect(lambda code, status, p=process: self.on_finished(p, code, status))
+        process.errorOccurred.connect(lambda error, p=process: self.on_error(p, error))
+
+        # El juego mide su arranque desde el clic (ver informe_arranque en tetris.py)
+        environment = QProcessEnvironment.systemEnvironment()
+        environment.insert("ARCADE_LAUNCH_TIME", repr(record["clicked"]))
+        process.setProcessEnvironment(environment)
+
+        process.start(command[0], command[1:])
+        if not self.sample_timer.isActive():
+            self.sample_timer.start(INTERVALO_MUESTREO_MS)
+        return process
+
+    def on_started(self, process):
+        """El sistema creó el proceso: registrar pid y tiempo de arranque"""
+        record = self.children[process]
+        record["pid"] = int(process.processId())
+        record["start"] = time.perf_counter()
+        record["started"] = tracing.ahora()
+        telemetria = telemetry.get_telemetry("arcade")
+        if telemetria:
+            spawn = record["start"] - record["launch"]
+            telemetria.evento("game_launch", game=record["name"], child_pid=record["pid"], spawn_s=spawn)
+            telemetria.medir("launch", spawn)
+        traza = tracing.get_tracer("arcade")
+        if traza:
+            traza.completo("spawn:" + record["name"], record["clicked"], record["started"],
+                           categoria="launch", child_pid=record["pid"])
+        self.game_started.emit(record["name"], record["pid"])
+
+    # ========================================
+    # MUESTREO DE RECURSOS Y TIEMPO MÁXIMO
+    # ========================================
+    def sample_children(self):
+        """Lee CPU/RSS de cada hijo y termina los que superan el tiempo máximo"""
+        now = time.perf_counter()
+        for process, record in self.children.items():
+            if record["pid"] is None:
+                continue
+            self.sample(record)
+
+            # Juego colgado: terminate() y, si no responde, kill()
+            if self.timeout and not record["killed"] and now - record["start"] > self.timeout:
+                record["killed"] = True
+                process.terminate()
+                QTimer.singleShot(GRACIA_TERMINAR_MS, lambda p=process: self.kill_if_running(p))
+
+    def kill_if_running(self, process):
+        """kill() de un juego que ignoró terminate() (si sigue activo)"""
+        if process in self.children:
+            process.kill()
+
+    def sample(self, record):
+        """Actualiza las métricas de un hijo desde /proc"""
+        metrics = read_proc_metrics(record["pid"])
+        if metrics is not None:
+            record["cpu_s"], record["rss_kb"] = metrics
+            record["rss_max_kb"] = max(record["rss_max_kb"], record["rss_kb"])
+
+    # ========================================
+    # FIN DE LOS JUEGOS
+    # ========================================
+    def on_finished(self, process, exit_code, exit_status):
+        """El hijo terminó: guardar su resumen y avisar a la interfaz"""
+        record = self.children.pop(process)
+        summary = {
+            "name": record["name"],
+            "pid": record["pid"],
+            "exit_code": exit_code,
+            "crashed": exit_status == QProcess.CrashExit,
+            "killed": record["killed"],
+            "length_s": time.perf_counter() - (record["start"] or record["launch"]),
+            "cpu_s": record["cpu_s"],      # Último muestreo (el hijo ya no existe)
+            "rss_max_kb": record["rss_max_kb"],
+        }
+        self.history.append(summary)
+
+        telemetria = telemetry.get_telemetry("arcade")
+        if telemetria:
+            # "pid" de la telemetría es el del lanzador; el del hijo va aparte
+            campos = dict(summary, child_pid=summary["pid"])
+            del campos["pid"]
+            telemetria.evento("game_exit", **campos)
+            telemetria.medir("game:" + record["name"], summary["length_s"])
+        traza = tracing.get_tracer("arcade")
+        if traza and record["started"]:
+            traza.completo("game:" + record["name"], record["started"], categoria="launch",
+                           child_pid=record["pid"], exit_code=exit_code)
+
+        process.deleteLater()
+        self.game_finished.emit(record["name"], summary)
+        self.check_idle()
+
+    def on_error(self, process, error):
+        """Errores de QProcess: solo FailedToStart significa que no habrá 'finished'"""
+        if error != QProcess.FailedToStart:
+            return
+        record = self.children.pop(process)
+        process.deleteLater()
+        self.game_failed.emit(record["name"], process.errorString())
+        self.check_idle()
+
+    def check_idle(self):
+        """Detener el muestreo y avisar cuando no queda ningún juego activo"""
+        if not self.children:
+            self.sample_timer.stop()
+            self.all_games_finished.emit()
+
+    def running(self):
+        """
+        Estado actual de los juegos activos
+        Returns:
+            list: Un diccionario por hijo con nombre, pid, duración, CPU y RSS
+        """
+        now = time.perf_counter()
+        return [{"name": record["name"], "pid": record["pid"],
+                 "length_s": now - (record["start"] or record["launch"]),
+                 "cpu_s": record["cpu_s"], "rss_kb": record["rss_kb"],
+                 "rss_max_kb": record["rss_max_kb"]}
+                for record in self.children.values()]
@@ -0,0 +1,129 @@
+"""
+========================================
+INPUT-TO-PHOTON LATENCY MEASUREMENT
+========================================
+
+This file measures how long the player waits between pressing a key and
+seeing its effect on screen:
+- Every input is timestamped when the game loop receives it
+- When a frame is presented (display.flip() returned), every input that
+  changed the game state since the previous frame gets its latency:
+  presentation time - arrival time
+- A report gives the number of samples and p50/p90/p99/max in milliseconds
+
+pygame does not expose the OS timestamp of an event, so the arrival time is
+the moment the event was polled. The game polls input much faster than it
+renders (see FRECUENCIA_ENTRADA in tetris.py), which bounds that error.
+
+Author: Game Implementation
+Purpose: Quantify input lag so it can be driven down
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import collections  # Bounded sample buffer
+import json         # Report output
+import sys          # Report to stdout
+
+# ========================================
+# MEASUREMENT CONFIGURATION CONSTANTS
+# ========================================
+
+MUESTRAS_MAXIMAS = 10000    # Most recent latency samples kept
+
+# ========================================
+# HELPER FUNCTIONS
+# ========================================
+
+def percentil(valores, fraccion):
+    """
+    Return the given percentile of a list of numbers (nearest rank).
+
+    Args:
+        valores (list): Samples (need not be sorted)
+        fraccion (float): Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+# ========================================
+# LATENCY METER CLASS
+# ========================================
+
+class MedidorLatencia:
+    """
+    Pairs input arrival times with the next presented frame.
+
+    Usage in a game loop:
+        medidor.entrada(instante)      # an input changed the game state
+        ...
+        pygame.display.flip()
+        medidor.presentado(reloj())    # the change is now on screen
+    """
+
+    def __init__(self, muestras=MUESTRAS_MAXIMAS):
+        """
+        Initialize an empty meter.
+
+        Args:
+            muestras (int): Maximum number of latency samples kept
+        """
+        self._pendientes = []                                  # Inputs not on screen yet
+        self.latencias = collections.deque(maxlen=muestras)    # Seconds
+
+    def entrada(self, llegada):
+        """
+        Record an input that changed the game state.
+
+        Args:
+            llegada (float): Time the input was received
+        """
+        self._pendientes.append(llegada)
+
+    def presentado(self, instante):
+        """
+        Record that a frame showing every pending input was presented.
+
+        Args:
+            instante (float): Time the frame reached the screen
+        """
+        if self._pendientes:
+            self.latencias.extend(instante - llegada for llegada in self._pendientes)
+            self._pendientes.clear()
+
+    def informe(self):
+        """
+        Build the latency report.
+
+        Returns:
+            dict: Sample count and percentiles in milliseconds
+        """
+        latencias = list(self.latencias)
+        return {
+            "muestras": len(latencias),
+            "latencia_p50_ms": percentil(latencias, 0.50) * 1000,
+            "latencia_p90_ms": percentil(latencias, 0.90) * 1000,
+            "latencia_p99_ms": percentil(latencias, 0.99) * 1000,
+            "latencia_max_ms": max(latencias, default=0.0) * 1000,
+        }
+
+    def escribir_informe(self, ruta):
+        """
+        Write the report as JSON.
+
+        Args:
+            ruta (str): Output path, or "-" for stdout
+        """
+        texto = json.dumps(self.informe(), indent=2)
+        if ruta == "-":
+            print(texto, file=sys.stdout)
+        else:
+            with open(ruta, "w") as archivo:
+                archivo.write(texto + "\n")
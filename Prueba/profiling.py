@@ -0,0 +1,420 @@
+"""
+========================================
+OPT-IN PROFILING HOOKS
+========================================
+
+This module lets the arcade games be profiled on a cabinet without editing
+the source. Profiling is disabled by default and costs nothing until it is
+switched on through environment variables (or the matching tetris.py flags):
+
+- ARCADE_PROFILE: "cprofile" (deterministic) or "sample" (low overhead
+  statistical sampler). Any other value or no value disables profiling.
+- ARCADE_PROFILE_FRAMES: Stop collecting after this many frames/calls.
+- ARCADE_PROFILE_TRACEMALLOC: "1" takes tracemalloc snapshots at
+  interesting points (piece locks, spin results) and reports the diffs.
+- ARCADE_PROFILE_OUT: Output file. Defaults to profile-<name>-<pid>.txt.
+- ARCADE_PROFILE_INTERVAL: Sampling interval in seconds (sample mode only).
+
+The report (per-function stats plus allocation diffs) is written once, when
+the process exits.
+
+Author: Game Implementation
+Purpose: Find hot spots in the game loops and the roulette on real hardware
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse     # CLI flag parsing for tetris.py
+import atexit       # Write the report when the process exits
+import collections  # Counters for the sampling profiler
+import cProfile     # Deterministic profiler
+import functools    # Keep wrapped method metadata
+import io           # In-memory buffer for pstats output
+import os           # Environment variables and process id
+import pstats       # Format cProfile statistics
+import sys          # Access to the running stack frames
+import threading    # Background sampling thread
+import time         # Sampling interval and timestamps
+import tracemalloc  # Allocation snapshots
+
+# ========================================
+# PROFILING CONFIGURATION CONSTANTS
+# ========================================
+
+MODOS_PERFILADO = ("cprofile", "sample")   # Supported profiling modes
+INTERVALO_MUESTREO = 0.001                 # Default sampling interval (1 ms)
+FUNCIONES_REPORTE = 40                     # Rows shown per statistics table
+DIFERENCIAS_REPORTE = 15                   # Rows shown per allocation diff
+
+# ========================================
+# SAMPLING PROFILER
+# ========================================
+
+class SamplingProfiler:
+    """
+    Statistical profiler that periodically inspects every thread's stack.
+
+    A daemon thread wakes up every `intervalo` seconds and reads the current
+    frame of every other thread through sys._current_frames(), so work done
+    on helper threads (e.g. the Tetris simulation thread) shows up next to
+    the main loop. The profiled code is never instrumented, so the overhead
+    stays low even on slow machines.
+    """
+
+    def __init__(self, intervalo=INTERVALO_MUESTREO):
+        """
+        Initialize the sampler.
+
+        Args:
+            intervalo (float): Seconds between two consecutive samples
+        """
+        self.intervalo = intervalo
+        self.muestras = 0                          # Sampling ticks (every thread is read per tick)
+        self.pilas = 0                             # Thread stacks read over all ticks
+        self.propias = collections.Counter()       # Stacks where function was on top
+        self.acumuladas = collections.Counter()    # Stacks where function was on the stack
+        self._activo = threading.Event()           # Set while sampling is enabled
+        self._hilo = None                          # Background sampling thread
+
+    def enable(self):
+        """Start (or resume) sampling every thread."""
+        self._activo.set()
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._muestrear, name="arcade-sampler", daemon=True)
+            self._hilo.start()
+
+    def disable(self):
+        """Pause sampling without losing the samples collected so far."""
+        self._activo.clear()
+
+    def _muestrear(self):
+        """Sampling thread body: record every other thread's stack each interval."""
+        propio = threading.get_ident()
+        while True:
+            self._activo.wait()
+            time.sleep(self.intervalo)
+            if not self._activo.is_set():
+                continue
+            self.muestras += 1
+            for hilo, frame in sys._current_frames().items():
+                if hilo == propio:
+                    continue
+                self.pilas += 1
+                # Self time is keyed by the line being executed (C calls have no frame)
+                codigo = frame.f_code
+                self.propias[(os.path.basename(codigo.co_filename), frame.f_lineno, codigo.co_name)] += 1
+                # Count each function once per stack even when it recurses
+                vistas = set()
+                while frame is not None:
+                    vistas.add(self._clave(frame))
+                    frame = frame.f_back
+                self.acumuladas.update(vistas)
+
+    @staticmethod
+    def _clave(frame):
+        """Build the (file, line, function) key used by the counters."""
+        codigo = frame.f_code
+        return (os.path.basename(codigo.co_filename), codigo.co_firstlineno, codigo.co_name)
+
+    def report(self, salida):
+        """
+        Write the sampled per-function statistics.
+
+        Args:
+            salida: Text stream to write to
+        """
+        # Percentages are per tick: with several threads busy they can add up
+        # to more than 100%
+        salida.write(f"{self.muestras} samples every {self.intervalo * 1000:.1f} ms "
+                     f"({self.pilas} thread stacks)\n\n")
+        for titulo, contador in (("SELF", self.propias), ("CUMULATIVE", self.acumuladas)):
+            salida.write(f"{titulo:>10}  {'%':>6}  function\n")
+            for (archivo, linea, funcion), cuenta in contador.most_common(FUNCIONES_REPORTE):
+                porcentaje = 100.0 * cuenta / max(self.muestras, 1)
+                salida.write(f"{cuenta:>10}  {porcentaje:>6.1f}  {archivo}:{linea}({funcion})\n")
+            salida.write("\n")
+
+# ========================================
+# GAME PROFILER
+# ========================================
+
+class GameProfiler:
+    """
+    Front end used by the games to profile frames and snapshot memory.
+
+    This class handles:
+    - Enabling/disabling the chosen profiler around the hot code
+    - Profiling helper threads too (cProfile only sees the thread that
+      enabled it, so each helper thread gets its own profile, merged into
+      the report; the sampler reads every thread by itself)
+    - Stopping automatically after a chosen number of frames
+    - Taking tracemalloc snapshots and diffing consecutive ones
+    - Writing a single report file when the process exits
+    """
+
+    def __init__(self, nombre, modo="cprofile", frames=None, trace_memory=False,
+                 salida=None, intervalo=INTERVALO_MUESTREO):
+        """
+        Initialize the profiler and register the exit report.
+
+        Args:
+            nombre (str): Name of the profiled program (used in the report)
+            modo (str): "cprofile" or "sample"
+            frames (int): Frames to profile before stopping, None for all
+            trace_memory (bool): Take tracemalloc snapshots when requested
+            salida (str): Path of the report file
+            intervalo (float): Sampling interval for "sample" mode
+        """
+        self.nombre = nombre
+        self.modo = modo
+        self.frames_limite = frames
+        self.frames = 0                            # Frames profiled so far
+        self.salida = salida or f"profile-{nombre}-{os.getpid()}.txt"
+        self._profundidad = 0                      # Nested enable() calls
+        self._terminado = False                    # Frame limit reached
+        self._inicio = time.perf_counter()
+
+        if modo == "sample":
+            self._perfilador = SamplingProfiler(intervalo)
+        else:
+            self._perfilador = cProfile.Profile()
+        self._perfiles_hilos = []                  # cProfile of each helper thread
+        self.hilos_omitidos = []                   # Helper threads left to the main profiler
+        self._local = threading.local()            # Helper thread's own profile
+
+        # Memory snapshots: (label, snapshot) pairs, first one is the baseline
+        self.trace_memory = trace_memory
+        self._snapshots = []
+        if trace_memory:
+            tracemalloc.start()
+            self._snapshots.append(("start", tracemalloc.take_snapshot()))
+
+        atexit.register(self.write_report)
+
+    def enable(self):
+        """Start collecting (nested calls are counted, not restarted)."""
+        if self._terminado:
+            return
+        if self._profundidad == 0:
+            self._perfilador.enable()
+        self._profundidad += 1
+
+    def disable(self):
+        """Stop collecting once the outermost enable() is balanced."""
+        if self._profundidad == 0:
+            return
+        self._profundidad -= 1
+        if self._profundidad == 0:
+            self._perfilador.disable()
+
+    def enable_thread(self):
+        """
+        Profile the calling helper thread until disable_thread().
+
+        Only collects while the main profiler does (between the outermost
+        enable() and disable(), before the frame limit). In "sample" mode
+        this does nothing: the sampler already reads every thread.
+
+        From Python 3.12 cProfile hooks into sys.monitoring, which is process
+        wide: only one profiler may be active, and the main one already
+        records every thread's calls. Enabling a second profiler raises
+        ValueError there, so the thread is recorded as skipped instead.
+        """
+        if self.modo == "sample" or self._terminado or not self._profundidad:
+            return
+        if getattr(self._local, "omitido", False):
+            return
+        perfil = getattr(self._local, "perfil", None)
+        if perfil is None:
+            perfil = cProfile.Profile()
+            try:
+                perfil.enable()
+            except ValueError:
+                # Another profiler is active (Python 3.12+)
+                self._local.omitido = True
+                self.hilos_omitidos.append(threading.current_thread().name)
+                return
+            self._local.perfil = perfil
+            self._perfiles_hilos.append(perfil)
+        else:
+            perfil.enable()
+        self._local.activo = True
+
+    def disable_thread(self):
+        """Stop profiling the calling helper thread (see enable_thread())."""
+        if getattr(self._local, "activo", False):
+            self._local.perfil.disable()
+            self._local.activo = False
+
+    def frame(self):
+        """
+        Count one frame (or one profiled call) and stop at the frame limit.
+        """
+        if self._terminado:
+            return
+        self.frames += 1
+        if self.frames_limite is not None and self.frames >= self.frames_limite:
+            # Unwind every pending enable() so the profiler really stops
+            while self._profundidad:
+                self.disable()
+            self._terminado = True
+
+    def snapshot(self, etiqueta):
+        """
+        Take a tracemalloc snapshot if memory tracing is enabled.
+
+        Args:
+            etiqueta (str): Label shown next to the diff in the report
+        """
+        if self.trace_memory and not self._terminado:
+            self._snapshots.append((etiqueta, tracemalloc.take_snapshot()))
+
+    def write_report(self):
+        """Write per-function stats and allocation diffs to the output file."""
+        while self._profundidad:
+            self.disable()
+        atexit.unregister(self.write_report)
+
+        with open(self.salida, "w", encoding="utf-8") as archivo:
+            duracion = time.perf_counter() - self._inicio
+            archivo.write(f"Profile of {self.nombre} ({self.modo}), pid {os.getpid()}\n")
+            archivo.write(f"{self.frames} frames profiled, {duracion:.2f} s wall time\n\n")
+
+            # ========================================
+            # PER-FUNCTION STATISTICS
+            # ========================================
+            archivo.write("=== Per-function statistics ===\n")
+            if self.modo == "sample":
+                self._perfilador.report(archivo)
+            else:
+                # Main thread and helper threads merged into one table
+                perfiles = [self._perfilador] + self._perfiles_hilos
+                archivo.write(f"{len(perfiles)} thread profiles merged\n")
+                if self.hilos_omitidos:
+                    archivo.write("Threads recorded by the main profiler (one profiler per "
+                                  f"process on this Python): {', '.join(self.hilos_omitidos)}\n")
+                texto = io.StringIO()
+                estadisticas = None
+                for perfil in perfiles:
+                    try:
+                        if estadisticas is None:
+                            estadisticas = pstats.Stats(perfil, stream=texto)
+                        else:
+                            estadisticas.add(perfil)
+                    except TypeError:
+                        continue                   # Nothing was collected on that thread
+                if estadisticas is None:
+                    texto.write("No calls were profiled.\n")
+                else:
+                    estadisticas.sort_stats("cumulative").print_stats(FUNCIONES_REPORTE)
+                archivo.write(texto.getvalue())
+
+            # ========================================
+            # ALLOCATION DIFFS
+            # ========================================
+            if len(self._snapshots) > 1:
+                archivo.write("\n=== Allocation diffs between snapshots ===\n")
+                for (_, anterior), (etiqueta, actual) in zip(self._snapshots, self._snapshots[1:]):
+                    self._escribir_diferencia(archivo, etiqueta, actual, anterior)
+                etiqueta, ultimo = self._snapshots[-1]
+                self._escribir_diferencia(archivo, "total since start", ultimo, self._snapshots[0][1])
+
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    @staticmethod
+    def _escribir_diferencia(archivo, etiqueta, actual, anterior):
+        """Write the top allocation changes between two snapshots."""
+        diferencias = actual.compare_to(anterior, "lineno")
+        total = sum(diferencia.size_diff for diferencia in diferencias)
+        archivo.write(f"\n--- {etiqueta}: {total / 1024:+.1f} KiB ---\n")
+        for diferencia in diferencias[:DIFERENCIAS_REPORTE]:
+            archivo.write(f"{diferencia}\n")
+
+# ========================================
+# CONFIGURATION HELPERS
+# ========================================
+
+# Process-wide profiler, created on first use
+_perfilador_global = None
+
+def get_profiler(nombre, modo=None, frames=None, trace_memory=None, salida=None):
+    """
+    Return the process-wide profiler, creating it from the environment.
+
+    Explicit arguments override the ARCADE_PROFILE* environment variables.
+
+    Args:
+        nombre (str): Name of the profiled program
+        modo (str): "cprofile" or "sample"; None reads ARCADE_PROFILE
+        frames (int): Frame limit; None reads ARCADE_PROFILE_FRAMES
+        trace_memory (bool): None reads ARCADE_PROFILE_TRACEMALLOC
+        salida (str): Report path; None reads ARCADE_PROFILE_OUT
+
+    Returns:
+        GameProfiler: The profiler, or None when profiling is disabled
+    """
+    global _perfilador_global
+    if _perfilador_global is not None:
+        return _perfilador_global
+
+    modo = modo or os.environ.get("ARCADE_PROFILE", "").strip().lower()
+    if modo not in MODOS_PERFILADO:
+        return None
+
+    if frames is None and os.environ.get("ARCADE_PROFILE_FRAMES"):
+        frames = int(os.environ["ARCADE_PROFILE_FRAMES"])
+    if trace_memory is None:
+        trace_memory = os.environ.get("ARCADE_PROFILE_TRACEMALLOC", "") not in ("", "0")
+    salida = salida or os.environ.get("ARCADE_PROFILE_OUT") or None
+    intervalo = float(os.environ.get("ARCADE_PROFILE_INTERVAL", INTERVALO_MUESTREO))
+
+    _perfilador_global = GameProfiler(nombre, modo, frames, trace_memory, salida, intervalo)
+    return _perfilador_global
+
+def parse_profile_args(argv):
+    """
+    Parse the profiling flags accepted by the game scripts.
+
+    Args:
+        argv (list): Command line arguments (without the program name)
+
+    Returns:
+        dict: Keyword arguments for get_profiler()
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", dest="modo", choices=MODOS_PERFILADO)
+    parser.add_argument("--profile-frames", dest="frames", type=int)
+    parser.add_argument("--profile-tracemalloc", dest="trace_memory", action="store_const", const=True)
+    parser.add_argument("--profile-out", dest="salida")
+    argumentos, _ = parser.parse_known_args(argv)
+    return vars(argumentos)
+
+def profiled(funcion):
+    """
+    Decorator that profiles every call of a method when profiling is enabled.
+
+    When ARCADE_PROFILE is not set the original function is returned
+    unchanged, so the decorator has no runtime cost at all.
+
+    Args:
+        funcion: Function or method to profile
+
+    Returns:
+        The wrapped function, or the original one when profiling is disabled
+    """
+    perfilador = get_profiler("arcade")
+    if perfilador is None:
+        return funcion
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        perfilador.enable()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            perfilador.disable()
+            perfilador.frame()
+    return envoltura
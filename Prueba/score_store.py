@@ -0,0 +1,368 @@
+"""
+========================================
+NON-BLOCKING SCORE AND SESSION STORE
+========================================
+
+This module keeps the arcade's history in a local SQLite database:
+- Finished games: game name, score, lines, pieces, length, start time
+- Roulette picks: which game the wheel selected and when
+
+Games never wait on the disk. record_game()/record_spin() only put a tuple
+on a queue; a background thread drains the queue and writes whole batches
+in one transaction. Opening the database, creating the schema and
+switching to WAL mode also happen on that thread, so constructing the store
+never blocks the game or the GUI. In WAL mode the Tetris process, the Qt
+launcher and report queries can all use the database at the same time.
+
+Configuration:
+- ARCADE_DB: Database path (defaults to arcade.db next to this file)
+
+Run `python score_store.py --bench` to measure frame times with and
+without a heavy stream of writes.
+
+Author: Game Implementation
+Purpose: Keep high scores and usage statistics without hurting frame times
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import atexit       # Flush pending writes at exit
+import logging      # Report write errors without stopping the writer
+import os           # Default database path
+import queue        # Hand-off between the game and the writer thread
+import sqlite3      # Embedded database
+import threading    # Background writer
+import time         # Timestamps
+
+# ========================================
+# STORE CONFIGURATION CONSTANTS
+# ========================================
+
+RUTA_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arcade.db")
+TAMANO_LOTE = 500            # Maximum rows written per transaction
+INTERVALO_VACIADO = 0.5      # Seconds the writer waits to fill a batch
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    juego TEXT NOT NULL,
+    puntuacion INTEGER NOT NULL,
+    lineas INTEGER NOT NULL,
+    piezas INTEGER NOT NULL,
+    duracion REAL NOT NULL,
+    inicio REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partidas_juego_puntuacion ON partidas (juego, puntuacion DESC);
+CREATE TABLE IF NOT EXISTS giros (
+    id INTEGER PRIMARY KEY,
+    juego TEXT NOT NULL,
+    momento REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS giros_juego ON giros (juego);
+"""
+
+INSERTAR_PARTIDA = ("INSERT INTO partidas (juego, puntuacion, lineas, piezas, duracion, inicio) "
+                    "VALUES (?, ?, ?, ?, ?, ?)")
+INSERTAR_GIRO = "INSERT INTO giros (juego, momento) VALUES (?, ?)"
+
+# Sentinel that tells the writer thread to stop
+_FIN = object()
+
+registro = logging.getLogger(__name__)
+
+# ========================================
+# STORE CLASS
+# ========================================
+
+class ScoreStore:
+    """
+    SQLite-backed store with queued, batched background writes.
+
+    Writes (record_*) are safe to call from the game loop or the Qt event
+    loop: they never touch the database themselves. Queries run on the
+    calling thread with their own read connection; the first one waits
+    until the writer thread has created the schema.
+    """
+
+    def __init__(self, ruta=None):
+        """
+        Start the writer thread, which opens (or creates) the database.
+
+        Args:
+            ruta (str): Database path; defaults to ARCADE_DB or arcade.db
+        """
+        self.ruta = ruta or os.environ.get("ARCADE_DB") or RUTA_POR_DEFECTO
+        self._cola = queue.Queue()
+        self._lecturas = threading.local()     # One read connection per thread
+        self._preparada = threading.Event()    # Set once the writer tried to create the schema
+        self.escritos = 0                      # Rows written so far
+        self.lotes = 0                         # Transactions committed so far
+        self.perdidos = 0                      # Rows dropped by failed transactions
+
+        self._hilo = threading.Thread(target=self._escritor, name="score-store", daemon=True)
+        self._hilo.start()
+
+    def _conectar(self):
+        """Open a connection that waits for other writers instead of failing."""
+        return sqlite3.connect(self.ruta, timeout=30)
+
+    def _preparar(self):
+        """Open the writer connection: WAL mode and schema (writer thread only)."""
+        conexion = self._conectar()
+        try:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.executescript(ESQUEMA)
+        except BaseException:
+            conexion.close()
+            raise
+        return conexion
+
+    # ========================================
+    # NON-BLOCKING WRITES
+    # ========================================
+
+    def record_game(self, juego, puntuacion, lineas, piezas, duracion, inicio=None):
+        """
+        Queue a finished game.
+
+        Args:
+            juego (str): Game name, e.g. "Tetris"
+            puntuacion (int): Final score
+            lineas (int): Lines cleared
+            piezas (int): Pieces locked
+            duracion (float): Session length in seconds
+            inicio (float): Start time (epoch seconds); now - duracion if omitted
+        """
+        if inicio is None:
+            inicio = time.time() - duracion
+        self._cola.put((INSERTAR_PARTIDA, (juego, puntuacion, lineas, piezas, duracion, inicio)))
+
+    def record_spin(self, juego):
+        """
+        Queue a roulette pick.
+
+        Args:
+            juego (str): Name of the selected game
+        """
+        self._cola.put((INSERTAR_GIRO, (juego, time.time())))
+
+    def _escritor(self):
+        """
+        Writer thread: open the database, drain the queue and commit batches.
+
+        Errors are logged and never stop the thread: a batch that cannot be
+        written is dropped (counted in `perdidos`) and the connection is
+        opened again for the next one.
+        """
+        conexion = None
+        try:
+            conexion = self._preparar()
+        except Exception:
+            registro.exception("score store: cannot open %s", self.ruta)
+        finally:
+            self._preparada.set()
+
+        terminar = False
+        while not terminar:
+            pendientes = []
+            recibidos = 0
+            elemento = self._cola.get()
+            limite = time.monotonic() + INTERVALO_VACIADO
+            # Gather more rows until the batch is full, the wait is over or
+            # close() asked to stop (then write at once, without waiting)
+            while True:
+                recibidos += 1
+                if elemento is _FIN:
+                    terminar = True
+                    break
+                pendientes.append(elemento)
+                restante = limite - time.monotonic()
+                if len(pendientes) >= TAMANO_LOTE or restante <= 0:
+                    break
+                try:
+                    elemento = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+
+            if terminar:
+                # Drain whatever was still queued next to the sentinel
+                while True:
+                    try:
+                        elemento = self._cola.get_nowait()
+                    except queue.Empty:
+                        break
+                    recibidos += 1
+                    if elemento is not _FIN:
+                        pendientes.append(elemento)
+
+            try:
+                if pendientes:
+                    if conexion is None:
+                        conexion = self._preparar()
+                    # One transaction per statement kind and batch
+                    por_sentencia = {}
+                    for sentencia, fila in pendientes:
+                        por_sentencia.setdefault(sentencia, []).append(fila)
+                    with conexion:
+                        for sentencia, filas in por_sentencia.items():
+                            conexion.executemany(sentencia, filas)
+                    self.escritos += len(pendientes)
+                    self.lotes += 1
+            except Exception:
+                registro.exception("score store: dropped %d rows for %s", len(pendientes), self.ruta)
+                self.perdidos += len(pendientes)
+                if conexion is not None:
+                    conexion.close()
+                    conexion = None
+            finally:
+                # Written or dropped, these rows are no longer pending
+                for _ in range(recibidos):
+                    self._cola.task_done()
+        if conexion is not None:
+            conexion.close()
+
+    def flush(self):
+        """Wait until everything queued so far has been written (or dropped)."""
+        self._cola.join()
+
+    def close(self):
+        """Write every pending row and stop the writer thread."""
+        if self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join()
+
+    # ========================================
+    # QUERIES
+    # ========================================
+
+    def _lectura(self):
+        """Read connection of the calling thread."""
+        if getattr(self._lecturas, "conexion", None) is None:
+            self._preparada.wait()
+            self._lecturas.conexion = self._conectar()
+        return self._lecturas.conexion
+
+    def top_scores(self, juego, limite=10):
+        """
+        Best games for one game name (uses the (juego, puntuacion) index).
+
+        Returns:
+            list: (puntuacion, lineas, piezas, duracion, inicio) tuples
+        """
+        return self._lectura().execute(
+            "SELECT puntuacion, lineas, piezas, duracion, inicio FROM partidas "
+            "WHERE juego = ? ORDER BY puntuacion DESC LIMIT ?", (juego, limite)).fetchall()
+
+    def game_stats(self):
+        """
+        Per-game aggregates.
+
+        Returns:
+            dict: game -> {"partidas", "mejor", "lineas", "duracion_media"}
+        """
+        filas = self._lectura().execute(
+            "SELECT juego, COUNT(*), MAX(puntuacion), SUM(lineas), AVG(duracion) "
+            "FROM partidas GROUP BY juego").fetchall()
+        return {juego: {"partidas": partidas, "mejor": mejor, "lineas": lineas, "duracion_media": media}
+                for juego, partidas, mejor, lineas, media in filas}
+
+    def spin_stats(self):
+        """
+        How often the roulette picked each game.
+
+        Returns:
+            dict: game -> number of picks
+        """
+        return dict(self._lectura().execute(
+            "SELECT juego, COUNT(*) FROM giros GROUP BY juego").fetchall())
+
+# ========================================
+# PROCESS-WIDE STORE
+# ========================================
+
+_almacen_global = None
+
+def get_store():
+    """
+    Return the process-wide store, opening it on first use.
+
+    The store is closed (pending writes flushed) when the process exits.
+
+    Returns:
+        ScoreStore: The shared store
+    """
+    global _almacen_global
+    if _almacen_global is None:
+        _almacen_global = ScoreStore()
+        atexit.register(_almacen_global.close)
+    return _almacen_global
+
+# ========================================
+# FRAME-TIME BENCHMARK
+# ========================================
+
+def benchmark(segundos=3.0, escrituras_por_frame=20):
+    """
+    Compare game-loop frame times with and without heavy score writes.
+
+    A headless Tetris loop (rules plus a board copy per frame) runs twice:
+    once alone and once while every frame queues `escrituras_por_frame`
+    records, far more than a real session produces. Frames are not paced,
+    so the writer thread competes for the GIL as hard as it can. Both runs
+    use a temporary database.
+
+    Returns:
+        dict: p50/p99 frame times (ms) per run, the 30 FPS frame budget
+            and rows written
+    """
+    import random
+    import tempfile
+    from input_latency import percentil
+    from tetris import JuegoTetris
+
+    def medir(almacen, escrituras):
+        juego = JuegoTetris(semilla=1)
+        generador = random.Random(1)
+        tiempos = []
+        fin = time.perf_counter() + segundos
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            for _ in range(20):
+                juego.mover(generador.choice((-1, 1)))
+                juego.rotar()
+                if juego.caer() and juego.terminado:
+                    juego.reiniciar()
+            juego.tablero.copy()
+            for _ in range(escrituras):
+                almacen.record_game("Bench", juego.lineas, juego.lineas, juego.piezas, 1.0)
+            tiempos.append(time.perf_counter() - inicio)
+        return (percentil(tiempos, 0.50) * 1000, percentil(tiempos, 0.99) * 1000)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        almacen = ScoreStore(os.path.join(carpeta, "bench.db"))
+        sin_escrituras = medir(almacen, 0)
+        con_escrituras = medir(almacen, escrituras_por_frame)
+        almacen.close()
+        return {
+            "sin_escrituras_p50_ms": sin_escrituras[0],
+            "sin_escrituras_p99_ms": sin_escrituras[1],
+            "con_escrituras_p50_ms": con_escrituras[0],
+            "con_escrituras_p99_ms": con_escrituras[1],
+            "presupuesto_frame_ms": 1000 / 30,
+            "filas_escritas": almacen.escritos,
+            "lotes": almacen.lotes,
+        }
+
+if __name__ == '__main__':
+    import json
+    import sys
+    if "--bench" in sys.argv:
+        print(json.dumps(benchmark(), indent=2))
+    else:
+        almacen = get_store()
+        print(json.dumps({"tetris_top": almacen.top_scores("Tetris"),
+                          "partidas": almacen.game_stats(),
+                          "giros": almacen.spin_stats()}, indent=2))
@@ -14,7 +14,8 @@ from PyQt5.QtGui import QFont                  # Manejo de fuentes
 from game_screen import GameScreen             # Pantalla del juego de ruleta
 import os                                      # Operaciones del sistema operativo
 import sys                                     # Módulo del sistema
-import subprocess                              # Ejecución de procesos externos
+from game_supervisor import GameSupervisor     # Lanzamiento no bloqueante de juegos
+import tracing                                 # Línea de tiempo opcional (ARCADE_TRACE)
 
 # ========================================
 # CLASE PRINCIPAL - PANTALLA DE INICIO
@@ -32,6 +33,15 @@ class StartScreen(QMainWindow):
         # Establecer fondo blanco para toda la ventana
         self.setStyleSheet("background-color: white;")
         
+        # ========================================
+        # SUPERVISOR DE PROCESOS DE JUEGO
+        # ========================================
+        # Lanza los juegos sin bloquear la interfaz; cuando no queda ningún
+        # juego activo la pantalla de inicio se vuelve a mostrar
+        self.supervisor = GameSupervisor(parent=self)
+        self.supervisor.all_games_finished.connect(self.show)
+        self.supervisor.game_failed.connect(self.on_game_failed)
+        
         # ========================================
         # CONFIGURACIÓN DEL WIDGET CENTRAL Y LAYOUT
         # ========================================
@@ -124,50 +134,42 @@ class StartScreen(QMainWindow):
         """
         Función que se ejecuta cuando se hace clic en el botón "Tetris"
         - Oculta la ventana actual
-        - Ejecuta el archivo tetris.py como un proceso separado
-        - Maneja errores de ejecución
-        - Restaura la ventana cuando Tetris se cierra
+        - Lanza tetris.py como proceso separado a través del supervisor
+          (la interfaz sigue respondiendo mientras se juega)
+        - La ventana se restaura con la señal all_games_finished del
+          supervisor, o con game_failed si Tetris no pudo iniciarse
         """
-        try:
-            # Ocultar la ventana actual antes de iniciar Tetris
-            self.hide()
-            
-            # ========================================
-            # CONFIGURACIÓN DE LA RUTA DEL ARCHIVO TETRIS
-            # ========================================
-            # Obtener la ruta completa del archivo tetris.py
-            tetris_path = os.path.join(os.path.dirname(__file__), 'tetris.py')
-            
-            # Obtener el ejecutable de Python actual
-            python_executable = sys.executable
-            if not python_executable:  # Fallback en caso de que no se encuentre
-                python_executable = "python"
+        # Momento del clic: inicio del tramo clic -> proceso creado
+        clicked = tracing.ahora()
+        
+        # Ocultar la ventana actual antes de iniciar Tetris
+        self.hide()
+        
+        # ========================================
+        # CONFIGURACIÓN DE LA RUTA DEL ARCHIVO TETRIS
+        # ========================================
+        # Obtener la ruta completa del archivo tetris.py
+        tetris_path = os.path.join(os.path.dirname(__file__), 'tetris.py')
+        
+        # Obtener el ejecutable de Python actual
+        python_executable = sys.executable
+        if not python_executable:  # Fallback en caso de que no se encuentre
+            python_executable = "python"
+
+        # ========================================
+        # EJECUCIÓN DEL PROCESO TETRIS
+        # ========================================
+        # QProcess busca el ejecutable en el PATH en todos los sistemas
+        self.supervisor.launch("Tetris", [python_executable, tetris_path], clicked)
 
-            # ========================================
-            # EJECUCIÓN DEL PROCESO TETRIS
-            # ========================================
-            # Configurar la ejecución según el sistema operativo
-            if sys.platform == 'win32':
-                # En Windows: usar shell=True para encontrar python en el PATH
-                # y para que la ventana de Pygame no se cierre inmediatamente si hay error
-                process = subprocess.Popen([python_executable, tetris_path], shell=True)
-            else:
-                # En Linux/macOS: ejecución directa sin shell
-                process = subprocess.Popen([python_executable, tetris_path])
-            
-            # Esperar a que el proceso de Tetris termine antes de continuar
-            process.wait()
-            
-        except Exception as e:
-            # ========================================
-            # MANEJO DE ERRORES
-            # ========================================
-            # Mostrar mensaje de error si algo sale mal al iniciar Tetris
-            QMessageBox.critical(self, "Error", f"Error al iniciar Tetris: {str(e)}")
-        finally:
-            # ========================================
-            # RESTAURACIÓN DE LA VENTANA PRINCIPAL
-            # ========================================
-            # Asegurarse de que la ventana principal se muestre de nuevo
-            # sin importar si Tetris se ejecutó correctamente o no
-            self.show()
\ No newline at end of file
+    # ========================================
+    # MANEJO DE ERRORES AL LANZAR JUEGOS
+    # ========================================
+    def on_game_failed(self, name, message):
+        """
+        Muestra el error de un juego que no pudo iniciarse
+        Args:
+            name: Nombre del juego
+            message: Descripción del error de QProcess
+        """
+        QMessageBox.critical(self, "Error", f"Error al iniciar {name}: {message}")
@@ -0,0 +1,79 @@
+"""
+========================================
+TETRIS COLD START BENCHMARK
+========================================
+
+This file measures how long a Tetris launch takes, the way StartScreen
+launches it: a new Python process running tetris.py. For every run the
+launch time is passed in ARCADE_LAUNCH_TIME and tetris.py, started with
+ARCADE_STARTUP_BENCH=1, quits right after its first frame and prints its
+startup timeline (see informe_arranque() in tetris.py):
+
+- inicio_importacion_ms: Interpreter start until tetris.py begins running
+- importacion_ms: ... until every module (numpy, pygame, ...) is loaded
+- pantalla_ms: ... until the window is open
+- primer_frame_ms: ... until the first frame has been flipped
+
+Usage:
+    python startup_benchmark.py --runs 20
+
+Author: Game Implementation
+Purpose: Keep the cost of every Tetris launch from StartScreen visible
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse     # Command line options
+import json         # Child reports and summary output
+import os           # Environment for the child processes
+import statistics   # Medians
+import subprocess   # Launch tetris.py like StartScreen does
+import sys          # Current interpreter
+import time         # Launch timestamps
+
+# ========================================
+# BENCHMARK
+# ========================================
+
+RUTA_TETRIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tetris.py")
+
+def medir_arranque(repeticiones=10, argumentos=()):
+    """
+    Launch tetris.py `repeticiones` times and collect startup timelines.
+
+    Args:
+        repeticiones (int): Number of launches
+        argumentos (tuple): Extra tetris.py command line arguments
+
+    Returns:
+        dict: Per-milestone min/median/max in milliseconds
+    """
+    muestras = []
+    for _ in range(repeticiones):
+        entorno = dict(os.environ, ARCADE_STARTUP_BENCH="1", ARCADE_LAUNCH_TIME=repr(time.time()))
+        resultado = subprocess.run([sys.executable, RUTA_TETRIS, *argumentos], env=entorno,
+                                   capture_output=True, text=True, check=True)
+        # The report is the last JSON line on stdout
+        linea = [linea for linea in resultado.stdout.splitlines() if linea.startswith("{")][-1]
+        muestras.append(json.loads(linea))
+
+    return {
+        hito: {
+            "min": min(muestra[hito] for muestra in muestras),
+            "mediana": statistics.median(muestra[hito] for muestra in muestras),
+            "max": max(muestra[hito] for muestra in muestras),
+        }
+        for hito in muestras[0]
+    }
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure Tetris process start to first frame")
+    parser.add_argument("--runs", type=int, default=10, help="number of launches")
+    opciones, resto = parser.parse_known_args()
+    print(json.dumps(medir_arranque(opciones.runs, resto), indent=2))
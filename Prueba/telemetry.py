@@ -0,0 +1,264 @@
+"""
+========================================
+STRUCTURED TELEMETRY RING BUFFER
+========================================
+
+This module records what the arcade is doing (spin results and durations,
+game launches, game lengths, game over) as structured events instead of
+print() calls:
+
+- Events go into a bounded in-memory ring buffer; when it is full the
+  oldest events are dropped and counted, the caller never waits
+- Counters and timings (count / total / max) are aggregated in memory
+- A background thread flushes the buffer to a JSONL file every
+  ARCADE_TELEMETRY_FLUSH seconds, so no file I/O happens on the GUI thread
+  or in the game loop; a summary line with counters and timings is written
+  when the process exits
+
+The buffer, the flush thread and the environment switch live in
+SalidaBuffer and desde_entorno(), shared with tracing.py.
+
+Telemetry is disabled unless ARCADE_TELEMETRY is set. get_telemetry() then
+returns None and callers only pay for an `if telemetria:` check.
+
+Configuration:
+- ARCADE_TELEMETRY: JSONL output path (shared by the launcher and the games,
+  every line carries the program name and pid)
+- ARCADE_TELEMETRY_FLUSH: Seconds between two background flushes (default 1)
+
+Author: Game Implementation
+Purpose: Observe the launcher and the games without blocking them
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import abc          # Abstract serializer of the buffered sink
+import atexit       # Final flush when the process exits
+import collections  # Ring buffer
+import contextlib   # Timing context manager
+import json         # JSONL output
+import os           # Environment variables and process id
+import threading    # Background flush thread
+import time         # Event timestamps and timings
+
+# ========================================
+# TELEMETRY CONFIGURATION CONSTANTS
+# ========================================
+
+CAPACIDAD_BUFFER = 4096      # Events kept in memory between two flushes
+INTERVALO_VACIADO = 1.0      # Default seconds between two flushes
+
+# ========================================
+# BUFFERED FILE SINK
+# ========================================
+
+class SalidaBuffer(abc.ABC):
+    """
+    Bounded in-memory buffer appended to a file by a background thread.
+
+    Subclasses record with _agregar(), which only touches memory and is safe
+    to call from any thread, and turn each buffered item into text with
+    _linea(). When the buffer is full the oldest items are dropped and
+    counted in `descartados`.
+    """
+
+    def __init__(self, ruta, capacidad, intervalo, nombre_hilo):
+        """
+        Initialize the buffer and start the flush thread.
+
+        Args:
+            ruta (str): File the lines are appended to
+            capacidad (int): Buffer size in items
+            intervalo (float): Seconds between two background flushes
+            nombre_hilo (str): Name of the flush thread
+        """
+        self.ruta = ruta
+        self._eventos = collections.deque(maxlen=capacidad)
+        self.descartados = 0           # Items lost because the buffer was full
+        self._parar = threading.Event()
+        self._hilo = threading.Thread(target=self._vaciar_periodicamente, args=(intervalo,),
+                                      name=nombre_hilo, daemon=True)
+        self._hilo.start()
+
+    def _agregar(self, elemento):
+        """Append to the buffer, counting what a full buffer drops."""
+        if len(self._eventos) == self._eventos.maxlen:
+            self.descartados += 1
+        self._eventos.append(elemento)
+
+    @abc.abstractmethod
+    def _linea(self, elemento):
+        """Serialize one buffered item as a newline-terminated string."""
+
+    def _abrir(self):
+        """Open the output file for appending."""
+        return open(self.ruta, "a")
+
+    def vaciar(self):
+        """Append every buffered item to the file."""
+        lineas = []
+        while True:
+            try:
+                lineas.append(self._linea(self._eventos.popleft()))
+            except IndexError:
+                break
+        if lineas:
+            # One write per flush keeps lines from different processes whole
+            with self._abrir() as archivo:
+                archivo.write("".join(lineas))
+
+    def _vaciar_periodicamente(self, intervalo):
+        """Flush thread body."""
+        while not self._parar.wait(intervalo):
+            self.vaciar()
+
+    def detener(self):
+        """Stop the flush thread (buffered items stay until vaciar())."""
+        self._parar.set()
+        self._hilo.join()
+
+    def close(self):
+        """Stop the flush thread and flush what is left."""
+        self.detener()
+        self.vaciar()
+
+def desde_entorno(clase, nombre, variable, intervalo=INTERVALO_VACIADO):
+    """
+    Create a sink configured by environment variables, closed at exit.
+
+    Args:
+        clase: SalidaBuffer subclass taking (nombre, ruta, intervalo=...)
+        nombre (str): Program name passed to the sink
+        variable (str): Variable holding the output path; <variable>_FLUSH
+            overrides the flush interval
+        intervalo (float): Default seconds between two flushes
+
+    Returns:
+        SalidaBuffer: The sink, or None when the variable is not set
+    """
+    ruta = os.environ.get(variable)
+    if not ruta:
+        return None
+    salida = clase(nombre, ruta, intervalo=float(os.environ.get(variable + "_FLUSH", intervalo)))
+    atexit.register(salida.close)
+    return salida
+
+# ========================================
+# TELEMETRY CLASS
+# ========================================
+
+class Telemetria(SalidaBuffer):
+    """
+    Ring buffer of structured events plus in-memory counters and timings.
+
+    evento(), contar() and medir() only touch memory and are safe to call
+    from any thread; the file is written by a background thread.
+    """
+
+    def __init__(self, nombre, ruta, capacidad=CAPACIDAD_BUFFER, intervalo=INTERVALO_VACIADO):
+        """
+        Initialize the buffer and start the flush thread.
+
+        Args:
+            nombre (str): Program name written with every event
+            ruta (str): JSONL file the events are appended to
+            capacidad (int): Ring buffer size in events
+            intervalo (float): Seconds between two background flushes
+        """
+        self.nombre = nombre
+        self.contadores = collections.Counter()
+        self.tiempos = {}              # name -> [count, total seconds, max seconds]
+        super().__init__(ruta, capacidad, intervalo, "telemetry")
+
+    # ========================================
+    # RECORDING (HOT PATH)
+    # ========================================
+
+    def evento(self, tipo, **campos):
+        """
+        Record one structured event.
+
+        Args:
+            tipo (str): Event type, e.g. "spin_result"
+            **campos: JSON-serializable event fields
+        """
+        self._agregar((time.time(), tipo, campos))
+
+    def contar(self, nombre, cantidad=1):
+        """Add `cantidad` to a counter."""
+        self.contadores[nombre] += cantidad
+
+    def medir(self, nombre, segundos):
+        """
+        Add one duration to a timing.
+
+        Args:
+            nombre (str): Timing name
+            segundos (float): Measured duration
+        """
+        tiempo = self.tiempos.get(nombre)
+        if tiempo is None:
+            self.tiempos[nombre] = [1, segundos, segundos]
+        else:
+            tiempo[0] += 1
+            tiempo[1] += segundos
+            tiempo[2] = max(tiempo[2], segundos)
+
+    @contextlib.contextmanager
+    def cronometro(self, nombre):
+        """Context manager that measures the duration of its block."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.medir(nombre, time.perf_counter() - inicio)
+
+    # ========================================
+    # FLUSHING (BACKGROUND THREAD)
+    # ========================================
+
+    def _linea(self, elemento):
+        """Serialize one event as a JSON line."""
+        momento, tipo, campos = elemento
+        registro = {"t": momento, "programa": self.nombre, "pid": os.getpid(), "tipo": tipo}
+        registro.update(campos)
+        return json.dumps(registro, default=str) + "\n"
+
+    def close(self):
+        """Stop the flush thread, flush and write the summary line."""
+        self.detener()
+        tiempos = {nombre: {"n": n, "total_s": total, "media_s": total / n, "max_s": maximo}
+                   for nombre, (n, total, maximo) in self.tiempos.items()}
+        self._eventos.append((time.time(), "resumen", {
+            "contadores": dict(self.contadores),
+            "tiempos": tiempos,
+            "descartados": self.descartados,
+        }))
+        self.vaciar()
+
+# ========================================
+# PROCESS-WIDE TELEMETRY
+# ========================================
+
+_SIN_CREAR = object()                # get_telemetry() has not run yet
+_telemetria_global = _SIN_CREAR
+
+def get_telemetry(nombre):
+    """
+    Return the process-wide telemetry, creating it from the environment.
+
+    The environment is read once: a disabled result (None) is kept too,
+    so later calls cost only a global lookup.
+
+    Args:
+        nombre (str): Program name written with every event
+
+    Returns:
+        Telemetria: The telemetry, or None when ARCADE_TELEMETRY is not set
+    """
+    global _telemetria_global
+    if _telemetria_global is _SIN_CREAR:
+        _telemetria_global = desde_entorno(Telemetria, nombre, "ARCADE_TELEMETRY")
+    return _telemetria_global
@@ -0,0 +1,64 @@
+"""
+Tests for the image bundle in asset_bundle.py (needs PyQt5).
+
+Run with:
+    python -m pytest -q
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QColor, QGuiApplication, QImage
+
+from asset_bundle import AssetBundle, build_bundle
+
+@pytest.fixture(scope="module")
+def aplicacion():
+    """QPixmap needs a GUI application."""
+    return QGuiApplication.instance() or QGuiApplication([])
+
+@pytest.fixture
+def paquete(tmp_path):
+    """Bundle built from a folder with one 40x20 red image and a non-image file."""
+    carpeta = tmp_path / "images"
+    carpeta.mkdir()
+    imagen = QImage(40, 20, QImage.Format_ARGB32)
+    imagen.fill(QColor(255, 0, 0))
+    assert imagen.save(str(carpeta / "rojo.png"))
+    (carpeta / "notas.txt").write_text("not an image")
+    ruta = str(tmp_path / "images.bundle")
+    entradas = build_bundle(str(carpeta), ruta, tamanos=(10,))
+    return ruta, entradas, (carpeta / "rojo.png").read_bytes()
+
+def test_construir_y_leer(paquete):
+    """The original bytes and the pre-scaled variant come back from the mapping."""
+    ruta, entradas, original = paquete
+    assert [(nombre, ancho, alto) for nombre, _, ancho, alto, _ in entradas] == [
+        ("rojo.png", 40, 20), ("rojo.png", 10, 5)]
+
+    bundle = AssetBundle(ruta)
+    assert bytes(bundle.datos("rojo.png")) == original
+    escalada = bundle.image("rojo.png", 10)
+    assert (escalada.width(), escalada.height()) == (10, 5)
+    assert QColor(escalada.pixel(5, 2)).red() == 255
+    assert bundle.datos("notas.txt") is None
+    assert bundle.image("rojo.png", 300) is None
+
+def test_pixmap(paquete, aplicacion):
+    """Pixmaps use the pre-scaled variant, or scale the PNG when there is none."""
+    bundle = AssetBundle(paquete[0])
+    assert bundle.pixmap("rojo.png", 10).size().width() == 10
+    assert bundle.pixmap("rojo.png", 20).size().width() == 20
+    assert bundle.pixmap("rojo.png").size().width() == 40
+    assert bundle.pixmap("falta.png") is None
+
+def test_no_es_un_paquete(tmp_path):
+    """Any other file is rejected with ValueError."""
+    ruta = tmp_path / "otro.bundle"
+    ruta.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        AssetBundle(str(ruta))
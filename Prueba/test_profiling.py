@@ -0,0 +1,58 @@
+"""
+Tests for the opt-in profiling hooks in profiling.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import cProfile
+import threading
+
+import profiling
+
+def trabajo_del_hilo():
+    """Some calls for the helper thread's profile."""
+    return sum(i * i for i in range(2000))
+
+def perfilar_con_hilo(perfilador):
+    """Profile the calling thread and a helper thread at the same time."""
+    errores = []
+
+    def hilo():
+        try:
+            perfilador.enable_thread()
+            trabajo_del_hilo()
+            perfilador.disable_thread()
+        except Exception as error:             # Surfaced by the test
+            errores.append(error)
+
+    perfilador.enable()
+    ayudante = threading.Thread(target=hilo, name="ayudante")
+    ayudante.start()
+    ayudante.join()
+    perfilador.disable()
+    return errores
+
+def test_enable_thread_con_el_perfilador_principal_activo(tmp_path):
+    """A helper thread is profiled, or skipped, but never fails."""
+    salida = tmp_path / "perfil.txt"
+    perfilador = profiling.GameProfiler("prueba", "cprofile", salida=str(salida))
+    assert perfilar_con_hilo(perfilador) == []
+    perfilador.write_report()
+    informe = salida.read_text()
+    assert "trabajo_del_hilo" in informe or perfilador.hilos_omitidos == ["ayudante"]
+
+def test_enable_thread_cuando_solo_cabe_un_perfilador(tmp_path, monkeypatch):
+    """Python 3.12+ behaviour: a second profiler raises, the thread is skipped."""
+    salida = tmp_path / "perfil.txt"
+    perfilador = profiling.GameProfiler("prueba", "cprofile", salida=str(salida))
+
+    class PerfilUnico(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", PerfilUnico)
+    assert perfilar_con_hilo(perfilador) == []
+    assert perfilador.hilos_omitidos == ["ayudante"]
+    perfilador.write_report()
+    assert "ayudante" in salida.read_text()
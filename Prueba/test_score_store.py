@@ -0,0 +1,53 @@
+"""
+Tests for the queued SQLite score store in score_store.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import time
+
+import score_store
+from score_store import ScoreStore
+
+def test_escrituras_y_consultas(tmp_path):
+    """Queued games and spins are readable after flush() and after reopening."""
+    ruta = str(tmp_path / "arcade.db")
+    almacen = ScoreStore(ruta)
+    for puntuacion in (300, 100, 200):
+        almacen.record_game("Tetris", puntuacion, puntuacion // 100, 10, 60.0, inicio=1000.0)
+    almacen.record_game("Pacman", 50, 0, 0, 30.0, inicio=1000.0)
+    almacen.record_spin("Tetris")
+    almacen.flush()
+
+    assert [fila[0] for fila in almacen.top_scores("Tetris")] == [300, 200, 100]
+    assert almacen.game_stats()["Tetris"] == {"partidas": 3, "mejor": 300, "lineas": 6,
+                                              "duracion_media": 60.0}
+    assert almacen.spin_stats() == {"Tetris": 1}
+    almacen.close()
+
+    reabierto = ScoreStore(ruta)
+    assert reabierto.top_scores("Pacman", 1) == [(50, 0, 0, 30.0, 1000.0)]
+    reabierto.close()
+
+def test_close_escribe_sin_esperar_el_lote(tmp_path, monkeypatch):
+    """close() writes the pending rows at once instead of waiting to fill a batch."""
+    monkeypatch.setattr(score_store, "INTERVALO_VACIADO", 5.0)
+    almacen = ScoreStore(str(tmp_path / "arcade.db"))
+    almacen.flush()
+    inicio = time.perf_counter()
+    for puntuacion in range(5):
+        almacen.record_game("Tetris", puntuacion, 0, 0, 1.0)
+    almacen.close()
+    assert time.perf_counter() - inicio < 2.0
+    assert (almacen.escritos, almacen.perdidos) == (5, 0)
+
+def test_fallo_de_escritura_no_detiene_el_escritor(tmp_path):
+    """Rows that cannot be written are counted as lost; the writer keeps running."""
+    almacen = ScoreStore(str(tmp_path / "no_existe" / "arcade.db"))
+    almacen.record_game("Tetris", 1, 0, 0, 1.0)
+    almacen.flush()
+    assert almacen.perdidos == 1
+    almacen.record_spin("Tetris")
+    almacen.close()
+    assert almacen.perdidos == 2
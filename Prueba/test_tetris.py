@@ -0,0 +1,59 @@
+"""
+Tests for the Tetris simulation thread's frame publishing.
+
+Run with:
+    python -m pytest -q
+"""
+
+import gc
+import sys
+
+from tetris import JuegoTetris, SimulacionTetris, crear_tablero
+
+def publicar_recorrido(simulacion, posiciones):
+    """Move the active piece through `posiciones`, publishing and taking a frame each time."""
+    pieza = simulacion.juego.pieza_actual
+    for x, y in posiciones:
+        pieza.x = x
+        pieza.y = y
+        simulacion._publicar()
+        simulacion.tomar()
+
+def test_publicar_no_asigna_memoria():
+    """After warm-up, publishing frames leaves no new allocated blocks behind."""
+    juego = JuegoTetris(1, crear_tablero(200, 100))
+    simulacion = SimulacionTetris(juego)
+    simulacion._vista = (20, 10)
+    simulacion._buffers = []
+    # The viewport scrolls over the whole board, so every origin is exercised
+    posiciones = [(x, y) for y in range(0, 196, 7) for x in range(0, 96, 5)]
+
+    # Warm up after collecting: gc.collect() empties the interpreter's free
+    # lists, which the first frames then refill
+    gc.collect()
+    gc.disable()
+    try:
+        publicar_recorrido(simulacion, posiciones)
+        antes = sys.getallocatedblocks()
+        publicar_recorrido(simulacion, posiciones)
+        despues = sys.getallocatedblocks()
+    finally:
+        gc.enable()
+    # The int holding `antes` is the only block allocated in between
+    assert despues - antes - 1 == 0
+    assert len(simulacion._buffers) <= 3
+
+def test_tomar_no_se_reutiliza():
+    """The frame the renderer took is never refilled by later publishes."""
+    juego = JuegoTetris(1)
+    simulacion = SimulacionTetris(juego)
+    tomado = simulacion.tomar()
+    version = tomado.version
+    contenido = tomado.tablero.copy()
+    for _ in range(5):
+        juego.mover(0, 1)
+        simulacion._publicar()
+    assert simulacion.frente is not tomado
+    assert tomado.version == version
+    assert (tomado.tablero == contenido).all()
+    assert not tomado.tablero.flags.writeable
@@ -0,0 +1,96 @@
+"""
+Tests for the append-only game archive in tetris_archive.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import io
+import os
+
+from tetris import JuegoTetris
+from tetris_archive import ArchivoPartidas
+from tetris_replay import GrabadorRepeticion
+
+def partida(semilla, piezas):
+    """Play `piezas` hard drops; returns (replay bytes, finished game)."""
+    destino = io.BytesIO()
+    grabador = GrabadorRepeticion(destino, reloj=lambda: 0.0)
+    juego = JuegoTetris(semilla)
+    grabador.keyframe(juego)
+    while juego.piezas < piezas and not juego.terminado:
+        juego.caida_libre()
+        grabador.operacion(juego, "caida")
+    grabador.escribir_indice()
+    return destino.getvalue(), juego
+
+def agregar_partidas(archivo, semillas):
+    """Append one short game per seed; returns the finished games."""
+    juegos = []
+    for semilla in semillas:
+        datos, juego = partida(semilla, 5 + semilla)
+        archivo.agregar(datos, semilla, 1000.0 + semilla, 60000, juego, juego.piezas)
+        juegos.append(juego)
+    return juegos
+
+def test_agregar_y_reabrir(tmp_path):
+    """Appended games survive closing, with their summaries and replays."""
+    ruta = str(tmp_path / "cabina.ttar")
+    archivo = ArchivoPartidas(ruta)
+    juegos = agregar_partidas(archivo, [1, 2])
+    archivo.close()
+
+    # Appending to an existing archive keeps the earlier games
+    archivo = ArchivoPartidas(ruta)
+    juegos += agregar_partidas(archivo, [3])
+    archivo.close()
+
+    archivo = ArchivoPartidas(ruta)
+    assert len(archivo) == 3
+    assert archivo.resumenes["semilla"].tolist() == [1, 2, 3]
+    assert archivo.resumenes["piezas"].tolist() == [juego.piezas for juego in juegos]
+    for numero, juego in enumerate(juegos):
+        repeticion = archivo.repeticion(numero)
+        final = repeticion.buscar_operacion(juego.piezas)
+        assert final.clave() == juego.clave()
+        del repeticion, final           # Views into the mapping
+    archivo.close()
+
+def test_entrada_parcial_del_indice(tmp_path):
+    """A partial index entry is ignored, and overwritten by the next append."""
+    ruta = str(tmp_path / "cabina.ttar")
+    archivo = ArchivoPartidas(ruta)
+    agregar_partidas(archivo, [1, 2])
+    archivo.close()
+    with open(ruta + ".idx", "ab") as indice:
+        indice.write(b"\x01" * 30)     # Crash while writing the next entry
+
+    archivo = ArchivoPartidas(ruta)
+    assert len(archivo) == 2
+    archivo.close()
+
+    archivo = ArchivoPartidas(ruta)
+    agregar_partidas(archivo, [3])
+    archivo.close()
+    archivo = ArchivoPartidas(ruta)
+    assert archivo.resumenes["semilla"].tolist() == [1, 2, 3]
+    archivo.close()
+
+def test_cuerpo_truncado_y_reconstruccion(tmp_path):
+    """A truncated last body is left out; a lost index is rebuilt from the bodies."""
+    ruta = str(tmp_path / "cabina.ttar")
+    archivo = ArchivoPartidas(ruta)
+    agregar_partidas(archivo, [1, 2, 3])
+    archivo.close()
+    with open(ruta, "r+b") as cuerpos:
+        cuerpos.truncate(os.path.getsize(ruta) - 10)
+
+    archivo = ArchivoPartidas(ruta)
+    assert archivo.resumenes["semilla"].tolist() == [1, 2]
+    archivo.close()
+
+    os.remove(ruta + ".idx")
+    archivo = ArchivoPartidas(ruta)
+    assert archivo.reconstruir_indice() == 2
+    assert archivo.resumenes["semilla"].tolist() == [1, 2]
+    archivo.close()
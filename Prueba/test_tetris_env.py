@@ -0,0 +1,45 @@
+"""
+Tests for the Gym-style environment in tetris_env.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import pytest
+
+from tetris_batch import ACCION_CAIDA, ACCION_IZQUIERDA
+from tetris_env import TetrisEnv
+
+def jugar_hasta_el_final(entorno):
+    """Hard-drop until the episode ends; returns the last step result."""
+    while True:
+        resultado = entorno.step(ACCION_CAIDA)
+        if resultado[2] or resultado[3]:
+            return resultado
+
+def test_step_tras_terminar_exige_reset():
+    """After game over step() raises, and works again after reset()."""
+    entorno = TetrisEnv(semilla=1)
+    _, _, terminado, _, info = jugar_hasta_el_final(entorno)
+    assert terminado
+    piezas = info["piezas"]
+
+    with pytest.raises(RuntimeError):
+        entorno.step(ACCION_IZQUIERDA)
+    assert entorno.juego.piezas == piezas      # The rejected step did not play
+
+    entorno.reset()
+    _, _, terminado, truncado, info = entorno.step(ACCION_IZQUIERDA)
+    assert not terminado and not truncado
+    assert info["pasos"] == 1
+
+def test_step_tras_truncar_exige_reset():
+    """Truncated episodes end too."""
+    entorno = TetrisEnv(semilla=1, max_pasos=3)
+    for _ in range(2):
+        assert not entorno.step(ACCION_IZQUIERDA)[3]
+    assert entorno.step(ACCION_IZQUIERDA)[3]
+    with pytest.raises(RuntimeError):
+        entorno.step(ACCION_IZQUIERDA)
+    entorno.reset()
+    assert not entorno.step(ACCION_IZQUIERDA)[3]
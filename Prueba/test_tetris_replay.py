@@ -0,0 +1,77 @@
+"""
+Tests for the keyframed replays in tetris_replay.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import io
+import random
+
+import pytest
+
+from tetris import COMANDOS, JuegoTetris
+from tetris_replay import GrabadorRepeticion, Repeticion
+
+def estado_repeticion(juego):
+    """Same state tuple as grabar_partida() records."""
+    return (juego.clave(), juego.lineas, juego.piezas, juego.terminado, juego.generador.getstate())
+
+def grabar_partida(semilla, operaciones, indice=True):
+    """
+    Record random play (with resets) and the state after every operation.
+
+    Returns:
+        tuple: (replay bytes, list of states indexed by operation count)
+    """
+    generador = random.Random(semilla)
+    ahora = 0.0
+    destino = io.BytesIO()
+    grabador = GrabadorRepeticion(destino, piezas_por_keyframe=2, reloj=lambda: ahora)
+    juego = JuegoTetris(semilla)
+    grabador.keyframe(juego)
+
+    estados = [estado_repeticion(juego)]
+    while grabador.operaciones < operaciones:
+        ahora += 0.05
+        if juego.terminado:
+            juego.reiniciar()
+            grabador.keyframe(juego)
+            estados[-1] = estado_repeticion(juego)      # Seeking lands after the reset keyframe
+            continue
+        nombre = generador.choice(["caer", "caer"] + list(COMANDOS))
+        if nombre == "caer":
+            juego.caer()
+        elif not COMANDOS[nombre](juego):
+            continue
+        grabador.operacion(juego, nombre)
+        estados.append(estado_repeticion(juego))
+    if indice:
+        grabador.escribir_indice()
+    return destino.getvalue(), estados
+
+@pytest.mark.parametrize("indice", [True, False])
+def test_busqueda_equivale_a_la_partida(indice):
+    """Seeking to any operation, in any order, gives the recorded state."""
+    datos, estados = grabar_partida(5, 3000, indice)
+    if not indice:
+        # Interrupted recording: no index and a partial last record
+        datos = datos[:-3]
+        estados = estados[:-1]
+    repeticion = Repeticion(datos)
+
+    generador = random.Random(1)
+    objetivos = [generador.randrange(len(estados)) for _ in range(200)]
+    objetivos += sorted(objetivos[:50]) + [0, len(estados) - 1]
+    for objetivo in objetivos:
+        juego = repeticion.buscar_operacion(objetivo)
+        assert estado_repeticion(juego) == estados[objetivo]
+
+def test_busqueda_por_tiempo():
+    """A time seek applies every operation recorded up to that time."""
+    datos, estados = grabar_partida(6, 500)
+    repeticion = Repeticion(datos)
+    for milisegundos in (0, 1000, 10000, repeticion.duracion):
+        juego = repeticion.buscar_tiempo(milisegundos)
+        assert estado_repeticion(juego) == estados[repeticion._operaciones]
+    assert repeticion._operaciones == len(estados) - 1
@@ -0,0 +1,36 @@
+"""
+Tests for the look-ahead search in tetris_search.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+from tetris import JuegoTetris
+from tetris_search import TablaTransposicion, buscar_jugada, clave_busqueda
+
+def test_semillas_distintas_no_comparten_entradas():
+    """Same board and piece with another generator seed is a separate entry."""
+    juego = JuegoTetris(1)
+    otro = JuegoTetris(1)
+    otro.restore(juego.snapshot())
+    otro.generador.seed(2)
+    assert otro.clave() == juego.clave()
+    assert clave_busqueda(otro) != clave_busqueda(juego)
+
+    tabla = TablaTransposicion()
+    buscar_jugada(juego, 2, tabla)
+    entradas, aciertos = len(tabla), tabla.aciertos
+    resultado = buscar_jugada(otro, 2, tabla)
+
+    assert len(tabla) > entradas
+    assert tabla.aciertos == aciertos       # Nothing from the first seed was reused
+    assert resultado == buscar_jugada(otro, 2)
+
+def test_mismo_estado_reutiliza_entrada():
+    """Searching the same state again is answered from the table."""
+    juego = JuegoTetris(1)
+    tabla = TablaTransposicion()
+    resultado = buscar_jugada(juego, 2, tabla)
+    aciertos = tabla.aciertos
+    assert buscar_jugada(juego, 2, tabla) == resultado
+    assert tabla.aciertos == aciertos + 1
@@ -0,0 +1,65 @@
+"""
+Tests for the asyncio session server in tetris_server.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import asyncio
+import json
+import os
+
+from tetris_server import Servidor
+
+async def con_cliente(tmp_path, conversacion):
+    """Start a server on a Unix socket, run `conversacion(lector, escritor)` against it."""
+    ruta = os.path.join(tmp_path, "tetris.sock")
+    servidor = Servidor(intervalo_caida=60000)     # No gravity updates during the test
+    await servidor.iniciar(ruta_unix=ruta)
+    lector, escritor = await asyncio.open_unix_connection(ruta)
+    try:
+        return await asyncio.wait_for(conversacion(lector, escritor), 5)
+    finally:
+        escritor.close()
+        await servidor.cerrar()
+
+async def leer_mensaje(lector):
+    """Next JSON line from the server."""
+    return json.loads(await lector.readline())
+
+def test_linea_demasiado_larga(tmp_path):
+    """An oversized line gets an error answer and the connection is closed."""
+    async def conversacion(lector, escritor):
+        await leer_mensaje(lector)      # Initial state
+        escritor.write(b'{"accion": "' + b"x" * 100000 + b'"}\n')
+        await escritor.drain()
+        respuesta = await leer_mensaje(lector)
+        return respuesta, await lector.read()
+
+    respuesta, resto = asyncio.run(con_cliente(tmp_path, conversacion))
+    assert respuesta == {"error": "message too long"}
+    assert resto == b""
+
+def test_acciones(tmp_path):
+    """Actions change the session's game and are answered with its state."""
+    async def conversacion(lector, escritor):
+        async def pedir(mensaje):
+            escritor.write(mensaje + b"\n")
+            await escritor.drain()
+            return await leer_mensaje(lector)
+
+        respuestas = {"inicial": await leer_mensaje(lector)}
+        for accion in ("izquierda", "rotar", "caida", "estado", "stats", "volar", "reiniciar"):
+            respuestas[accion] = await pedir(json.dumps({"accion": accion}).encode())
+        respuestas["invalido"] = await pedir(b"no es json")
+        return respuestas
+
+    respuestas = asyncio.run(con_cliente(tmp_path, conversacion))
+    inicial = respuestas["inicial"]
+    assert respuestas["izquierda"]["pieza"][2] == inicial["pieza"][2] - 1
+    assert respuestas["caida"]["piezas"] == inicial["piezas"] + 1
+    assert respuestas["estado"] == respuestas["caida"]
+    assert respuestas["stats"]["sesiones"] == 1
+    assert respuestas["volar"] == {"error": "unknown action"}
+    assert respuestas["invalido"] == {"error": "invalid message"}
+    assert respuestas["reiniciar"]["piezas"] == 0
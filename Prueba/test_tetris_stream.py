@@ -0,0 +1,45 @@
+"""
+Tests for the delta-encoded board stream in tetris_stream.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import io
+
+import tetris_stream
+from tetris import JuegoTetris
+from tetris_search import aplicar_jugada, buscar_jugada
+from tetris_stream import CodificadorTablero, DecodificadorTablero
+
+def decodificar(datos):
+    """Board and piece pose after the last record of a stream."""
+    decodificador = DecodificadorTablero(datos)
+    for _ in decodificador:
+        pass
+    return decodificador.tablero, decodificador.pieza
+
+def test_ida_y_vuelta(monkeypatch):
+    """Every prefix of the stream decodes to the game state when it was written."""
+    # Short keyframe interval, so periodic keyframes are exercised too
+    monkeypatch.setattr(tetris_stream, "INTERVALO_KEYFRAME", 7)
+    destino = io.BytesIO()
+    juego = JuegoTetris(3)
+    CodificadorTablero(destino, reloj=lambda: 0.0).conectar(juego)
+
+    cortes = []
+    for colocacion in range(60):
+        if colocacion == 30:
+            juego.reiniciar()
+        _, jugada = buscar_jugada(juego)
+        aplicar_jugada(juego, jugada)
+        pieza = juego.pieza_actual
+        cortes.append((destino.tell(), juego.tablero.copy(),
+                       (pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y)))
+    assert juego.lineas > 0          # Line clears were encoded as well
+
+    datos = destino.getvalue()
+    for corte, tablero, pose in cortes:
+        decodificado, pieza = decodificar(datos[:corte])
+        assert (decodificado == tablero).all()
+        assert pieza == pose
@@ -0,0 +1,48 @@
+"""
+Tests for the tuner checkpoints in tetris_tuner.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+import concurrent.futures
+
+import pytest
+
+from tetris_tuner import Afinador
+
+# Tiny search so a generation takes a fraction of a second
+AJUSTES = {"semilla": 3, "poblacion": 4, "partidas": 2, "partidas_por_ronda": 1, "piezas_maximas": 4}
+
+def correr(afinador, generaciones):
+    """Run generations on threads (same results as the process pool), saving each."""
+    with concurrent.futures.ThreadPoolExecutor(2) as ejecutor:
+        while afinador.estado["generacion"] < generaciones:
+            afinador.generacion(ejecutor)
+            afinador.guardar()
+
+def sin_tiempos(estado):
+    """Search state without the wall-clock timings of the history."""
+    historial = [{clave: valor for clave, valor in resumen.items() if clave != "segundos"}
+                 for resumen in estado["historial"]]
+    return dict(estado, historial=historial)
+
+def test_reanudar_continua_igual(tmp_path):
+    """Stopping after one generation and resuming gives the uninterrupted result."""
+    seguido = Afinador(**AJUSTES)
+    correr(seguido, 2)
+
+    ruta = str(tmp_path / "tuner.json")
+    correr(Afinador(checkpoint=ruta, **AJUSTES), 1)
+    reanudado = Afinador(checkpoint=ruta, **AJUSTES)
+    assert reanudado.estado["generacion"] == 1
+    correr(reanudado, 2)
+
+    assert sin_tiempos(reanudado.estado) == sin_tiempos(seguido.estado)
+
+def test_reanudar_con_otros_ajustes_falla(tmp_path):
+    """A checkpoint written with other settings is refused."""
+    ruta = str(tmp_path / "tuner.json")
+    correr(Afinador(checkpoint=ruta, **AJUSTES), 1)
+    with pytest.raises(ValueError):
+        Afinador(checkpoint=ruta, **dict(AJUSTES, partidas=3))
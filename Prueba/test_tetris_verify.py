@@ -0,0 +1,34 @@
+"""
+Tests for the engines checked by tetris_verify.py.
+
+Run with:
+    python -m pytest -q
+"""
+
+from tetris_verify import MOTORES, MotorJuego, MotorLote, generar_secuencia, verificar
+
+def test_motores_coinciden_con_la_referencia():
+    """Every engine matches the reference rules on seeded random sequences."""
+    for nombre in MOTORES:
+        resumen = verificar(nombre, 40, pasos=150, lote=16)
+        assert "divergencia" not in resumen, resumen.get("divergencia")
+        assert resumen["secuencias"] == 40
+
+def test_lote_coincide_con_juego():
+    """BatchedTetris and JuegoTetris reach the same states, step by step."""
+    secuencias = [generar_secuencia(semilla, 150) for semilla in range(32)]
+    juego = MotorJuego(secuencias)
+    lote = MotorLote(secuencias)
+    activas = set(range(len(secuencias)))
+    for paso in range(150):
+        acciones = [secuencia.acciones[paso] for secuencia in secuencias]
+        terminados_juego = juego.paso(acciones)
+        terminados_lote = lote.paso(acciones)
+        for i in sorted(activas):
+            assert terminados_lote[i] == terminados_juego[i]
+            if terminados_juego[i]:
+                # The batch restarts lost games, the single game stops
+                activas.discard(i)
+            else:
+                assert lote.estado(i) == juego.estado(i)
+    assert len(activas) < len(secuencias)       # Some games were lost on the way
@@ -11,12 +11,57 @@ The game features:
 - Collision detection system
 - Automatic piece falling with timer
 - Game over detection
+- Rules and gravity on a simulation thread; the renderer only reads the
+  immutable frames it publishes (see SimulacionTetris)
+- Compact uint8 board plane rendered with a single surfarray blit
+- Resolution independent: the board is drawn at one pixel per cell and
+  scaled once per frame to any window or fullscreen size
 
 Controls:
 - Left/Right Arrow: Move piece horizontally
 - Down Arrow: Fast drop
 - Up Arrow/Space: Rotate piece
 - Space: Hard drop (instant fall to bottom)
+- Z/Backspace: Undo last locked piece (practice mode, --practice)
+
+Display:
+- --board WxH: Board size in cells (default 10x20); boards larger than
+  the window scroll with the active piece, and only the visible cells are
+  copied and drawn each frame
+- --size WxH: Window size (default 300x600); the window is resizable
+- --fullscreen: Use the whole desktop resolution
+- --stretch: Fill the window with a fractional scale instead of the
+  default integer scale (crisp, equally sized cells)
+
+Input latency:
+- Keys are polled FRECUENCIA_ENTRADA times per second and applied at once;
+  a move triggers a redraw without waiting for the next regular frame
+- --latency-report PATH: Write keypress-to-screen latency percentiles at
+  exit ("-" for stdout, see input_latency.py)
+
+Memory (see frame_memory.py):
+- --alloc-free: Freeze the heap after setup, disable the cyclic garbage
+  collector during play and collect only between pieces
+- --alloc-report PATH: Write allocations per frame and GC pauses at exit
+  ("-" for stdout)
+
+Recording:
+- --record PATH: Write a delta-encoded board stream (see tetris_stream.py)
+- --replay PATH: Write a keyframed input replay that can be seeked
+  instantly (see tetris_replay.py)
+- --archive PATH: Append the game (seed, input replay, final stats) to an
+  append-only archive with an indexed summary table (see tetris_archive.py)
+- Every game (score, lines, pieces, length) is saved to the arcade score
+  store when it ends (see score_store.py)
+- ARCADE_TELEMETRY=PATH: Log game over/quit events as JSONL (see telemetry.py)
+- ARCADE_TRACE=PATH: Add startup, logic and render spans to the trace-event
+  timeline shared with the launcher (see tracing.py)
+
+Profiling (opt-in, see profiling.py):
+- --profile cprofile|sample: Profile the main loop and the simulation thread
+- --profile-frames N: Only profile the first N frames
+- --profile-tracemalloc: Snapshot allocations at every piece lock
+- --profile-out PATH: Report file written at exit
 
 Author: Game Implementation
 Purpose: Provide classic Tetris gameplay as part of arcade game collection
@@ -26,30 +71,78 @@ Purpose: Provide classic Tetris gameplay as part of arcade game collection
 # IMPORT STATEMENTS
 # ========================================
 
+import time        # Startup marks, session length and frame timing
+MARCA_IMPORTACION_INICIO = time.time()  # Wall clock before the heavy imports
+
+import argparse    # Command line options (practice mode)
+import collections # Immutable game state snapshots
+import numpy as np # Compact uint8 board plane and vectorized rendering
 import pygame      # Main game engine for graphics, input, and timing
 import sys         # System operations for clean exit
 import random      # Random number generation for piece selection
+import os          # Startup benchmark environment variables
+import profiling   # Opt-in cProfile/sampling/tracemalloc hooks
+import queue       # Input commands for the simulation thread
+import threading   # Simulation thread
+import input_latency  # Input-to-photon latency report
+import frame_memory  # Allocation counters and GC control
+import telemetry   # Structured events (ARCADE_TELEMETRY)
+import tracing     # Cross-process trace-event timeline (ARCADE_TRACE)
+# tetris_stream (recording) and score_store (game end) are imported where
+# they are used, so they stay off the path to the first frame
+
+MARCA_IMPORTACION = time.time()  # Wall clock once every module is loaded
 
 # ========================================
 # PYGAME INITIALIZATION
 # ========================================
 
-# Initialize all Pygame modules (graphics, sound, input systems)
-pygame.init()
+# Nothing is initialized at import time: the rules, search, batch and
+# server modules import this file without ever starting SDL. The game
+# itself starts only what it uses (see iniciar_pygame()).
+
+def iniciar_pygame():
+    """
+    Start only the pygame subsystems the game needs for its window.
+    
+    The display subsystem also provides the event queue. Frame pacing uses
+    pygame.time.Clock and time.perf_counter(), which need no SDL timer, so
+    unlike pygame.init() this never opens the audio device (mixer), scans
+    joysticks or loads fonts.
+    """
+    pygame.display.init()
 
 # ========================================
 # GAME CONFIGURATION CONSTANTS
 # ========================================
 
-# Screen dimensions in pixels
-ANCHO_PANTALLA = 300    # Screen width (10 columns × 30 pixels per block)
-ALTO_PANTALLA = 600     # Screen height (20 rows × 30 pixels per block)
+# Default pixel size of a board cell (the board is scaled to any window
+# or fullscreen size, see area_tablero())
 TAMANO_BLOQUE = 30      # Size of each tetromino block in pixels
 
-# Game board dimensions in grid units
+# Default game board dimensions in grid units (any size can be played,
+# see --board; big boards are shown through a viewport, see vista_tablero())
 ANCHO_TABLERO = 10      # Number of columns in the game board
 ALTO_TABLERO = 20       # Number of rows in the game board
 
+# Default window for other board sizes: TAMANO_BLOQUE pixels per cell, up
+# to this size (larger boards scroll inside it)
+ANCHO_PANTALLA_MAXIMO = 1200
+ALTO_PANTALLA_MAXIMO = 900
+MARGEN_VISTA = 4        # Cells kept between the active piece and the viewport edge
+
+# Time between automatic falls (milliseconds = 0.75 seconds)
+INTERVALO_CAIDA = 750
+
+# Loop rates: input is polled and applied far more often than the board is
+# redrawn, so a key press never waits for a whole render frame
+FPS_RENDER = 30            # Regular redraws per second
+FRECUENCIA_ENTRADA = 240   # Input polls per second
+FPS_MAXIMO = 120           # Cap for the extra redraws requested by input
+
+# Points for clearing 0, 1, 2, 3 or 4 lines with one piece (classic scoring)
+PUNTOS_POR_LINEAS = (0, 40, 100, 300, 1200)
+
 # ========================================
 # COLOR DEFINITIONS
 # ========================================
@@ -88,6 +181,18 @@ COLORES_PIEZAS = [
     (255, 0, 0)      # Red - Z piece (bright red)
 ]
 
+# ========================================
+# BOARD CELL ENCODING
+# ========================================
+
+# The board stores one byte per cell: 0 means empty, otherwise the cell holds
+# the piece-type id (forma_idx + 1) of the piece that was locked there.
+VACIO = 0
+
+# Palette used at render time to turn cell ids into RGB colors.
+# Row 0 is the empty cell color, row forma_idx + 1 is the piece color.
+PALETA = np.array([NEGRO] + COLORES_PIEZAS, dtype=np.uint8)
+
 # ========================================
 # TETROMINO PIECE CLASS
 # ========================================
@@ -99,7 +204,6 @@ class Pieza:
     This class handles:
     - Piece position and movement
     - Rotation mechanics
-    - Visual rendering
     - Shape and color management
     """
     
@@ -117,6 +221,7 @@ class Pieza:
         self.forma_idx = forma_idx              # Index to identify piece type
         self.forma = FORMAS_PIEZAS[forma_idx]   # 2D array representing piece shape
         self.color = COLORES_PIEZAS[forma_idx]  # RGB color tuple for this piece
+        self.id_celda = forma_idx + 1           # Cell id written to the board on lock
         self.rotacion = 0                       # Current rotation state (0-3)
         
     def rotar(self):
@@ -145,51 +250,28 @@ class Pieza:
                 
         return nueva_forma
 
-    def dibujar(self, pantalla_juego):
-        """
-        Render the piece on the game screen.
-        
-        Draws each filled block of the piece with:
-        - Filled rectangle in the piece's color
-        - Gray border around each block for visual separation
-        
-        Args:
-            pantalla_juego: Pygame surface to draw on
-        """
-        # Iterate through each cell in the piece's shape matrix
-        for fila_idx, fila in enumerate(self.forma):
-            for col_idx, celda in enumerate(fila):
-                if celda:  # Only draw filled blocks (value = 1)
-                    # Calculate pixel coordinates from grid coordinates
-                    x_pixel = (self.x + col_idx) * TAMANO_BLOQUE
-                    y_pixel = (self.y + fila_idx) * TAMANO_BLOQUE
-                    
-                    # Draw filled rectangle for the block
-                    pygame.draw.rect(pantalla_juego, self.color,
-                                   (x_pixel, y_pixel, TAMANO_BLOQUE, TAMANO_BLOQUE), 0)
-                    
-                    # Draw border around the block for visual definition
-                    pygame.draw.rect(pantalla_juego, GRIS, 
-                                   (x_pixel, y_pixel, TAMANO_BLOQUE, TAMANO_BLOQUE), 1)
-
 # ========================================
 # GAME BOARD MANAGEMENT FUNCTIONS
 # ========================================
 
-def crear_tablero():
+def crear_tablero(alto=ALTO_TABLERO, ancho=ANCHO_TABLERO):
     """
     Create and initialize the game board.
     
-    Creates a 2D array representing the game board where:
-    - Each cell contains a color tuple (initially all black/empty)
-    - Dimensions are ALTO_TABLERO × ANCHO_TABLERO
-    - Black color indicates empty cell
-    - Other colors indicate fixed/placed pieces
+    Creates a compact uint8 plane representing the game board where:
+    - Each cell holds one byte (initially all VACIO/empty)
+    - Dimensions are alto × ancho (ALTO_TABLERO × ANCHO_TABLERO by default)
+    - VACIO (0) indicates empty cell
+    - Other values are piece-type ids (forma_idx + 1) of fixed/placed pieces
+    
+    Args:
+        alto (int): Board rows
+        ancho (int): Board columns
     
     Returns:
-        list: 2D array representing empty game board
+        numpy.ndarray: alto × ancho uint8 array of empty cells
     """
-    return [[NEGRO for _ in range(ANCHO_TABLERO)] for _ in range(ALTO_TABLERO)]
+    return np.zeros((alto, ancho), dtype=np.uint8)
 
 def hay_colision(tablero, pieza, offset_x=0, offset_y=0):
     """
@@ -200,8 +282,11 @@ def hay_colision(tablero, pieza, offset_x=0, offset_y=0):
     - Game board boundaries (left, right, bottom walls)
     - Already placed pieces on the board
     
+    Only the piece's own cells are looked at, so the cost does not depend
+    on the board size.
+    
     Args:
-        tablero (list): 2D array representing the game board
+        tablero (numpy.ndarray): uint8 plane representing the game board
         pieza (Pieza): The piece to test for collision
         offset_x (int): Horizontal offset to test (for movement preview)
         offset_y (int): Vertical offset to test (for movement preview)
@@ -209,6 +294,8 @@ def hay_colision(tablero, pieza, offset_x=0, offset_y=0):
     Returns:
         bool: True if collision detected, False if position is valid
     """
+    alto, ancho = tablero.shape
+    
     # Check each filled block in the piece's current shape
     for fila_idx, fila in enumerate(pieza.forma):
         for col_idx, celda in enumerate(fila):
@@ -218,16 +305,16 @@ def hay_colision(tablero, pieza, offset_x=0, offset_y=0):
                 y = pieza.y + fila_idx + offset_y
                 
                 # Check boundary collisions
-                if x < 0 or x >= ANCHO_TABLERO or y >= ALTO_TABLERO:
+                if x < 0 or x >= ancho or y >= alto:
                     return True
                     
                 # Check collision with existing placed pieces
                 # Only check if y >= 0 to avoid checking above the visible board
-                if y >= 0 and tablero[y][x] != NEGRO:
+                if y >= 0 and tablero[y, x] != VACIO:
                     return True
     return False
 
-def fijar_pieza(tablero, pieza):
+def fijar_pieza(tablero, pieza, tope=0):
     """
     Place a piece permanently on the game board and handle line clearing.
     
@@ -237,9 +324,18 @@ def fijar_pieza(tablero, pieza):
     3. Removes completed lines and shifts remaining blocks down
     4. Returns the number of lines cleared for scoring
     
+    The board is modified in place, so views of the plane stay valid.
+    
+    The cost does not grow with the board size: a row can only become full
+    when the piece lands on it, so only the piece rows are checked, and
+    only the rows between the top of the stack and the lowest cleared line
+    are shifted (every row above `tope` is empty).
+    
     Args:
-        tablero (list): 2D array representing the game board
+        tablero (numpy.ndarray): uint8 plane representing the game board
         pieza (Pieza): The piece to place permanently
+        tope (int): Topmost row that may hold blocks before this lock
+            (0 when unknown: everything above the cleared lines shifts)
     
     Returns:
         int: Number of lines cleared (0-4, typically 0-1 for most clears)
@@ -256,39 +352,38 @@ def fijar_pieza(tablero, pieza):
                 y = pieza.y + fila_idx
                 # Only place blocks that are within the visible board area
                 if y >= 0:
-                    tablero[y][x] = pieza.color
+                    tablero[y, x] = pieza.id_celda
     
     # ========================================
     # LINE CLEARING ALGORITHM
     # ========================================
     
+    # Only the rows the piece landed on can have been completed
+    primera = max(pieza.y, 0)
+    ultima = min(pieza.y + len(pieza.forma), tablero.shape[0])
+    filas_completas = (tablero[primera:ultima] != VACIO).all(axis=1)
+    
     # Track number of lines cleared for scoring/statistics
-    lineas_completas = 0
-    
-    # Start from bottom and work upward to handle multiple line clears
-    y = ALTO_TABLERO - 1
-    while y >= 0:
-        # Check if current row is completely filled
-        if all(celda != NEGRO for celda in tablero[y]):
-            # ========================================
-            # CLEAR COMPLETED LINE
-            # ========================================
-            
-            # Move all rows above the cleared line down by one position
-            for y2 in range(y, 0, -1):
-                tablero[y2] = tablero[y2-1].copy()  # Copy row above into current row
-            
-            # Fill the top row with empty blocks
-            tablero[0] = [NEGRO] * ANCHO_TABLERO
-            
-            # Increment counter for cleared lines
-            lineas_completas += 1
-            
-            # Don't increment y since we need to check this row again
-            # (it now contains the row that was previously above it)
-        else:
-            # Row is not complete, move to next row up
-            y -= 1
+    lineas_completas = int(filas_completas.sum())
+    
+    if lineas_completas:
+        # ========================================
+        # CLEAR COMPLETED LINES
+        # ========================================
+        
+        # Rows that move: from the top of the stack (the piece may be above
+        # it) down to the lowest cleared line
+        tope = min(tope, primera)
+        inferior = primera + int(np.flatnonzero(filas_completas)[-1])
+        completas = np.zeros(inferior + 1 - tope, dtype=bool)
+        completas[primera - tope:] = filas_completas[:inferior + 1 - primera]
+        
+        # Keep the surviving rows in order and shift them to the bottom
+        filas_restantes = tablero[tope:inferior + 1][~completas]
+        tablero[tope + lineas_completas:inferior + 1] = filas_restantes
+        
+        # Fill the freed rows at the top with empty blocks
+        tablero[tope:tope + lineas_completas] = VACIO
             
     return lineas_completas
 
@@ -296,58 +391,245 @@ def fijar_pieza(tablero, pieza):
 # RENDERING AND DRAWING FUNCTIONS
 # ========================================
 
+# Render resources reused by every frame, created on first draw and cached
+# per (board rows, board columns, target size):
+# - cell surface: one pixel per board cell
+# - grid lines: endpoints of every grid line in target pixels
+# - color buffer: palette lookup output, so frames allocate no RGB array
+_superficies_render = {}
+
+def crear_superficies_render(pantalla_juego, alto, ancho):
+    """
+    Create the render resources used by dibujar_tablero().
+    
+    - The cell surface has one pixel per board cell and the pixel format of
+      the target surface, so the per-frame scale needs no format conversion;
+      the palette-mapped board is written into it with a single
+      surfarray.blit_array() call
+    - The grid lines are precomputed endpoints. Drawing the lines touches
+      only their own pixels, which stays cheap at 4K, unlike blitting a
+      full-size transparent grid overlay
+    
+    Args:
+        pantalla_juego: Pygame surface the board will be drawn on
+        alto (int): Board rows
+        ancho (int): Board columns
+    
+    Returns:
+        tuple: (cell surface, list of ((x1, y1), (x2, y2)) grid lines,
+            (columns, rows, 3) uint8 color buffer in surfarray order)
+    """
+    ancho_pixeles, alto_pixeles = pantalla_juego.get_size()
+    
+    superficie_celdas = pygame.Surface((ancho, alto), 0, pantalla_juego)
+    
+    lineas_rejilla = []
+    
+    # Vertical grid lines (column separators)
+    for x in range(ancho + 1):
+        x_pixel = x * ancho_pixeles // ancho
+        lineas_rejilla.append(((x_pixel, 0), (x_pixel, alto_pixeles)))
+    
+    # Horizontal grid lines (row separators)
+    for y in range(alto + 1):
+        y_pixel = y * alto_pixeles // alto
+        lineas_rejilla.append(((0, y_pixel), (ancho_pixeles, y_pixel)))
+    
+    colores = np.empty((ancho, alto, 3), dtype=np.uint8)
+    
+    return superficie_celdas, lineas_rejilla, colores
+
 def dibujar_tablero(pantalla_juego, tablero_logica):
     """
     Render the game board and grid lines on the screen.
     
-    This function draws:
-    1. All placed/fixed pieces on the board with their colors
-    2. Grid lines to show the game board structure
-    3. Borders around each placed block for visual clarity
+    The whole board is drawn with vectorized operations:
+    1. Palette lookup turns the uint8 cell ids into RGB colors, written
+       into a preallocated buffer
+    2. surfarray.blit_array() writes it into a one-pixel-per-cell surface
+    3. A single scale fills the whole target surface
+    4. The precomputed grid lines are drawn on top
     
     Args:
-        pantalla_juego: Pygame surface to draw on
-        tablero_logica (list): 2D array containing board state and piece colors
+        pantalla_juego: Pygame surface to draw on (the board fills all of it)
+        tablero_logica (numpy.ndarray): uint8 plane of piece-type ids
     """
+    alto, ancho = tablero_logica.shape
+    clave = (alto, ancho, pantalla_juego.get_size())
+    if clave not in _superficies_render:
+        _superficies_render[clave] = crear_superficies_render(pantalla_juego, alto, ancho)
+    superficie_celdas, lineas_rejilla, colores = _superficies_render[clave]
+    
     # ========================================
     # DRAW PLACED PIECES
     # ========================================
     
-    # Render all non-empty blocks that have been placed on the board
-    for y, fila in enumerate(tablero_logica):
-        for x, color_celda in enumerate(fila):
-            if color_celda != NEGRO:  # Skip empty cells
-                # Draw filled rectangle for the placed block
-                pygame.draw.rect(pantalla_juego, color_celda,
-                               (x * TAMANO_BLOQUE, y * TAMANO_BLOQUE, 
-                                TAMANO_BLOQUE, TAMANO_BLOQUE), 0)
-                
-                # Draw border around the block for visual definition
-                pygame.draw.rect(pantalla_juego, GRIS, 
-                               (x * TAMANO_BLOQUE, y * TAMANO_BLOQUE, 
-                                TAMANO_BLOQUE, TAMANO_BLOQUE), 1)
-
+    # Palette lookup: (rows, cols) ids -> (rows, cols, 3) colors, written
+    # through a transposed view of the buffer: surfarray indexes surfaces
+    # as [x][y], so the buffer itself is already contiguous in that order
+    np.take(PALETA, tablero_logica, axis=0, out=colores.transpose(1, 0, 2), mode="clip")
+    pygame.surfarray.blit_array(superficie_celdas, colores)
+    
+    # Scale the cell surface straight into the target surface
+    pygame.transform.scale(superficie_celdas, pantalla_juego.get_size(), pantalla_juego)
+    
     # ========================================
     # DRAW GAME BOARD GRID
     # ========================================
     
-    # Draw vertical grid lines (column separators)
-    for x in range(ANCHO_TABLERO + 1):
-        x_pixel = x * TAMANO_BLOQUE
-        pygame.draw.line(pantalla_juego, GRIS, 
-                        (x_pixel, 0), (x_pixel, ALTO_PANTALLA))
+    for inicio, fin in lineas_rejilla:
+        pygame.draw.line(pantalla_juego, GRIS, inicio, fin)
+
+def area_tablero(tamano_ventana, alto, ancho, entero=True):
+    """
+    Compute where the board is drawn inside a window of any size.
+    
+    The board keeps its aspect ratio and is centered; the rest of the
+    window is left black. With integer scaling every cell gets the same
+    whole number of pixels, which keeps the cells crisp and the nearest
+    neighbour scale cheap.
     
-    # Draw horizontal grid lines (row separators)  
-    for y in range(ALTO_TABLERO + 1):
-        y_pixel = y * TAMANO_BLOQUE
-        pygame.draw.line(pantalla_juego, GRIS, 
-                        (0, y_pixel), (ANCHO_PANTALLA, y_pixel))
+    Args:
+        tamano_ventana (tuple): (width, height) of the window in pixels
+        alto (int): Board rows
+        ancho (int): Board columns
+        entero (bool): Round the scale down to a whole number (when >= 1)
+    
+    Returns:
+        pygame.Rect: Board area in window coordinates
+    """
+    ancho_ventana, alto_ventana = tamano_ventana
+    escala = min(ancho_ventana / ancho, alto_ventana / alto)
+    if entero and escala >= 1:
+        escala = int(escala)
+    area = pygame.Rect(0, 0, max(1, int(ancho * escala)), max(1, int(alto * escala)))
+    area.center = (ancho_ventana // 2, alto_ventana // 2)
+    return area
+
+def celdas_pieza(pieza):
+    """
+    List the board cells covered by a piece at its current position.
+    
+    Args:
+        pieza (Pieza): The piece
+    
+    Returns:
+        list: (y, x) board coordinates of each filled block
+    """
+    return [(pieza.y + fila_idx, pieza.x + col_idx)
+            for fila_idx, fila in enumerate(pieza.forma)
+            for col_idx, celda in enumerate(fila) if celda]
+
+def tablero_con_pieza(tablero, pieza):
+    """
+    Return a copy of the board with the active piece stamped into it.
+    
+    Lets the active piece be drawn by the same single dibujar_tablero() call
+    as the placed blocks.
+    
+    Args:
+        tablero (numpy.ndarray): uint8 board plane
+        pieza (Pieza): Active piece
+    
+    Returns:
+        numpy.ndarray: New uint8 plane including the piece cells
+    """
+    return ventana_con_pieza(tablero, pieza, (0, 0), tablero.shape)
+
+def ventana_con_pieza(tablero, pieza, origen, tamano, destino=None):
+    """
+    Return a copy of part of the board with the active piece stamped into it.
+    
+    Only the cells inside the window are copied, so publishing a frame of a
+    huge board costs as much as publishing the viewport. The piece is
+    stamped straight from its shape rows (no list of cells is built).
+    
+    Args:
+        tablero (numpy.ndarray): uint8 board plane
+        pieza (Pieza): Active piece
+        origen (tuple): (row, column) of the top-left cell of the window
+        tamano (tuple): (rows, columns) of the window
+        destino (numpy.ndarray): Optional uint8 plane of shape `tamano` to
+            write into instead of allocating a new one
+    
+    Returns:
+        numpy.ndarray: uint8 plane of the window including the piece cells
+            (`destino` when given)
+    """
+    fila_origen, columna_origen = origen
+    filas, columnas = tamano
+    visible = tablero[fila_origen:fila_origen + filas, columna_origen:columna_origen + columnas]
+    if destino is None:
+        destino = visible.copy()
+    else:
+        np.copyto(destino, visible)
+    y = pieza.y - fila_origen
+    for fila in pieza.forma:
+        if 0 <= y < filas:
+            x = pieza.x - columna_origen
+            for celda in fila:
+                if celda and 0 <= x < columnas:
+                    destino[y, x] = pieza.id_celda
+                x += 1
+        y += 1
+    return destino
+
+def vista_tablero(tamano_ventana, alto, ancho):
+    """
+    Compute how many board cells a window shows (the viewport size).
+    
+    Boards up to the default size are always shown whole and scaled to the
+    window as before. Larger boards are cropped to the cells that fit at
+    TAMANO_BLOQUE pixels each (never fewer than the default board), and the
+    viewport follows the active piece (see SimulacionTetris.cambiar_vista()).
+    
+    Args:
+        tamano_ventana (tuple): (width, height) of the window in pixels
+        alto (int): Board rows
+        ancho (int): Board columns
+    
+    Returns:
+        tuple: (rows, columns) of the viewport
+    """
+    ancho_ventana, alto_ventana = tamano_ventana
+    return (min(alto, max(ALTO_TABLERO, alto_ventana // TAMANO_BLOQUE)),
+            min(ancho, max(ANCHO_TABLERO, ancho_ventana // TAMANO_BLOQUE)))
+
+def origen_vista(origen, pieza, vista, dimensiones):
+    """
+    Scroll a viewport just enough to keep the active piece in view.
+    
+    The viewport only moves when the piece gets closer than MARGEN_VISTA
+    cells to one of its edges, so it does not shake with every fall.
+    
+    Args:
+        origen (tuple): Current (row, column) of the top-left visible cell
+        pieza (Pieza): Active piece
+        vista (tuple): (rows, columns) of the viewport
+        dimensiones (tuple): (rows, columns) of the board
+    
+    Returns:
+        tuple: New (row, column) origin, clamped to the board (`origen`
+            itself when the viewport does not move)
+    """
+    fila = _desplazar_vista(origen[0], pieza.y, len(pieza.forma), vista[0], dimensiones[0])
+    columna = _desplazar_vista(origen[1], pieza.x, len(pieza.forma[0]), vista[1], dimensiones[1])
+    if fila == origen[0] and columna == origen[1]:
+        return origen
+    return (fila, columna)
+
+def _desplazar_vista(inicio, posicion, largo, visible, total):
+    """Scroll one axis of the viewport (see origen_vista())."""
+    margen = min(MARGEN_VISTA, (visible - largo) // 2)
+    inicio = min(inicio, posicion - margen)
+    inicio = max(inicio, posicion + largo + margen - visible)
+    return max(0, min(inicio, total - visible))
 
 # ========================================
 # PIECE GENERATION SYSTEM
 # ========================================
 
-def nueva_pieza():
+def nueva_pieza(generador=random, ancho=ANCHO_TABLERO):
     """
     Generate a new random tetromino piece at the top of the board.
     
@@ -357,197 +639,1104 @@ def nueva_pieza():
     3. Creates and returns a new Pieza instance
     
     The starting position is calculated to center most pieces:
-    - I-piece (4 blocks wide): starts at x = ANCHO_TABLERO // 2 - 2
-    - Other pieces (2-3 blocks wide): start at x = ANCHO_TABLERO // 2 - 1
+    - I-piece (4 blocks wide): starts at x = ancho // 2 - 2
+    - Other pieces (2-3 blocks wide): start at x = ancho // 2 - 1
+    
+    Args:
+        generador: Random source with randint() (the random module or a
+            seeded random.Random instance for reproducible games)
+        ancho (int): Board width in cells
     
     Returns:
         Pieza: New tetromino piece ready to be controlled by player
     """
     # Randomly select a piece type from available shapes
-    idx_forma = random.randint(0, len(FORMAS_PIEZAS) - 1)
+    idx_forma = generador.randint(0, len(FORMAS_PIEZAS) - 1)
     
     # Calculate starting x position to center the piece horizontally
     # Default position works for most pieces (2-3 blocks wide)
-    nueva_x = ANCHO_TABLERO // 2 - 1 
+    nueva_x = ancho // 2 - 1 
     
     # Special case for I-piece which is 4 blocks wide
     if idx_forma == 0:  # I-piece index
-        nueva_x = ANCHO_TABLERO // 2 - 2
+        nueva_x = ancho // 2 - 2
     
     # Create new piece at top of board (y=0) with calculated x position
     return Pieza(nueva_x, 0, idx_forma)
 
 # ========================================
-# GAME INITIALIZATION
+# ZOBRIST HASHING
 # ========================================
 
-# Create the main game window
-pantalla = pygame.display.set_mode((ANCHO_PANTALLA, ALTO_PANTALLA))
-pygame.display.set_caption("Tetris")  # Set window title
+# Random 64-bit keys used to identify board states:
+# - celdas_filas[y], celdas_columnas[x]: combined into the key of board
+#   cell (x, y) by clave_celda(), so the table grows with alto + ancho
+#   instead of alto * ancho
+# - piezas[tipo][rotacion]: active piece type and rotation state
+# - columnas/filas: active piece position (indices offset by MARGEN_ZOBRIST)
+# The hash of a state is the XOR of the keys of its features, so placing or
+# removing one block updates it with a single XOR.
+TablaZobrist = collections.namedtuple(
+    "TablaZobrist", ["celdas_filas", "celdas_columnas", "piezas", "columnas", "filas"])
+
+MARGEN_ZOBRIST = 4      # Pieces may stick out of the board by up to 4 cells
+SEMILLA_ZOBRIST = 0x7E7215
+_tablas_zobrist = {}    # Cache of tables per board size
+
+def tabla_zobrist(alto, ancho):
+    """
+    Return the (cached) Zobrist keys for a board of the given size.
+    
+    Keys come from a fixed seed, so hashes are stable across processes.
+    
+    Args:
+        alto (int): Board rows
+        ancho (int): Board columns
+    
+    Returns:
+        TablaZobrist: Keys for cell rows/columns, piece/rotation and position
+    """
+    if (alto, ancho) not in _tablas_zobrist:
+        generador = random.Random(SEMILLA_ZOBRIST)
+        clave = lambda: generador.getrandbits(64)
+        celdas_filas = np.array([clave() for _ in range(alto)], dtype=np.uint64)
+        celdas_columnas = np.array([clave() for _ in range(ancho)], dtype=np.uint64)
+        piezas = [[clave() for _ in range(4)] for _ in FORMAS_PIEZAS]
+        columnas = [clave() for _ in range(ancho + 2 * MARGEN_ZOBRIST)]
+        filas = [clave() for _ in range(alto + 2 * MARGEN_ZOBRIST)]
+        _tablas_zobrist[(alto, ancho)] = TablaZobrist(celdas_filas, celdas_columnas,
+                                                      piezas, columnas, filas)
+    return _tablas_zobrist[(alto, ancho)]
 
-# Initialize game timing control
-reloj = pygame.time.Clock()  # Controls frame rate and timing
+def clave_celda(clave_fila, claves_columnas):
+    """
+    Combine row and column keys into cell keys.
+    
+    A plain XOR of the row and column keys would let the four corners of
+    any rectangle cancel out (a filled 2x2 square would hash like an empty
+    board), so the XOR goes through the splitmix64 finalizer, a bijective
+    non-linear mix.
+    
+    Args:
+        clave_fila (numpy.uint64): Key of the row
+        claves_columnas (numpy.ndarray): uint64 keys of the columns
+    
+    Returns:
+        numpy.ndarray: uint64 key of each cell
+    """
+    z = claves_columnas ^ clave_fila
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def hash_fila(zobrist, tablero, fila):
+    """
+    Compute the Zobrist hash of one board row from scratch.
+    
+    Returns:
+        int: XOR of the cell keys of the occupied cells in the row
+    """
+    ocupadas = zobrist.celdas_columnas[tablero[fila] != VACIO]
+    return int(np.bitwise_xor.reduce(clave_celda(zobrist.celdas_filas[fila], ocupadas)))
 
 # ========================================
-# GAME STATE INITIALIZATION  
+# GAME STATE SNAPSHOTS
 # ========================================
 
-# Create empty game board (2D array filled with black/empty cells)
-tablero_juego = crear_tablero()
-
-# Generate the first tetromino piece for the player to control
-pieza_actual = nueva_pieza()
+# Immutable saved state returned by JuegoTetris.snapshot().
+# `filas` is a tuple of bytes objects, one per board row; rows that did not
+# change between two snapshots are the very same bytes object, so snapshots
+# share memory and saving only serializes the rows changed since last time.
+# Snapshots taken while the board does not change share the tuples too.
+# `tope` is the topmost row holding blocks (None = recompute on restore).
+EstadoTetris = collections.namedtuple(
+    "EstadoTetris",
+    ["filas", "pieza", "lineas", "puntuacion", "piezas", "terminado",
+     "generador", "hash_tablero", "hash_filas", "tope"],
+    defaults=(None,))
 
 # ========================================
-# AUTOMATIC PIECE FALLING SYSTEM
+# GAME STATE CLASS
 # ========================================
 
-# Timing variables for automatic piece descent
-tiempo_caida = 0          # Timestamp of last automatic fall
-intervalo_caida = 750     # Time between automatic falls (milliseconds = 0.75 seconds)
+class JuegoTetris:
+    """
+    State and rules of a single Tetris game, independent of rendering.
+    
+    This class handles:
+    - The board plane and the active piece
+    - Player moves, rotation, hard drop and gravity
+    - Locking, line clearing, spawning and game over detection
+    - Per-game statistics (score, lines cleared, pieces locked)
+    - Cheap snapshot()/restore() for undo, look-ahead search and replays
+    - Incremental Zobrist hash of the board (see clave())
+    - Event hooks for recorders and streams (see `oyentes`)
+    
+    Every callable in `oyentes` is called as oyente(evento, juego, datos):
+    - "pieza": the active piece moved, rotated or spawned (datos = None)
+    - "fijacion": a piece locked; datos = (celdas, filas) with the
+      (y, x, id) cells written and the full rows then cleared
+    - "reinicio": the board was reset or restored (datos = None)
+    
+    The board is only ever modified in place, so NumPy views or memoryviews
+    taken over `tablero` stay valid for the whole life of the object.
+    
+    Any board size works (see crear_tablero()). Locks only touch the rows
+    from the top of the stack (`tope`) down to the piece, so their cost
+    follows the stack height, not the board height.
+    """
+    
+    def __init__(self, semilla=None, tablero=None):
+        """
+        Initialize a new game.
+        
+        Args:
+            semilla (int): Seed for the piece generator (None = random)
+            tablero (numpy.ndarray): Optional preallocated uint8 board plane
+                (for example backed by shared memory); created if omitted
+        """
+        self.generador = random.Random(semilla)   # Per-game piece generator
+        self.oyentes = []                         # Event hooks (see class docstring)
+        self.tablero = tablero if tablero is not None else crear_tablero()
+        self.zobrist = tabla_zobrist(*self.tablero.shape)
+        self.reiniciar()
+    
+    def reiniciar(self, semilla=None):
+        """
+        Clear the board, reset statistics and spawn the first piece.
+        
+        Args:
+            semilla (int): Optional new seed for the piece generator
+        """
+        if semilla is not None:
+            self.generador.seed(semilla)
+        self.tablero[:] = VACIO          # In place: keeps external views valid
+        
+        # Copy-on-write row cache for snapshots: immutable bytes per row plus
+        # the set of rows modified since the cache was last refreshed
+        fila_vacia = bytes(self.tablero.shape[1])
+        self._filas = [fila_vacia] * self.tablero.shape[0]
+        self._filas_sucias = set()
+        self._tuplas = None              # (filas, hash_filas) tuples of the last snapshot
+        
+        # Zobrist hash of the board occupancy, kept per row so line clears
+        # only rehash the rows that moved
+        self.hash_tablero = 0
+        self._hash_filas = [0] * self.tablero.shape[0]
+        self.tope = self.tablero.shape[0]   # Topmost row holding blocks (alto = empty)
+        
+        self.lineas = 0                  # Lines cleared in this game
+        self.puntuacion = 0              # Score (see PUNTOS_POR_LINEAS)
+        self.piezas = 0                  # Pieces locked in this game
+        self.terminado = False           # Set when a new piece cannot spawn
+        self.pieza_actual = nueva_pieza(self.generador, self.tablero.shape[1])
+        self._notificar("reinicio")
+    
+    def _notificar(self, evento, datos=None):
+        """Call every registered hook (nothing to do when there are none)."""
+        for oyente in self.oyentes:
+            oyente(evento, self, datos)
+    
+    def mover(self, dx, dy=0):
+        """
+        Move the active piece if the target position is free.
+        
+        Returns:
+            bool: True if the piece moved
+        """
+        if hay_colision(self.tablero, self.pieza_actual, offset_x=dx, offset_y=dy):
+            return False
+        self.pieza_actual.x += dx
+        self.pieza_actual.y += dy
+        if self.oyentes:
+            self._notificar("pieza")
+        return True
+    
+    def rotar(self):
+        """
+        Rotate the active piece clockwise, reverting if it collides.
+        
+        Returns:
+            bool: True if the piece rotated
+        """
+        forma_original = self.pieza_actual.forma
+        self.pieza_actual.forma = self.pieza_actual.rotar()
+        if hay_colision(self.tablero, self.pieza_actual):
+            self.pieza_actual.forma = forma_original
+            return False
+        self.pieza_actual.rotacion = (self.pieza_actual.rotacion + 1) % 4
+        if self.oyentes:
+            self._notificar("pieza")
+        return True
+    
+    def caida_libre(self):
+        """
+        Hard drop: move the piece down until it hits something, then lock it.
+        
+        Returns:
+            int: Number of lines cleared by the lock
+        """
+        while self.mover(0, 1):
+            pass
+        return self.fijar()
+    
+    def caer(self):
+        """
+        Apply one gravity step: fall one row, or lock if the piece has landed.
+        
+        Returns:
+            bool: True if the piece was locked (a new one has been spawned)
+        """
+        if self.mover(0, 1):
+            return False
+        self.fijar()
+        return True
+    
+    def fijar(self):
+        """
+        Lock the active piece, clear lines and spawn the next piece.
+        
+        Sets `terminado` when the new piece spawns on occupied cells.
+        
+        Returns:
+            int: Number of lines cleared
+        """
+        pieza = self.pieza_actual
+        fila_inferior = pieza.y + len(pieza.forma) - 1
+        if self.oyentes:
+            datos_fijacion = self._datos_fijacion(pieza)
+        tope = min(self.tope, max(pieza.y, 0))
+        lineas = fijar_pieza(self.tablero, pieza, self.tope)
+        
+        # Mark modified rows for the snapshot cache: the piece rows, or every
+        # row from the top of the stack down to the piece bottom when cleared
+        # lines shifted the board (rows above the stack are empty either way)
+        fila_superior = tope if lineas else max(pieza.y, 0)
+        filas_modificadas = range(fila_superior, fila_inferior + 1)
+        self.tope = min(self.tablero.shape[0], tope + lineas)
+        self._filas_sucias.update(filas_modificadas)
+        
+        # Incremental Zobrist update: rehash only the modified rows
+        for fila in filas_modificadas:
+            nuevo = hash_fila(self.zobrist, self.tablero, fila)
+            self.hash_tablero ^= self._hash_filas[fila] ^ nuevo
+            self._hash_filas[fila] = nuevo
+        
+        self.lineas += lineas
+        self.puntuacion += PUNTOS_POR_LINEAS[min(lineas, 4)]
+        self.piezas += 1
+        self.pieza_actual = nueva_pieza(self.generador, self.tablero.shape[1])
+        if hay_colision(self.tablero, self.pieza_actual):
+            self.terminado = True
+        if self.oyentes:
+            self._notificar("fijacion", datos_fijacion)
+            self._notificar("pieza")
+        return lineas
+    
+    def _datos_fijacion(self, pieza):
+        """
+        Describe a lock before it happens, for the "fijacion" hook.
+        
+        Returns:
+            tuple: (celdas, filas) with the (y, x, id) cells the piece will
+                write and the rows that will then be full and cleared
+        """
+        celdas = [(y, x, pieza.id_celda) for y, x in celdas_pieza(pieza) if y >= 0]
+        filas = []
+        for fila in sorted({y for y, _, _ in celdas}):
+            nuevas = sum(1 for y, _, _ in celdas if y == fila)
+            if np.count_nonzero(self.tablero[fila]) + nuevas == self.tablero.shape[1]:
+                filas.append(fila)
+        return celdas, filas
+    
+    def clave(self):
+        """
+        Zobrist key of the current state: board occupancy plus the active
+        piece type, rotation and position.
+        
+        Returns:
+            int: 64-bit hash usable as a transposition table key
+        """
+        pieza = self.pieza_actual
+        return (self.hash_tablero
+                ^ self.zobrist.piezas[pieza.forma_idx][pieza.rotacion]
+                ^ self.zobrist.columnas[pieza.x + MARGEN_ZOBRIST]
+                ^ self.zobrist.filas[pieza.y + MARGEN_ZOBRIST])
+    
+    def snapshot(self):
+        """
+        Save the complete game state.
+        
+        Only rows modified since the previous snapshot are serialized; all
+        other rows are shared with earlier snapshots. Cost:
+        - Board unchanged since the previous snapshot (e.g. only the piece
+          moved): O(1), the row tuples of that snapshot are reused
+        - Otherwise: O(rows changed) serialization plus O(H) to rebuild the
+          two row tuples (one reference per row, no row data is copied)
+        
+        Returns:
+            EstadoTetris: Immutable state accepted by restore()
+        """
+        if self._filas_sucias or self._tuplas is None:
+            for fila in self._filas_sucias:
+                self._filas[fila] = self.tablero[fila].tobytes()
+            self._filas_sucias.clear()
+            self._tuplas = (tuple(self._filas), tuple(self._hash_filas))
+        filas, hash_filas = self._tuplas
+        
+        pieza = self.pieza_actual
+        return EstadoTetris(
+            filas=filas,
+            pieza=(pieza.forma_idx, pieza.forma, pieza.rotacion, pieza.x, pieza.y),
+            lineas=self.lineas,
+            puntuacion=self.puntuacion,
+            piezas=self.piezas,
+            terminado=self.terminado,
+            generador=self.generador.getstate(),
+            hash_tablero=self.hash_tablero,
+            hash_filas=hash_filas,
+            tope=self.tope)
+    
+    def restore(self, estado):
+        """
+        Return the game to a state saved with snapshot().
+        
+        Rows are written back only where they differ from the current board,
+        and always in place so external views of the board stay valid.
+        Restoring the board of the last snapshot taken (or restored) when
+        the board has not changed since is O(1); otherwise rows are
+        compared by identity, O(H).
+        
+        Args:
+            estado (EstadoTetris): State returned by snapshot()
+        """
+        tuplas = self._tuplas
+        if (self._filas_sucias or tuplas is None
+                or tuplas[0] is not estado.filas or tuplas[1] is not estado.hash_filas):
+            for fila, contenido in enumerate(estado.filas):
+                if contenido is not self._filas[fila] or fila in self._filas_sucias:
+                    self.tablero[fila] = np.frombuffer(contenido, dtype=np.uint8)
+                    self._filas[fila] = contenido
+            self._filas_sucias.clear()
+            self._hash_filas = list(estado.hash_filas)
+            self._tuplas = (estado.filas, estado.hash_filas)
+        
+        # Shapes are never modified in place (rotar() builds a new list),
+        # so the saved shape can be shared with the restored piece
+        forma_idx, forma, rotacion, x, y = estado.pieza
+        self.pieza_actual = Pieza(x, y, forma_idx)
+        self.pieza_actual.forma = forma
+        self.pieza_actual.rotacion = rotacion
+        
+        self.lineas = estado.lineas
+        self.puntuacion = estado.puntuacion
+        self.piezas = estado.piezas
+        self.terminado = estado.terminado
+        self.generador.setstate(estado.generador)
+        self.hash_tablero = estado.hash_tablero
+        if estado.tope is not None:
+            self.tope = estado.tope
+        else:
+            ocupadas = np.flatnonzero(self.tablero.any(axis=1))
+            self.tope = int(ocupadas[0]) if len(ocupadas) else self.tablero.shape[0]
+        self._notificar("reinicio")
 
 # ========================================
-# MAIN GAME LOOP
+# SIMULATION THREAD
 # ========================================
 
-# Primary game execution loop - continues until player quits
-ejecutando = True
-while ejecutando:
+class FotogramaTetris:
+    """
+    Frame buffer published by SimulacionTetris for the renderer.
     
-    # ========================================
-    # EVENT HANDLING SYSTEM
-    # ========================================
+    Holds the visible part of the board with the active piece stamped in,
+    where it is on the board, plus the statistics. Buffers are allocated
+    once per viewport size and refilled in place by the simulation thread,
+    so publishing a frame allocates nothing.
     
-    # Process all pending input events (keyboard, mouse, window)
-    for evento in pygame.event.get():
+    Attributes:
+        version (int): Publish counter, grows with every new frame
+        tablero (numpy.ndarray): Read-only uint8 view of the visible cells
+        lineas, puntuacion, piezas, terminado: Game statistics
+        origen (tuple): (row, column) of the top-left visible cell
+        dimensiones (tuple): (rows, columns) of the whole board
+    """
+    
+    def __init__(self, vista, dimensiones):
+        """
+        Allocate an empty frame.
         
-        # Handle window close button or ALT+F4
-        if evento.type == pygame.QUIT:
-            ejecutando = False
-            
-        # Handle keyboard input for piece control
-        if evento.type == pygame.KEYDOWN:
-            # Skip input processing if no active piece
-            if not pieza_actual:
-                continue
-                
-            # ========================================
-            # HORIZONTAL MOVEMENT CONTROLS
-            # ========================================
-            
-            # LEFT ARROW: Move piece left
-            if evento.key == pygame.K_LEFT:
-                # Only move if no collision detected
-                if not hay_colision(tablero_juego, pieza_actual, offset_x=-1):
-                    pieza_actual.x -= 1
-                    
-            # RIGHT ARROW: Move piece right  
-            elif evento.key == pygame.K_RIGHT:
-                # Only move if no collision detected
-                if not hay_colision(tablero_juego, pieza_actual, offset_x=1):
-                    pieza_actual.x += 1
-            
-            # ========================================
-            # VERTICAL MOVEMENT CONTROLS
-            # ========================================
-                    
-            # DOWN ARROW: Soft drop (faster descent)
-            elif evento.key == pygame.K_DOWN:
-                # Only move if no collision detected
-                if not hay_colision(tablero_juego, pieza_actual, offset_y=1):
-                    pieza_actual.y += 1
-            
-            # ========================================
-            # ROTATION CONTROLS
-            # ========================================
-                    
-            # UP ARROW or SPACE: Rotate piece clockwise
-            elif evento.key == pygame.K_UP or evento.key == pygame.K_SPACE:
-                # Store original shape in case rotation fails
-                forma_original = pieza_actual.forma
-                
-                # Attempt rotation
-                pieza_actual.forma = pieza_actual.rotar()
-                
-                # Check if rotated position causes collision
-                if hay_colision(tablero_juego, pieza_actual):
-                    # Rotation invalid - revert to original shape
-                    pieza_actual.forma = forma_original
-            
-            # ========================================  
-            # HARD DROP CONTROL
-            # ========================================
-                    
-            # SPACE: Hard drop (instant fall to bottom)
-            elif evento.key == pygame.K_SPACE:
-                # Move piece down until it hits something
-                while not hay_colision(tablero_juego, pieza_actual, offset_y=1):
-                    pieza_actual.y += 1
-                
-                # Place piece permanently and generate new one
-                fijar_pieza(tablero_juego, pieza_actual)
-                pieza_actual = nueva_pieza()
-                
-                # Check for game over (new piece spawns in occupied space)
-                if hay_colision(tablero_juego, pieza_actual):
-                    print("¡Juego terminado!")
-                    ejecutando = False    # ========================================
-    # AUTOMATIC PIECE FALLING LOGIC
-    # ========================================
+        Args:
+            vista (tuple): (rows, columns) of the viewport
+            dimensiones (tuple): (rows, columns) of the whole board
+        """
+        self._plano = np.zeros(vista, dtype=np.uint8)   # Written by the simulation only
+        self.tablero = self._plano.view()
+        self.tablero.flags.writeable = False
+        self.version = 0
+        self.lineas = 0
+        self.puntuacion = 0
+        self.piezas = 0
+        self.terminado = False
+        self.origen = (0, 0)
+        self.dimensiones = dimensiones
+
+def _caida(juego):
+    """Hard drop command: always changes the game (the piece locks)."""
+    juego.caida_libre()
+    return True
+
+# Player moves by name, the one dispatch table shared by the simulation
+# thread, replays, the server and (through tetris_batch.aplicar_accion())
+# the environment and the verifier; each returns True when the game changed
+# ("deshacer" is handled by SimulacionTetris)
+COMANDOS = {
+    "izquierda": lambda juego: juego.mover(-1),
+    "derecha": lambda juego: juego.mover(1),
+    "abajo": lambda juego: juego.mover(0, 1),
+    "rotar": lambda juego: juego.rotar(),
+    "caida": _caida,
+}
+
+class SimulacionTetris:
+    """
+    Runs the rules of one game on its own thread, on its own clock.
+    
+    Double buffering:
+    - Back buffer: the live JuegoTetris, only ever touched by the
+      simulation thread (commands, gravity, locks, undo)
+    - Front buffer: `frente`, the last published FotogramaTetris. Frames
+      are preallocated and reused: publishing fills a buffer that is
+      neither the front one nor the one the renderer took with tomar(),
+      then swaps one reference. At most three buffers exist per viewport
+      size, the renderer never sees a half-updated board, never holds a
+      lock, and nothing is allocated per frame
+    
+    Gravity runs on absolute deadlines and commands are applied as soon as
+    they arrive, so a slow display.flip() on the render thread delays
+    neither gravity nor input.
     
-    # Handle automatic downward movement of pieces based on time
-    tiempo_actual = pygame.time.get_ticks()  # Get current time in milliseconds
+    Only the viewport (see cambiar_vista()) is copied into each frame, so
+    the cost of publishing does not depend on the board size.
+    """
+    
+    def __init__(self, juego, intervalo_caida=INTERVALO_CAIDA, practica=False, perfilador=None,
+                 repeticion=None):
+        """
+        Prepare the simulation (call iniciar() to start the thread).
+        
+        Args:
+            juego (JuegoTetris): Game to run; owned by the thread from now on
+            intervalo_caida (int): Time between automatic falls (ms)
+            practica (bool): Keep an undo history (see the "deshacer" command)
+            perfilador (GameProfiler): Optional profiler; the thread's work
+                (not its idle waits) is profiled while the main loop is, and
+                a tracemalloc snapshot is requested at every piece lock
+            repeticion (GrabadorRepeticion): Optional replay recorder, gets
+                every operation that changed the game (see tetris_replay.py)
+        """
+        self.juego = juego
+        self.intervalo_caida = intervalo_caida / 1000.0
+        self.perfilador = perfilador
+        self.repeticion = repeticion
+        self.traza = tracing.get_tracer("tetris")   # Logic/publish spans (ARCADE_TRACE)
+        if repeticion:
+            repeticion.keyframe(juego)
+        
+        # Practice mode history: one snapshot per spawned piece (most recent 100)
+        self.historial = collections.deque([juego.snapshot()], maxlen=100) if practica else None
+        
+        # Arrival times of the inputs that changed the state, tagged with the
+        # version of the first frame that shows them (for latency reports)
+        self.entradas_aplicadas = collections.deque()
+        
+        self._comandos = queue.SimpleQueue()
+        self._version = 0
+        self._cambio = True
+        self._dimensiones = juego.tablero.shape
+        self._vista = self._dimensiones      # Whole board until the window says otherwise
+        self._origen = (0, 0)
+        self._buffers = []                   # Frame buffers of the current viewport size
+        self._en_uso = None                  # Frame the renderer is drawing (see tomar())
+        self.frente = None
+        juego.oyentes.append(self._marcar_cambio)
+        self._publicar()
+        self._hilo = threading.Thread(target=self._ejecutar, name="tetris-sim", daemon=True)
+    
+    def iniciar(self):
+        """Start the simulation thread."""
+        self._hilo.start()
+    
+    def detener(self):
+        """Stop the simulation thread and wait for it."""
+        self._comandos.put(None)
+        self._hilo.join()
+        self.juego.oyentes.remove(self._marcar_cambio)
+    
+    def enviar(self, comando, llegada):
+        """
+        Queue a player command (callable from any thread).
+        
+        Args:
+            comando (str): A COMANDOS name or "deshacer"
+            llegada (float): time.perf_counter() when the input arrived
+        """
+        self._comandos.put((comando, llegada))
+    
+    def cambiar_vista(self, filas, columnas):
+        """
+        Set the viewport size (callable from any thread).
+        
+        Args:
+            filas (int): Visible board rows (see vista_tablero())
+            columnas (int): Visible board columns
+        """
+        self._comandos.put(("vista", (filas, columnas)))
     
-    # Check if enough time has passed for automatic fall
-    if tiempo_actual - tiempo_caida > intervalo_caida and pieza_actual:
+    def tomar(self):
+        """
+        Take the latest frame for drawing (render thread only).
+        
+        The frame stays untouched until the next call, even if newer
+        frames are published in the meantime.
         
-        # Try to move piece down one row
-        if not hay_colision(tablero_juego, pieza_actual, offset_y=1):
-            # No collision - piece can fall normally
-            pieza_actual.y += 1
+        Returns:
+            FotogramaTetris: The front buffer
+        """
+        while True:
+            fotograma = self.frente
+            self._en_uso = fotograma
+            # A frame swapped in before the claim was seen could be refilled:
+            # only keep the claim if it still is the front buffer
+            if self.frente is fotograma:
+                return fotograma
+    
+    def _marcar_cambio(self, evento, juego, datos):
+        """JuegoTetris hook: the visible state changed."""
+        self._cambio = True
+    
+    def _buffer_libre(self):
+        """Frame buffer that neither the front buffer nor the renderer uses."""
+        frente = self.frente
+        en_uso = self._en_uso
+        for fotograma in self._buffers:
+            if fotograma is not frente and fotograma is not en_uso:
+                return fotograma
+        fotograma = FotogramaTetris(self._vista, self._dimensiones)
+        self._buffers.append(fotograma)
+        return fotograma
+    
+    def _publicar(self):
+        """Fill a free frame buffer and swap it into the front buffer."""
+        juego = self.juego
+        self._origen = origen_vista(self._origen, juego.pieza_actual, self._vista, self._dimensiones)
+        fotograma = self._buffer_libre()
+        ventana_con_pieza(juego.tablero, juego.pieza_actual, self._origen, self._vista,
+                          fotograma._plano)
+        self._version += 1
+        self._cambio = False
+        fotograma.version = self._version
+        fotograma.lineas = juego.lineas
+        fotograma.puntuacion = juego.puntuacion
+        fotograma.piezas = juego.piezas
+        fotograma.terminado = juego.terminado
+        fotograma.origen = self._origen
+        self.frente = fotograma
+    
+    def _pieza_fijada(self):
+        """Bookkeeping after every lock (profiler snapshot, undo history)."""
+        if self.perfilador:
+            self.perfilador.snapshot("piece lock")
+        if self.historial is not None:
+            self.historial.append(self.juego.snapshot())
+    
+    def _aplicar(self, comando, llegada):
+        """Apply one player command to the back buffer."""
+        juego = self.juego
+        if comando == "deshacer":
+            # Go back to when the previous piece spawned (practice mode only)
+            if self.historial is None:
+                return
+            if len(self.historial) > 1:
+                self.historial.pop()
+            juego.restore(self.historial[-1])
+            if self.repeticion:
+                self.repeticion.keyframe(juego)
+            cambio = True
+        elif juego.terminado:
+            return
         else:
-            # Collision detected - piece has landed
+            cambio = COMANDOS[comando](juego)
+            if cambio and self.repeticion:
+                self.repeticion.operacion(juego, comando)
+            if comando == "caida":
+                # Hard drop placed the piece permanently and spawned a new one
+                self._pieza_fijada()
+        if cambio:
+            self.entradas_aplicadas.append((self._version + 1, llegada))
+    
+    def _ejecutar(self):
+        """Simulation thread body: commands as they arrive, gravity on time."""
+        juego = self.juego
+        siguiente_caida = time.perf_counter() + self.intervalo_caida
+        while True:
+            # Sleep until the next command or the next gravity deadline
+            try:
+                mensaje = self._comandos.get(timeout=max(0.0, siguiente_caida - time.perf_counter()))
+            except queue.Empty:
+                mensaje = ()
+            if mensaje is None:
+                break
+            if self.perfilador:
+                self.perfilador.enable_thread()
+            if self.traza:
+                inicio_logica = tracing.ahora()
+                logica = bool(mensaje)
+            if mensaje and mensaje[0] == "vista":
+                if mensaje[1] != self._vista:
+                    # New size: new buffers (frames still being drawn stay alive)
+                    self._vista = mensaje[1]
+                    self._buffers = []
+                self._cambio = True
+            elif mensaje:
+                self._aplicar(*mensaje)
             
-            # Place current piece permanently on the board
-            fijar_pieza(tablero_juego, pieza_actual)
+            # Gravity: fall one row, or lock the piece and spawn a new one
+            ahora = time.perf_counter()
+            if ahora >= siguiente_caida:
+                siguiente_caida += self.intervalo_caida
+                if siguiente_caida <= ahora:       # Far behind: do not burst
+                    siguiente_caida = ahora + self.intervalo_caida
+                if not juego.terminado:
+                    fijada = juego.caer()
+                    if self.repeticion:
+                        self.repeticion.operacion(juego, "caer")
+                    if fijada:
+                        self._pieza_fijada()
+                logica = True
             
-            # Generate new piece for player to control
-            pieza_actual = nueva_pieza()
+            if self.traza and logica:
+                self.traza.completo("logic", inicio_logica, categoria="simulation")
             
-            # Check for game over condition
-            if hay_colision(tablero_juego, pieza_actual):
-                print("¡Juego terminado!")
-                ejecutando = False
-                
-        # Update timing for next automatic fall
-        tiempo_caida = tiempo_actual
+            if self._cambio:
+                if self.traza:
+                    inicio_publicar = tracing.ahora()
+                    self._publicar()
+                    self.traza.completo("publish", inicio_publicar, categoria="simulation",
+                                        version=self._version)
+                else:
+                    self._publicar()
+            
+            if self.perfilador:
+                self.perfilador.disable_thread()
+
+# ========================================
+# STARTUP MEASUREMENT
+# ========================================
+
+def informe_arranque(marca_pantalla, marca_primer_frame):
+    """
+    Print the startup timeline as one JSON line (for startup_benchmark.py).
+    
+    Times are milliseconds since ARCADE_LAUNCH_TIME, the wall-clock time
+    the launcher recorded right before starting this process (or since the
+    start of the imports when it is not set).
+    
+    Args:
+        marca_pantalla (float): Wall clock when the window was ready
+        marca_primer_frame (float): Wall clock after the first flip
+    """
+    import json
+    lanzamiento = float(os.environ.get("ARCADE_LAUNCH_TIME") or MARCA_IMPORTACION_INICIO)
+    print(json.dumps({
+        "inicio_importacion_ms": (MARCA_IMPORTACION_INICIO - lanzamiento) * 1000,
+        "importacion_ms": (MARCA_IMPORTACION - lanzamiento) * 1000,
+        "pantalla_ms": (marca_pantalla - lanzamiento) * 1000,
+        "primer_frame_ms": (marca_primer_frame - lanzamiento) * 1000,
+    }), flush=True)
 
+# ========================================
+# MAIN GAME FUNCTION
+# ========================================
+
+def main(perfilador=None, practica=False, grabacion=None, repeticion=None, informe_latencia=None,
+         tamano_ventana=None, pantalla_completa=False, escalado_entero=True,
+         sin_gc=False, informe_memoria=None, tamano_tablero=None, archivo=None):
+    """
+    Run the Tetris game until the player quits or the game is over.
+
+    Args:
+        practica (bool): Practice mode, Z/Backspace undoes the last locked
+            piece (restores the snapshot taken when it spawned)
+        grabacion (str): Optional path of a board stream recording
+        repeticion (str): Optional path of a keyframed input replay
+        archivo (str): Optional replay archive the game is appended to
+            (seed, input replay and final stats, see tetris_archive.py)
+        informe_latencia (str): Optional path of the input latency report
+        tamano_ventana (tuple): Window (width, height); default 300x600,
+            or TAMANO_BLOQUE pixels per cell up to ANCHO_PANTALLA_MAXIMO x
+            ALTO_PANTALLA_MAXIMO for other board sizes
+        pantalla_completa (bool): Open a fullscreen window at desktop size
+        escalado_entero (bool): Integer board scale (False stretches it)
+        sin_gc (bool): Allocation-free mode: no cyclic garbage collection
+            during play except between pieces (see frame_memory.py)
+        informe_memoria (str): Optional path of the allocations-per-frame
+            report
+        tamano_tablero (tuple): Board (columns, rows); default 10x20. Boards
+            larger than the window are shown through a viewport that
+            follows the active piece
+        perfilador (GameProfiler): Optional profiler from profiling.py. When
+            given, the render loop is profiled frame by frame, the
+            simulation thread's work is profiled alongside it (cProfile
+            keeps a per-thread profile merged into the report; the sampler
+            reads both threads) and a tracemalloc snapshot is requested
+            every time a piece locks.
+    """
     # ========================================
-    # RENDERING SYSTEM
+    # GAME INITIALIZATION
     # ========================================
 
-    # Clear screen with black background
-    pantalla.fill(NEGRO)
+    # Optional timeline (ARCADE_TRACE): interpreter start and imports,
+    # measured before the trace existed, become the first spans
+    traza = tracing.get_tracer("tetris")
+    if traza:
+        lanzamiento = os.environ.get("ARCADE_LAUNCH_TIME")
+        if lanzamiento:
+            traza.completo("interpreter_start", float(lanzamiento), MARCA_IMPORTACION_INICIO,
+                           categoria="startup")
+        traza.completo("imports", MARCA_IMPORTACION_INICIO, MARCA_IMPORTACION, categoria="startup")
+        inicio_pygame = tracing.ahora()
+
+    # Start the display subsystem only (window and events)
+    iniciar_pygame()
+    
+    # Board size in cells; the default window fits it at TAMANO_BLOQUE
+    # pixels per cell (300x600 for the default board)
+    ancho_tablero, alto_tablero = tamano_tablero or (ANCHO_TABLERO, ALTO_TABLERO)
+    if not tamano_ventana:
+        tamano_ventana = (min(ancho_tablero * TAMANO_BLOQUE, ANCHO_PANTALLA_MAXIMO),
+                          min(alto_tablero * TAMANO_BLOQUE, ALTO_PANTALLA_MAXIMO))
+
+    # Create the main game window (resizable, or fullscreen at desktop size)
+    if pantalla_completa:
+        pantalla = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        pantalla = pygame.display.set_mode(tamano_ventana, pygame.RESIZABLE)
+    pygame.display.set_caption("Tetris")  # Set window title
+    superficie_tablero = None  # Board area of the window, set on first frame
+    vista_mostrada = None      # Viewport shape the board area was computed for
+    marca_pantalla = time.time()  # Startup mark: window ready
+    if traza:
+        traza.completo("pygame_init", inicio_pygame, marca_pantalla, categoria="startup")
+
+    # Initialize game timing control
+    reloj = pygame.time.Clock()  # Paces the loop at the input polling rate
+    medidor = input_latency.MedidorLatencia()  # Keypress-to-screen latency
     
-    # Draw the game board with all placed pieces and grid lines
-    dibujar_tablero(pantalla, tablero_juego)
+    # Allocation counters (and GC control in allocation-free mode)
+    memoria = None
+    if sin_gc or informe_memoria:
+        memoria = frame_memory.MemoriaFrames(controlar_gc=sin_gc)
+
+    # ========================================
+    # GAME STATE INITIALIZATION
+    # ========================================
+
+    # Create the game state: empty board plus the first tetromino piece
+    # (explicit seed, so the archive can tell which pieces were dealt)
+    semilla = random.getrandbits(63)
+    juego = JuegoTetris(semilla, crear_tablero(alto_tablero, ancho_tablero))
+    inicio_sesion = time.time()  # Session start for the score store
+
+    # Optional recording of the game as a delta-encoded board stream
+    grabador = None
+    if grabacion:
+        import tetris_stream  # Delta-encoded board recording
+        grabador = tetris_stream.GrabadorArchivo(grabacion)
+        tetris_stream.CodificadorTablero(grabador).conectar(juego)
     
-    # Draw the currently active/falling piece
-    if pieza_actual:
-        pieza_actual.dibujar(pantalla)
+    # Optional keyframed replay of every operation applied to the game
+    # (kept in memory when it is only needed for the archive)
+    grabador_repeticion = destino_repeticion = None
+    if repeticion or archivo:
+        import io
+        import tetris_replay  # Seekable input replays
+        destino_repeticion = open(repeticion, "wb") if repeticion else io.BytesIO()
+        grabador_repeticion = tetris_replay.GrabadorRepeticion(destino_repeticion)
 
-    # Update the display with all drawn elements
-    pygame.display.flip()
+    # ========================================
+    # SIMULATION THREAD
+    # ========================================
+
+    # The rules, gravity and undo history run on their own thread; this
+    # loop only turns key presses into commands and draws published frames
+    simulacion = SimulacionTetris(juego, INTERVALO_CAIDA, practica, perfilador, grabador_repeticion)
     
-    # Control frame rate to 30 FPS for smooth gameplay
-    reloj.tick(30)
+    # Only the cells that fit in the window are published and drawn
+    simulacion.cambiar_vista(*vista_tablero(pantalla.get_size(), alto_tablero, ancho_tablero))
+
+    # Key -> simulation command
+    # UP ARROW or SPACE: Rotate piece clockwise (reverted on collision).
+    # SPACE was always matched by the rotation before the hard drop, so
+    # "caida" stays unbound, as before.
+    teclas = {
+        pygame.K_LEFT: "izquierda",    # Move piece left (if no collision)
+        pygame.K_RIGHT: "derecha",     # Move piece right (if no collision)
+        pygame.K_DOWN: "abajo",        # Soft drop (faster descent)
+        pygame.K_UP: "rotar",
+        pygame.K_SPACE: "rotar",
+    }
+    if practica:
+        # Z or BACKSPACE: Go back to when the previous piece spawned
+        teclas[pygame.K_z] = teclas[pygame.K_BACKSPACE] = "deshacer"
+
+    # Render timing: regular frames plus early frames for new states
+    ultimo_render = -1000     # Timestamp of the last presented frame
+    version_mostrada = 0      # Version of the last frame drawn
+    piezas_mostradas = 0      # Locked pieces in the last frame drawn
+    primer_frame = True       # The first frame ends the startup measurement
+    benchmark_arranque = bool(os.environ.get("ARCADE_STARTUP_BENCH"))   # Quit after it
+
+    # ========================================
+    # MAIN GAME LOOP
+    # ========================================
+
+    # Start collecting profile data right before the first frame
+    if perfilador:
+        perfilador.enable()
+    
+    # Setup is done: everything allocated so far lives for the whole game
+    if memoria:
+        memoria.preparar()
+    simulacion.iniciar()
+    if traza:
+        traza.completo("game_setup", marca_pantalla, categoria="startup")
+        inicio_primer_frame = tracing.ahora()
+
+    # Primary render loop - continues until player quits or the game is over
+    ejecutando = True
+    while ejecutando:
+
+        # ========================================
+        # EVENT HANDLING SYSTEM
+        # ========================================
+
+        # Forward pending input to the simulation, timestamped on arrival
+        # for the latency report
+        llegada = time.perf_counter()
+        if traza:
+            inicio_entrada = tracing.ahora()
+        for evento in pygame.event.get():
+
+            # Handle window close button or ALT+F4
+            if evento.type == pygame.QUIT:
+                ejecutando = False
+
+            # Window resized: recompute the viewport and the board area
+            if evento.type == pygame.VIDEORESIZE:
+                pantalla = pygame.display.get_surface()
+                simulacion.cambiar_vista(*vista_tablero(pantalla.get_size(), alto_tablero, ancho_tablero))
+                superficie_tablero = None
+                version_mostrada = 0
+
+            # Handle keyboard input for piece control
+            if evento.type == pygame.KEYDOWN and evento.key in teclas:
+                simulacion.enviar(teclas[evento.key], llegada)
+        if traza:
+            traza.completo("input", inicio_entrada, categoria="frame")
+
+        # ========================================
+        # RENDERING SYSTEM
+        # ========================================
+
+        # Latest published state; never blocks the simulation
+        fotograma = simulacion.tomar()
+
+        # Redraw at FPS_RENDER, or earlier (up to FPS_MAXIMO) for a new state
+        tiempo_actual = time.perf_counter() * 1000
+        desde_render = tiempo_actual - ultimo_render
+        nuevo = fotograma.version != version_mostrada
+        if desde_render >= 1000 / FPS_RENDER or (nuevo and desde_render >= 1000 / FPS_MAXIMO):
+            ultimo_render = tiempo_actual
+            version_mostrada = fotograma.version
+            if traza:
+                inicio_render = tracing.ahora()
+
+            # Inputs that this frame shows for the first time
+            aplicadas = simulacion.entradas_aplicadas
+            while aplicadas and aplicadas[0][0] <= fotograma.version:
+                medidor.entrada(aplicadas.popleft()[1])
+
+            # New window or viewport size: clear the borders once and place
+            # the board
+            if superficie_tablero is None or fotograma.tablero.shape != vista_mostrada:
+                vista_mostrada = fotograma.tablero.shape
+                pantalla.fill(NEGRO)
+                superficie_tablero = pantalla.subsurface(area_tablero(
+                    pantalla.get_size(), *fotograma.tablero.shape, escalado_entero))
+
+            # Draw the board and the active piece at one pixel per cell,
+            # scaled to the board area in a single blit (plus the grid)
+            dibujar_tablero(superficie_tablero, fotograma.tablero)
+
+            # Update the display with all drawn elements
+            pygame.display.flip()
+            medidor.presentado(time.perf_counter())
+            if traza:
+                traza.completo("render", inicio_render, categoria="frame", version=fotograma.version)
+
+            # Count the frame so frame-limited profiling can stop on time
+            if perfilador:
+                perfilador.frame()
+            
+            # Allocations of this frame; a new locked piece is the moment
+            # to collect garbage, right after it has been presented
+            if memoria:
+                memoria.frame()
+                if fotograma.piezas != piezas_mostradas:
+                    memoria.entre_piezas()
+            piezas_mostradas = fotograma.piezas
+
+            # Startup benchmark (startup_benchmark.py): report and quit
+            if primer_frame:
+                primer_frame = False
+                if traza:
+                    traza.completo("first_frame", inicio_primer_frame, categoria="startup")
+                    traza.instante("first_playable_frame", categoria="startup")
+                if benchmark_arranque:
+                    informe_arranque(marca_pantalla, time.time())
+                    ejecutando = False
+
+        # Check for game over (new piece spawned in occupied space)
+        if fotograma.terminado:
+            ejecutando = False
+
+        # Poll input again after 1/FRECUENCIA_ENTRADA seconds
+        reloj.tick(FRECUENCIA_ENTRADA)
+
+    # The game state belongs to this thread again once the simulation stops
+    simulacion.detener()
+    
+    # Normal garbage collection again, and the allocations-per-frame report
+    if memoria:
+        memoria.terminar()
+        if informe_memoria:
+            memoria.escribir_informe(informe_memoria)
+
+    # Stop profiling before tearing down the window
+    if perfilador:
+        perfilador.disable()
+
+    # Flush the recordings to disk
+    if grabador:
+        grabador.close()
+    if grabador_repeticion:
+        grabador_repeticion.escribir_indice()
+        if repeticion:
+            destino_repeticion.close()
+
+    # Keypress-to-screen latency percentiles
+    if informe_latencia:
+        medidor.escribir_informe(informe_latencia)
+
+    # A startup benchmark run is not a game: keep it out of the score
+    # store, the archive and the telemetry
+    duracion_sesion = time.time() - inicio_sesion
+    if not benchmark_arranque:
+        registrar_partida(juego, semilla, inicio_sesion, duracion_sesion, archivo,
+                          repeticion, destino_repeticion, grabador_repeticion)
+
+    # ========================================
+    # GAME CLEANUP
+    # ========================================
+
+    # Properly shut down Pygame systems
+    pygame.quit()
+
+def registrar_partida(juego, semilla, inicio_sesion, duracion_sesion, archivo,
+                      repeticion, destino_repeticion, grabador_repeticion):
+    """
+    Record a finished game: score store, replay archive and telemetry.
+    
+    Args:
+        juego (JuegoTetris): The finished game
+        semilla (int): Piece generator seed of the game
+        inicio_sesion (float): Wall-clock start of the session
+        duracion_sesion (float): Session length in seconds
+        archivo (str): Optional replay archive path (see tetris_archive.py)
+        repeticion (str): Replay file path, or None when it was kept in memory
+        destino_repeticion: In-memory replay (io.BytesIO) when `repeticion`
+            is None
+        grabador_repeticion (GrabadorRepeticion): Recorder of the replay
+    """
+    # Queue the finished game for the score store (written in the background)
+    import score_store  # Non-blocking high-score database
+    score_store.get_store().record_game(
+        "Tetris", juego.puntuacion, juego.lineas, juego.piezas,
+        duracion_sesion, inicio_sesion)
+
+    # Append the game to the replay archive
+    if archivo:
+        import tetris_archive  # Append-only replay archive
+        if repeticion:
+            with open(repeticion, "rb") as leido:
+                datos_repeticion = leido.read()
+        else:
+            datos_repeticion = destino_repeticion.getvalue()
+        archivo_partidas = tetris_archive.ArchivoPartidas(archivo)
+        archivo_partidas.agregar(datos_repeticion, semilla, inicio_sesion, int(duracion_sesion * 1000),
+                                 juego, grabador_repeticion.operaciones)
+        archivo_partidas.close()
+
+    # Game over (or quit) event for the telemetry log
+    telemetria = telemetry.get_telemetry("tetris")
+    if telemetria:
+        telemetria.evento("game_over" if juego.terminado else "game_quit",
+                          score=juego.puntuacion, lines=juego.lineas,
+                          pieces=juego.piezas, length_s=duracion_sesion)
+        telemetria.medir("game", duracion_sesion)
 
 # ========================================
-# GAME CLEANUP AND EXIT
+# PROGRAM ENTRY POINT
 # ========================================
 
-# Properly shut down Pygame systems
-pygame.quit()
+if __name__ == '__main__':
+    # Game options; the remaining flags are left for the profiler
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument("--practice", action="store_true",
+                        help="practice mode: Z/Backspace undoes the last locked piece")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the game as a delta-encoded board stream")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="record a keyframed input replay that can be seeked instantly")
+    parser.add_argument("--board", metavar="WxH",
+                        type=lambda texto: tuple(int(valor) for valor in texto.lower().split("x")),
+                        help="board size in cells (columns x rows), e.g. 1000x2000")
+    parser.add_argument("--archive", metavar="PATH",
+                        help="append the game to a replay archive with an indexed summary table")
+    parser.add_argument("--size", metavar="WxH",
+                        type=lambda texto: tuple(int(valor) for valor in texto.lower().split("x")),
+                        help="window size in pixels, e.g. 1080x1920")
+    parser.add_argument("--fullscreen", action="store_true",
+                        help="fullscreen at the desktop resolution")
+    parser.add_argument("--stretch", action="store_true",
+                        help="fill the window with a fractional scale instead of an integer one")
+    parser.add_argument("--latency-report", metavar="PATH",
+                        help="write input-to-screen latency percentiles at exit ('-' for stdout)")
+    parser.add_argument("--alloc-free", action="store_true",
+                        help="freeze the heap after setup and only collect garbage between pieces")
+    parser.add_argument("--alloc-report", metavar="PATH",
+                        help="write allocations per frame and GC pauses at exit ('-' for stdout)")
+    opciones, resto = parser.parse_known_args()
+
+    # Profiling is opt-in through CLI flags or ARCADE_PROFILE* variables
+    argumentos = profiling.parse_profile_args(resto)
+    main(profiling.get_profiler("tetris", **argumentos), practica=opciones.practice,
+         grabacion=opciones.record, repeticion=opciones.replay, informe_latencia=opciones.latency_report,
+         tamano_ventana=opciones.size, pantalla_completa=opciones.fullscreen,
+         escalado_entero=not opciones.stretch, sin_gc=opciones.alloc_free,
+         informe_memoria=opciones.alloc_report, tamano_tablero=opciones.board,
+         archivo=opciones.archive)
 
-# Exit the Python program cleanly
-sys.exit()
+    # Exit the Python program cleanly (profile reports are written at exit)
+    sys.exit()
@@ -0,0 +1,467 @@
+"""
+========================================
+TETRIS REPLAY ARCHIVE
+========================================
+
+This file keeps every game played on a cabinet in one append-only archive
+instead of one file per game:
+
+- Body file (PATH): one record per game with its seed, its final stats and
+  its keyframed input replay (tetris_replay.py format, so an archived game
+  can be played back and seeked like any replay)
+- Index file (PATH.idx): one fixed-width summary per game (offset, seed,
+  start time, length, lines, score, pieces, ...). It is memory-mapped and
+  read as a NumPy structured array, so filters and aggregates over
+  millions of games are vectorized and never touch the replay bodies
+
+Both files are only ever appended to. A game is written body first, index
+entry second: a crash can at worst leave a body without index entry
+(recovered by reconstruir_indice(), which scans the bodies) or a partial
+index entry past the end (ignored when opening).
+
+Reading is lazy and zero-copy: nothing is mapped until the summaries or a
+game are first used, summaries are a view of the index mapping and each
+game is a memoryview slice of the body mapping. Keep the archive open
+while using those views. One process appends to an archive at a time
+(one archive per cabinet).
+
+File layout (little endian):
+- Body file: b"TTAR" + version (u8), then per game b"TTAG", the game's
+  index entry (RESUMEN, with its own offset) and the replay bytes
+- Index file: b"TTAX" + version (u8) + entry size (u16), then RESUMEN
+  entries
+
+Usage:
+    python tetris.py --archive cabinet.ttar              # archive each game
+    python tetris_archive.py cabinet.ttar                # aggregates
+    python tetris_archive.py cabinet.ttar --since 2026-01-01 --min-lines 40
+    python tetris_archive.py --bench --games 2000000     # scan speed
+
+Author: Game Implementation
+Purpose: Keep every cabinet game and query them all in seconds
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse     # Command line options
+import datetime     # --since / --until dates
+import json         # Command line output
+import mmap         # Zero-copy reads of both files
+import os           # File sizes
+import struct       # File and game headers
+import time         # Game timestamps and benchmark timing
+import numpy as np  # Vectorized summary table
+
+# ========================================
+# ARCHIVE FORMAT CONSTANTS
+# ========================================
+
+MAGIA = b"TTAR"             # Body file signature
+MAGIA_INDICE = b"TTAX"      # Index file signature
+MAGIA_PARTIDA = b"TTAG"     # Start of every game record in the body file
+VERSION = 1                 # Format version
+SUFIJO_INDICE = ".idx"      # Index file = body file path + this suffix
+
+CABECERA = struct.Struct("<4sB")          # magic, version
+CABECERA_INDICE = struct.Struct("<4sBH")  # magic, version, entry size
+
+# Fixed-width per-game summary (64 bytes, one index entry)
+RESUMEN = np.dtype([
+    ("posicion", "<u8"),       # Offset of the replay bytes in the body file
+    ("tamano", "<u4"),         # Replay size in bytes
+    ("semilla", "<u8"),        # Piece generator seed
+    ("inicio", "<f8"),         # Start time (seconds since the epoch)
+    ("duracion_ms", "<u4"),    # Game length
+    ("lineas", "<u4"),         # Lines cleared
+    ("puntuacion", "<u4"),     # Final score
+    ("piezas", "<u4"),         # Pieces locked
+    ("operaciones", "<u4"),    # Inputs and gravity ticks recorded
+    ("alto", "<u2"),           # Board rows
+    ("ancho", "<u2"),          # Board columns
+    ("terminado", "u1"),       # 1 = game over, 0 = quit
+    ("reservado", "V11"),      # Padding up to 64 bytes
+])
+
+# ========================================
+# ARCHIVE CLASS
+# ========================================
+
+class ArchivoPartidas:
+    """
+    Append-only archive of Tetris games with a memory-mapped summary table.
+
+    Usage:
+        archivo = ArchivoPartidas("cabinet.ttar")
+        archivo.agregar(replay_bytes, semilla, inicio, duracion_ms, juego)
+        resumenes = archivo.resumenes                      # NumPy view
+        largas = np.flatnonzero(resumenes["lineas"] >= 40)
+        repeticion = archivo.repeticion(largas[0])         # zero-copy
+        archivo.close()
+    """
+
+    def __init__(self, ruta):
+        """
+        Prepare the archive (files are opened and mapped on first use).
+
+        Args:
+            ruta (str): Body file path; the index is ruta + SUFIJO_INDICE
+        """
+        self.ruta = ruta
+        self.ruta_indice = ruta + SUFIJO_INDICE
+        self._cuerpos = None       # Append handles, opened by agregar()
+        self._indice = None
+        self._mapa = None          # Read mappings, opened on first read
+        self._mapa_indice = None
+        self._resumenes = None
+
+    # ========================================
+    # APPENDING
+    # ========================================
+
+    def _abrir_escritura(self):
+        """Open both files for appending, writing their headers if new."""
+        self._cuerpos = open(self.ruta, "ab")
+        if self._cuerpos.tell() == 0:
+            self._cuerpos.write(CABECERA.pack(MAGIA, VERSION))
+        self._indice = open(self.ruta_indice, "ab")
+        if self._indice.tell() == 0:
+            self._indice.write(CABECERA_INDICE.pack(MAGIA_INDICE, VERSION, RESUMEN.itemsize))
+        else:
+            # Drop a partial entry left by a crash, so entries stay aligned
+            sobrante = (self._indice.tell() - CABECERA_INDICE.size) % RESUMEN.itemsize
+            if sobrante:
+                self._indice.truncate(self._indice.tell() - sobrante)
+                self._indice.seek(0, os.SEEK_END)
+
+    def agregar(self, datos, semilla, inicio, duracion_ms, juego, operaciones=0):
+        """
+        Append one game (body first, then its index entry).
+
+        Args:
+            datos (bytes): Keyframed replay (tetris_replay.GrabadorRepeticion)
+            semilla (int): Piece generator seed of the game
+            inicio (float): Start time (seconds since the epoch)
+            duracion_ms (int): Game length in milliseconds
+            juego (JuegoTetris): Finished game, for its final stats
+            operaciones (int): Operations in the replay
+
+        Returns:
+            int: Number of the game in the archive
+        """
+        if self._cuerpos is None:
+            self._abrir_escritura()
+        resumen = np.zeros(1, dtype=RESUMEN)
+        resumen["posicion"] = self._cuerpos.tell() + len(MAGIA_PARTIDA) + RESUMEN.itemsize
+        resumen["tamano"] = len(datos)
+        resumen["semilla"] = semilla
+        resumen["inicio"] = inicio
+        resumen["duracion_ms"] = duracion_ms
+        resumen["lineas"] = juego.lineas
+        resumen["puntuacion"] = juego.puntuacion
+        resumen["piezas"] = juego.piezas
+        resumen["operaciones"] = operaciones
+        resumen["alto"], resumen["ancho"] = juego.tablero.shape
+        resumen["terminado"] = juego.terminado
+        entrada = resumen.tobytes()
+        self._cuerpos.write(MAGIA_PARTIDA + entrada)
+        self._cuerpos.write(datos)
+        self._indice.write(entrada)
+        return (self._indice.tell() - CABECERA_INDICE.size) // RESUMEN.itemsize - 1
+
+    def flush(self):
+        """Push appended games to disk (bodies before their index entries)."""
+        if self._cuerpos is not None:
+            self._cuerpos.flush()
+            self._indice.flush()
+
+    # ========================================
+    # LAZY ZERO-COPY READING
+    # ========================================
+
+    def _mapear(self):
+        """Map both files read-only and validate their headers."""
+        self.flush()
+        with open(self.ruta_indice, "rb") as archivo:
+            self._mapa_indice = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, tamano = CABECERA_INDICE.unpack_from(self._mapa_indice, 0)
+        if magia != MAGIA_INDICE or tamano != RESUMEN.itemsize:
+            raise ValueError("not a Tetris archive index: %s" % self.ruta_indice)
+        with open(self.ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if CABECERA.unpack_from(self._mapa, 0)[0] != MAGIA:
+            raise ValueError("not a Tetris archive: %s" % self.ruta)
+
+        # Whole entries only, and only those whose body made it to disk
+        cantidad = (len(self._mapa_indice) - CABECERA_INDICE.size) // RESUMEN.itemsize
+        resumenes = np.frombuffer(self._mapa_indice, dtype=RESUMEN, count=cantidad,
+                                  offset=CABECERA_INDICE.size)
+        completas = len(resumenes)
+        while completas and (int(resumenes["posicion"][completas - 1])
+                             + int(resumenes["tamano"][completas - 1]) > len(self._mapa)):
+            completas -= 1
+        self._resumenes = resumenes[:completas]
+
+    @property
+    def resumenes(self):
+        """
+        Summary table of every game (read-only NumPy structured array).
+
+        A view of the index mapping: filtering it copies nothing but the
+        selected columns. Games appended after the first read show up after
+        recargar().
+        """
+        if self._resumenes is None:
+            self._mapear()
+        return self._resumenes
+
+    def __len__(self):
+        return len(self.resumenes)
+
+    def datos(self, numero):
+        """
+        Replay bytes of one game, without copying.
+
+        Args:
+            numero (int): Game number (row of `resumenes`)
+
+        Returns:
+            memoryview: Slice of the body mapping
+        """
+        resumen = self.resumenes[numero]
+        posicion = int(resumen["posicion"])
+        return memoryview(self._mapa)[posicion:posicion + int(resumen["tamano"])]
+
+    def repeticion(self, numero):
+        """
+        Open one archived game as a seekable replay (zero-copy).
+
+        Returns:
+            tetris_replay.Repeticion: Replay reading straight from the mapping
+        """
+        import tetris_replay  # Replay playback (imports the rules)
+        return tetris_replay.Repeticion(self.datos(numero))
+
+    def recargar(self):
+        """Drop the mappings so the next read sees newly appended games."""
+        self._cerrar_mapas()
+
+    def _cerrar_mapas(self):
+        """Release the read mappings."""
+        self._resumenes = None
+        for mapa in (self._mapa, self._mapa_indice):
+            if mapa is not None:
+                try:
+                    mapa.close()
+                except BufferError:
+                    pass    # Views still in use keep it alive until they go
+        self._mapa = self._mapa_indice = None
+
+    def close(self):
+        """Flush appended games and release files and mappings."""
+        self._cerrar_mapas()
+        if self._cuerpos is not None:
+            self.flush()
+            self._cuerpos.close()
+            self._indice.close()
+            self._cuerpos = self._indice = None
+
+    # ========================================
+    # RECOVERY
+    # ========================================
+
+    def reconstruir_indice(self):
+        """
+        Rewrite the index from the game records in the body file.
+
+        Needed only if the index file is lost or a crash left bodies without
+        an entry. A truncated last body is left out.
+
+        Returns:
+            int: Number of games indexed
+        """
+        self.close()
+        entradas = []
+        with open(self.ruta, "rb") as archivo:
+            with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                posicion = CABECERA.size
+                while posicion + len(MAGIA_PARTIDA) + RESUMEN.itemsize <= len(mapa):
+                    if mapa[posicion:posicion + len(MAGIA_PARTIDA)] != MAGIA_PARTIDA:
+                        break
+                    inicio = posicion + len(MAGIA_PARTIDA)
+                    entrada = mapa[inicio:inicio + RESUMEN.itemsize]
+                    resumen = np.frombuffer(entrada, dtype=RESUMEN)[0]
+                    fin = int(resumen["posicion"]) + int(resumen["tamano"])
+                    if fin > len(mapa):
+                        break
+                    entradas.append(entrada)
+                    posicion = fin
+        temporal = self.ruta_indice + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(CABECERA_INDICE.pack(MAGIA_INDICE, VERSION, RESUMEN.itemsize))
+            archivo.write(b"".join(entradas))
+        os.replace(temporal, self.ruta_indice)
+        return len(entradas)
+
+# ========================================
+# QUERIES
+# ========================================
+
+def filtrar(resumenes, desde=None, hasta=None, lineas_minimas=None, solo_terminadas=False):
+    """
+    Select games with vectorized comparisons over the summary table.
+
+    Args:
+        resumenes (numpy.ndarray): ArchivoPartidas.resumenes (or a slice)
+        desde (float): Only games started at or after this epoch time
+        hasta (float): Only games started before this epoch time
+        lineas_minimas (int): Only games with at least this many lines
+        solo_terminadas (bool): Only games that ended in game over
+
+    Returns:
+        numpy.ndarray: Boolean mask over `resumenes`
+    """
+    mascara = np.ones(len(resumenes), dtype=bool)
+    if desde is not None:
+        mascara &= resumenes["inicio"] >= desde
+    if hasta is not None:
+        mascara &= resumenes["inicio"] < hasta
+    if lineas_minimas is not None:
+        mascara &= resumenes["lineas"] >= lineas_minimas
+    if solo_terminadas:
+        mascara &= resumenes["terminado"] != 0
+    return mascara
+
+def agregados(resumenes, mascara=None):
+    """
+    Aggregate statistics of the (selected) games.
+
+    Args:
+        resumenes (numpy.ndarray): Summary table
+        mascara (numpy.ndarray): Optional boolean selection
+
+    Returns:
+        dict: Count, play time, lines, score and pieces totals and extremes
+    """
+    def columna(nombre):
+        valores = resumenes[nombre]
+        return valores[mascara] if mascara is not None else valores
+
+    partidas = int(mascara.sum()) if mascara is not None else len(resumenes)
+    if not partidas:
+        return {"partidas": 0}
+    lineas = columna("lineas")
+    puntuacion = columna("puntuacion")
+    return {
+        "partidas": partidas,
+        "horas_jugadas": float(columna("duracion_ms").sum(dtype=np.uint64)) / 3600000,
+        "lineas_total": int(lineas.sum(dtype=np.uint64)),
+        "lineas_media": float(lineas.mean()),
+        "lineas_max": int(lineas.max()),
+        "puntuacion_media": float(puntuacion.mean()),
+        "puntuacion_max": int(puntuacion.max()),
+        "mejor_partida": int(np.flatnonzero(mascara)[puntuacion.argmax()]
+                             if mascara is not None else puntuacion.argmax()),
+        "piezas_total": int(columna("piezas").sum(dtype=np.uint64)),
+        "primera": float(columna("inicio").min()),
+        "ultima": float(columna("inicio").max()),
+    }
+
+# ========================================
+# SCAN BENCHMARK
+# ========================================
+
+def benchmark(ruta, partidas=1000000, semilla=0):
+    """
+    Build an archive of `partidas` synthetic games and time full scans.
+
+    The games are generated directly as summaries (random stats over one
+    year) and all share one tiny body, so building the file is quick; the
+    scans only read the index, like real queries do.
+
+    Args:
+        ruta (str): Archive path to create (overwritten)
+        partidas (int): Number of games
+        semilla (int): Seed for the synthetic stats
+
+    Returns:
+        dict: Build time, open time, filter + aggregate time, games per second
+    """
+    generador = np.random.default_rng(semilla)
+    inicio = time.perf_counter()
+    with open(ruta, "wb") as archivo:
+        archivo.write(CABECERA.pack(MAGIA, VERSION) + MAGIA_PARTIDA + bytes(RESUMEN.itemsize))
+    resumenes = np.zeros(partidas, dtype=RESUMEN)
+    resumenes["posicion"] = CABECERA.size + len(MAGIA_PARTIDA) + RESUMEN.itemsize
+    resumenes["semilla"] = generador.integers(0, 1 << 63, partidas, dtype=np.uint64)
+    resumenes["inicio"] = np.sort(time.time() - generador.uniform(0, 365 * 86400, partidas))
+    resumenes["lineas"] = generador.geometric(0.02, partidas)
+    resumenes["puntuacion"] = resumenes["lineas"] * generador.integers(40, 120, partidas)
+    resumenes["piezas"] = resumenes["lineas"] * 5 // 2 + generador.integers(10, 60, partidas)
+    resumenes["duracion_ms"] = resumenes["piezas"] * generador.integers(800, 2500, partidas)
+    resumenes["operaciones"] = resumenes["piezas"] * 12
+    resumenes["alto"], resumenes["ancho"] = 20, 10
+    resumenes["terminado"] = 1
+    with open(ruta + SUFIJO_INDICE, "wb") as archivo:
+        archivo.write(CABECERA_INDICE.pack(MAGIA_INDICE, VERSION, RESUMEN.itemsize))
+        resumenes.tofile(archivo)
+    construccion = time.perf_counter() - inicio
+    del resumenes
+
+    inicio = time.perf_counter()
+    archivo = ArchivoPartidas(ruta)
+    tabla = archivo.resumenes
+    apertura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    todas = agregados(tabla)
+    ultimo_mes = agregados(tabla, filtrar(tabla, desde=time.time() - 30 * 86400, lineas_minimas=40))
+    consulta = time.perf_counter() - inicio
+    archivo.close()
+    return {
+        "partidas": partidas,
+        "bytes_indice": os.path.getsize(ruta + SUFIJO_INDICE),
+        "construccion_s": construccion,
+        "apertura_s": apertura,
+        "consulta_s": consulta,
+        "partidas_por_segundo": 2 * partidas / consulta,
+        "todas": todas,
+        "ultimo_mes_40_lineas": ultimo_mes,
+    }
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+def _fecha(texto):
+    """Command line date (YYYY-MM-DD, local time) -> epoch seconds."""
+    return datetime.datetime.strptime(texto, "%Y-%m-%d").timestamp()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Query a Tetris replay archive")
+    parser.add_argument("archive", nargs="?", help="archive written by tetris.py --archive")
+    parser.add_argument("--since", type=_fecha, metavar="YYYY-MM-DD", help="games started on or after")
+    parser.add_argument("--until", type=_fecha, metavar="YYYY-MM-DD", help="games started before")
+    parser.add_argument("--min-lines", type=int, help="games with at least this many lines")
+    parser.add_argument("--game-over", action="store_true", help="only games that ended in game over")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="rewrite the index by scanning the game records")
+    parser.add_argument("--bench", action="store_true", help="time scans of a synthetic archive")
+    parser.add_argument("--games", type=int, default=1000000, help="games in the synthetic archive")
+    opciones = parser.parse_args()
+
+    if opciones.bench:
+        print(json.dumps(benchmark(opciones.archive or "bench.ttar", opciones.games), indent=2))
+    elif opciones.archive:
+        archivo = ArchivoPartidas(opciones.archive)
+        if opciones.rebuild_index:
+            print(json.dumps({"partidas": archivo.reconstruir_indice()}))
+        else:
+            tabla = archivo.resumenes
+            mascara = filtrar(tabla, opciones.since, opciones.until, opciones.min_lines,
+                              opciones.game_over)
+            print(json.dumps(agregados(tabla, mascara), indent=2))
+        archivo.close()
+    else:
+        parser.print_help()
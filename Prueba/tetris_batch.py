@@ -0,0 +1,328 @@
+"""
+========================================
+BATCHED TETRIS ENVIRONMENT
+========================================
+
+This file runs K independent Tetris games at once on top of the rules in
+tetris.py. All boards live in one NumPy array of shape (K, rows, columns)
+and every step() applies K actions with array operations:
+- Movement and rotation with collision checks for the whole batch
+- Gravity, piece locking and line clearing for the whole batch
+- Spawning of new pieces and automatic reset of finished games
+
+Per-game Python overhead is paid once per step() instead of once per game,
+which is what training and evaluation workloads need.
+
+Actions (one per board and step):
+- 0: No-op          - 3: Soft drop (one extra row)
+- 1: Move left      - 4: Rotate clockwise
+- 2: Move right     - 5: Hard drop (lock immediately)
+
+Author: Game Implementation
+Purpose: Fast headless simulation for bots, training and evaluation
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import numpy as np  # Batched board storage and vectorized rules
+from tetris import (ANCHO_TABLERO, ALTO_TABLERO, COMANDOS, FORMAS_PIEZAS, VACIO,
+                    Pieza)
+
+# ========================================
+# ACTION DEFINITIONS
+# ========================================
+
+ACCION_NADA = 0        # Do nothing, only gravity applies
+ACCION_IZQUIERDA = 1   # Move one column left
+ACCION_DERECHA = 2     # Move one column right
+ACCION_ABAJO = 3       # Soft drop: move one extra row down
+ACCION_ROTAR = 4       # Rotate clockwise (reverted if it collides)
+ACCION_CAIDA = 5       # Hard drop: fall to the bottom and lock
+NUM_ACCIONES = 6
+
+# Action names (index = action code); the moves are the tetris.COMANDOS names
+NOMBRES_ACCIONES = ("nada", "izquierda", "derecha", "abajo", "rotar", "caida")
+
+# Action code -> tetris.COMANDOS handler (None for ACCION_NADA)
+COMANDOS_ACCION = tuple(COMANDOS.get(nombre) for nombre in NOMBRES_ACCIONES)
+
+def aplicar_accion(juego, accion):
+    """
+    Play one action on a single JuegoTetris followed by one row of gravity.
+
+    Same step semantics as BatchedTetris.step() for one board: a hard drop
+    locks the piece and gets no extra gravity.
+
+    Args:
+        juego (JuegoTetris): Game to modify
+        accion (int): Action code (see ACCION_* constants)
+    """
+    comando = COMANDOS_ACCION[accion]
+    if comando is not None:
+        comando(juego)
+    if accion != ACCION_CAIDA:
+        juego.caer()
+
+# ========================================
+# PRECOMPUTED PIECE GEOMETRY
+# ========================================
+
+def tabla_rotaciones():
+    """
+    Build the cell offsets of every piece type in every rotation.
+
+    Rotations are produced with Pieza.rotar(), so the batched rules match
+    the interactive game exactly (top-left anchored, no wall kicks).
+
+    Returns:
+        numpy.ndarray: int16 array of shape (7, 4, 4, 2) holding the
+            (row, column) offset of each of the 4 blocks of each piece type
+            in each of the 4 rotation states
+    """
+    tabla = np.zeros((len(FORMAS_PIEZAS), 4, 4, 2), dtype=np.int16)
+    for tipo in range(len(FORMAS_PIEZAS)):
+        pieza = Pieza(0, 0, tipo)
+        for rotacion in range(4):
+            celdas = [(fila_idx, col_idx)
+                      for fila_idx, fila in enumerate(pieza.forma)
+                      for col_idx, celda in enumerate(fila) if celda]
+            tabla[tipo, rotacion] = celdas
+            pieza.forma = pieza.rotar()
+    return tabla
+
+# Offsets shared by every batch: ROTACIONES[tipo, rotacion] -> 4 × (dy, dx)
+ROTACIONES = tabla_rotaciones()
+
+# Spawn column per piece type, same rule as nueva_pieza() in tetris.py
+X_INICIAL = np.array([ANCHO_TABLERO // 2 - 2 if tipo == 0 else ANCHO_TABLERO // 2 - 1
+                      for tipo in range(len(FORMAS_PIEZAS))], dtype=np.int16)
+
+# ========================================
+# BATCHED ENVIRONMENT CLASS
+# ========================================
+
+class BatchedTetris:
+    """
+    K Tetris games advanced in lockstep with NumPy array operations.
+
+    State arrays (one entry per game):
+    - tableros: (K, rows, columns) uint8 boards, same encoding as tetris.py
+    - tipos, rotaciones, xs, ys: pose of each active piece
+    - lineas, piezas: lines cleared and pieces locked in the current game
+    """
+
+    def __init__(self, num_juegos, semilla=None, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO):
+        """
+        Initialize K empty games.
+
+        Args:
+            num_juegos (int): Number of boards K simulated together
+            semilla (int): Seed for the piece generator (None = random)
+            ancho (int): Board columns
+            alto (int): Board rows
+        """
+        self.num_juegos = num_juegos
+        self.ancho = ancho
+        self.alto = alto
+        self.rng = np.random.default_rng(semilla)
+
+        # Board storage for the whole batch
+        self.tableros = np.zeros((num_juegos, alto, ancho), dtype=np.uint8)
+
+        # Active piece pose per game
+        self.tipos = np.zeros(num_juegos, dtype=np.int16)
+        self.rotaciones = np.zeros(num_juegos, dtype=np.int16)
+        self.xs = np.zeros(num_juegos, dtype=np.int16)
+        self.ys = np.zeros(num_juegos, dtype=np.int16)
+
+        # Per-game statistics (reset with the game)
+        self.lineas = np.zeros(num_juegos, dtype=np.int64)
+        self.piezas = np.zeros(num_juegos, dtype=np.int64)
+
+        self._x_inicial = (X_INICIAL + (ancho - ANCHO_TABLERO) // 2).astype(np.int16)
+        self._todos = np.arange(num_juegos)
+        self.reset()
+
+    # ========================================
+    # EPISODE CONTROL
+    # ========================================
+
+    def reset(self, indices=None):
+        """
+        Clear the given games (all by default) and spawn a new piece.
+
+        Args:
+            indices (numpy.ndarray): Game indices to reset, None for all
+
+        Returns:
+            numpy.ndarray: The (K, rows, columns) board array
+        """
+        if indices is None:
+            indices = self._todos
+        self.tableros[indices] = VACIO
+        self.lineas[indices] = 0
+        self.piezas[indices] = 0
+        self._generar(indices)
+        return self.tableros
+
+    def _generar(self, indices):
+        """Spawn a random piece at the top of each given board."""
+        tipos = self.rng.integers(0, len(FORMAS_PIEZAS), size=len(indices))
+        self.tipos[indices] = tipos
+        self.rotaciones[indices] = 0
+        self.xs[indices] = self._x_inicial[tipos]
+        self.ys[indices] = 0
+
+    # ========================================
+    # VECTORIZED RULES
+    # ========================================
+
+    def _celdas(self, indices, dx=0, dy=0, rotaciones=None):
+        """
+        Absolute (rows, columns) of the 4 blocks of each selected piece.
+
+        Returns:
+            tuple: Two (n, 4) int arrays with block rows and block columns
+        """
+        if rotaciones is None:
+            rotaciones = self.rotaciones[indices]
+        offsets = ROTACIONES[self.tipos[indices], rotaciones]
+        filas = self.ys[indices, None] + offsets[..., 0] + dy
+        columnas = self.xs[indices, None] + offsets[..., 1] + dx
+        return filas, columnas
+
+    def _colision(self, indices, dx=0, dy=0, rotaciones=None):
+        """
+        Vectorized hay_colision() for the selected games.
+
+        Returns:
+            numpy.ndarray: Boolean array, True where the tested pose collides
+        """
+        filas, columnas = self._celdas(indices, dx, dy, rotaciones)
+        fuera = (columnas < 0) | (columnas >= self.ancho) | (filas >= self.alto)
+        # Clip so the lookup below stays in bounds; clipped cells are masked out
+        filas_c = np.clip(filas, 0, self.alto - 1)
+        columnas_c = np.clip(columnas, 0, self.ancho - 1)
+        ocupadas = self.tableros[indices[:, None], filas_c, columnas_c] != VACIO
+        ocupadas &= filas >= 0
+        return (fuera | ocupadas).any(axis=1)
+
+    def _mover(self, indices, dx, dy):
+        """Move the selected pieces by (dx, dy) where that does not collide."""
+        if len(indices) == 0:
+            return
+        libres = indices[~self._colision(indices, dx, dy)]
+        self.xs[libres] += dx
+        self.ys[libres] += dy
+
+    def _rotar(self, indices):
+        """Rotate the selected pieces clockwise where that does not collide."""
+        if len(indices) == 0:
+            return
+        nuevas = (self.rotaciones[indices] + 1) % 4
+        libres = ~self._colision(indices, rotaciones=nuevas)
+        self.rotaciones[indices[libres]] = nuevas[libres]
+
+    def _caida_libre(self, indices):
+        """Drop the selected pieces until they rest on something."""
+        while len(indices):
+            libres = indices[~self._colision(indices, dy=1)]
+            self.ys[libres] += 1
+            indices = libres
+
+    def _fijar(self, indices):
+        """
+        Vectorized fijar_pieza(): lock pieces and clear full lines.
+
+        Returns:
+            numpy.ndarray: Lines cleared by each selected game
+        """
+        filas, columnas = self._celdas(indices)
+        visibles = filas >= 0
+        juego = np.broadcast_to(indices[:, None], filas.shape)
+        valores = np.broadcast_to((self.tipos[indices] + 1)[:, None], filas.shape)
+        self.tableros[juego[visibles], filas[visibles], columnas[visibles]] = valores[visibles]
+        self.piezas[indices] += 1
+
+        # ========================================
+        # BATCHED LINE CLEARING
+        # ========================================
+        completas = (self.tableros[indices] != VACIO).all(axis=2)
+        lineas = completas.sum(axis=1)
+        con_lineas = lineas > 0
+        if con_lineas.any():
+            seleccion = indices[con_lineas]
+            completas = completas[con_lineas]
+            # Stable sort puts full rows first and keeps the others in order
+            orden = np.argsort(~completas, axis=1, kind="stable")
+            tableros = np.take_along_axis(self.tableros[seleccion], orden[:, :, None], axis=1)
+            # The first `lineas` rows are the cleared ones: empty them
+            vaciar = np.arange(self.alto)[None, :] < lineas[con_lineas, None]
+            tableros[vaciar] = VACIO
+            self.tableros[seleccion] = tableros
+        self.lineas[indices] += lineas
+        return lineas
+
+    # ========================================
+    # STEP FUNCTION
+    # ========================================
+
+    def step(self, acciones):
+        """
+        Apply one action per game followed by one row of gravity.
+
+        Games that end (a new piece spawns on occupied cells) are reset
+        automatically; their final statistics are returned in `info`.
+
+        Args:
+            acciones (numpy.ndarray): K action codes (see ACCION_* constants)
+
+        Returns:
+            tuple: (tableros, recompensas, terminados, info) where
+                tableros is the (K, rows, columns) board array,
+                recompensas the lines cleared this step,
+                terminados a boolean array of finished games, and
+                info a dict with "lineas" and "piezas" of finished games
+        """
+        acciones = np.asarray(acciones)
+        todos = self._todos
+
+        # ========================================
+        # PLAYER ACTIONS
+        # ========================================
+        self._mover(todos[acciones == ACCION_IZQUIERDA], -1, 0)
+        self._mover(todos[acciones == ACCION_DERECHA], 1, 0)
+        self._mover(todos[acciones == ACCION_ABAJO], 0, 1)
+        self._rotar(todos[acciones == ACCION_ROTAR])
+        self._caida_libre(todos[acciones == ACCION_CAIDA])
+
+        # ========================================
+        # GRAVITY AND LOCKING
+        # ========================================
+        apoyadas = self._colision(todos, dy=1)
+        self.ys[~apoyadas] += 1
+
+        # Hard-dropped pieces lock now, the rest lock when they cannot fall
+        fijar = todos[apoyadas | (acciones == ACCION_CAIDA)]
+        recompensas = np.zeros(self.num_juegos, dtype=np.int64)
+        terminados = np.zeros(self.num_juegos, dtype=bool)
+        info = {"lineas": np.zeros(self.num_juegos, dtype=np.int64),
+                "piezas": np.zeros(self.num_juegos, dtype=np.int64)}
+
+        if len(fijar):
+            recompensas[fijar] = self._fijar(fijar)
+            self._generar(fijar)
+
+            # ========================================
+            # GAME OVER AND AUTOMATIC RESET
+            # ========================================
+            perdidos = fijar[self._colision(fijar)]
+            if len(perdidos):
+                terminados[perdidos] = True
+                info["lineas"][perdidos] = self.lineas[perdidos]
+                info["piezas"][perdidos] = self.piezas[perdidos]
+                self.reset(perdidos)
+
+        return self.tableros, recompensas, terminados, info
@@ -0,0 +1,178 @@
+"""
+========================================
+GYM-STYLE TETRIS ENVIRONMENT
+========================================
+
+This file wraps the Tetris rules (JuegoTetris in tetris.py) in the usual
+reinforcement-learning interface:
+- reset() -> (observation, info)
+- step(action) -> (observation, reward, terminated, truncated, info)
+- Once a step returns terminated or truncated, step() raises until reset()
+
+Observations are read-only NumPy views over the engine's own board buffer,
+so no list of tuples is built and nothing is copied per step. The view is
+updated in place by the engine; callers that need to keep an old
+observation must copy it themselves.
+
+With memoria_compartida=True the board buffer is allocated in a
+multiprocessing.shared_memory block. Learner processes attach to it by name
+with abrir_tablero_compartido() and read the live board without pickling.
+
+Actions use the same codes as tetris_batch.py (ACCION_* constants).
+
+Author: Game Implementation
+Purpose: Let bots and learners drive Tetris without copying the board
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+from multiprocessing import shared_memory   # Zero-copy board sharing between processes
+import numpy as np                          # Board views
+from tetris import ANCHO_TABLERO, ALTO_TABLERO, JuegoTetris
+from tetris_batch import NUM_ACCIONES, aplicar_accion
+
+# ========================================
+# SHARED MEMORY HELPERS
+# ========================================
+
+def abrir_tablero_compartido(nombre, ancho=ANCHO_TABLERO, alto=ALTO_TABLERO):
+    """
+    Attach to the shared board of a TetrisEnv running in another process.
+
+    Args:
+        nombre (str): Shared memory block name (TetrisEnv.nombre_memoria)
+        ancho (int): Board columns
+        alto (int): Board rows
+
+    Returns:
+        tuple: (shared_memory.SharedMemory, numpy.ndarray) where the array
+            is a read-only (alto, ancho) uint8 view of the live board.
+            Keep the SharedMemory object alive while using the view and
+            call close() on it when done.
+    """
+    memoria = shared_memory.SharedMemory(name=nombre)
+    tablero = np.ndarray((alto, ancho), dtype=np.uint8, buffer=memoria.buf)
+    tablero.flags.writeable = False
+    return memoria, tablero
+
+# ========================================
+# ENVIRONMENT CLASS
+# ========================================
+
+class TetrisEnv:
+    """
+    Single-game Tetris environment with zero-copy observations.
+
+    Attributes:
+        observacion: Read-only (rows, columns) uint8 view of the board
+        juego: Underlying JuegoTetris engine
+        nombre_memoria: Shared memory name, or None when not shared
+    """
+
+    num_acciones = NUM_ACCIONES
+
+    def __init__(self, semilla=None, memoria_compartida=False, max_pasos=None):
+        """
+        Initialize the environment.
+
+        Args:
+            semilla (int): Seed for the piece generator (None = random)
+            memoria_compartida (bool): Allocate the board in shared memory
+            max_pasos (int): Truncate episodes after this many steps
+        """
+        self.max_pasos = max_pasos
+        self.pasos = 0
+        self.fin_episodio = False      # Set when a step ended the episode
+        self._memoria = None
+        self.nombre_memoria = None
+
+        # ========================================
+        # BOARD BUFFER ALLOCATION
+        # ========================================
+        tablero = None
+        if memoria_compartida:
+            self._memoria = shared_memory.SharedMemory(create=True, size=ALTO_TABLERO * ANCHO_TABLERO)
+            self.nombre_memoria = self._memoria.name
+            tablero = np.ndarray((ALTO_TABLERO, ANCHO_TABLERO), dtype=np.uint8, buffer=self._memoria.buf)
+
+        self.juego = JuegoTetris(semilla, tablero)
+
+        # Read-only view: the engine writes, observers can only read
+        self.observacion = self.juego.tablero.view()
+        self.observacion.flags.writeable = False
+
+    def memoryview(self):
+        """
+        Return a read-only memoryview over the board buffer.
+
+        Returns:
+            memoryview: Row-major uint8 view of the live board
+        """
+        return memoryview(self.juego.tablero).toreadonly()
+
+    def _info(self):
+        """Build the info dict with the active piece pose and statistics."""
+        pieza = self.juego.pieza_actual
+        return {
+            "pieza": (pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y),
+            "lineas": self.juego.lineas,
+            "piezas": self.juego.piezas,
+            "pasos": self.pasos,
+        }
+
+    # ========================================
+    # ENVIRONMENT INTERFACE
+    # ========================================
+
+    def reset(self, semilla=None):
+        """
+        Start a new episode.
+
+        Args:
+            semilla (int): Optional new seed for the piece generator
+
+        Returns:
+            tuple: (observation, info)
+        """
+        self.juego.reiniciar(semilla)
+        self.pasos = 0
+        self.fin_episodio = False
+        return self.observacion, self._info()
+
+    def step(self, accion):
+        """
+        Apply one action followed by one row of gravity.
+
+        Args:
+            accion (int): Action code (see ACCION_* in tetris_batch.py)
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info) where
+                the reward is the number of lines cleared during the step
+
+        Raises:
+            RuntimeError: If the episode already ended (call reset() first)
+        """
+        if self.fin_episodio:
+            raise RuntimeError("episode is over, call reset() before step()")
+        juego = self.juego
+        lineas_antes = juego.lineas
+        aplicar_accion(juego, accion)
+
+        self.pasos += 1
+        truncado = self.max_pasos is not None and self.pasos >= self.max_pasos
+        recompensa = juego.lineas - lineas_antes
+        self.fin_episodio = juego.terminado or truncado
+        return self.observacion, recompensa, juego.terminado, truncado, self._info()
+
+    def close(self):
+        """Release the shared memory block (if any)."""
+        if self._memoria is not None:
+            # Drop our views first so the buffer can be released
+            del self.observacion
+            self.juego.tablero = None
+            self._memoria.close()
+            self._memoria.unlink()
+            self._memoria = None
@@ -0,0 +1,279 @@
+"""
+========================================
+TETRIS REFERENCE RULES
+========================================
+
+This file keeps the original, list-based Tetris rules exactly as they were
+written before any optimization:
+- The board is a list of rows, each a list of RGB color tuples (NEGRO =
+  empty cell)
+- hay_colision(), fijar_pieza() and PiezaReferencia.rotar() are the
+  original loops, line for line
+
+They are deliberately slow and simple. Optimized engines (the uint8
+JuegoTetris, BatchedTetris, ...) are checked against them by
+tetris_verify.py; do not optimize this file.
+
+ModeloReferencia wraps the reference rules in the same step semantics the
+verification harness uses for every engine: one player action followed by
+one row of gravity.
+
+Author: Game Implementation
+Purpose: Ground truth for differential testing of optimized engines
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+from tetris import (ANCHO_TABLERO, ALTO_TABLERO, NEGRO, FORMAS_PIEZAS,
+                    COLORES_PIEZAS)
+from tetris_batch import (ACCION_IZQUIERDA, ACCION_DERECHA, ACCION_ABAJO,
+                          ACCION_ROTAR, ACCION_CAIDA)
+
+# ========================================
+# CELL ID MAPPING
+# ========================================
+
+# Color tuple -> cell id of the optimized engines (0 = empty, type + 1)
+ID_COLOR = {NEGRO: 0}
+ID_COLOR.update({color: indice + 1 for indice, color in enumerate(COLORES_PIEZAS)})
+
+# ========================================
+# REFERENCE PIECE
+# ========================================
+
+class PiezaReferencia:
+    """
+    The original tetromino piece (position, shape, color, rotation).
+    """
+
+    def __init__(self, x, y, forma_idx):
+        """
+        Initialize a new tetromino piece.
+
+        Args:
+            x (int): Starting x-coordinate on the game board
+            y (int): Starting y-coordinate on the game board
+            forma_idx (int): Index into FORMAS_PIEZAS array to determine piece type
+        """
+        self.x = x                              # Current x position on board grid
+        self.y = y                              # Current y position on board grid
+        self.forma_idx = forma_idx              # Index to identify piece type
+        self.forma = FORMAS_PIEZAS[forma_idx]   # 2D array representing piece shape
+        self.color = COLORES_PIEZAS[forma_idx]  # RGB color tuple for this piece
+        self.rotacion = 0                       # Current rotation state (0-3)
+
+    def rotar(self):
+        """
+        Rotate the piece 90 degrees clockwise.
+
+        Returns:
+            list: New 2D array representing the rotated piece shape
+        """
+        # Get dimensions of current piece shape
+        filas = len(self.forma)         # Number of rows in current shape
+        columnas = len(self.forma[0])   # Number of columns in current shape
+
+        # Create new matrix with swapped dimensions (transpose preparation)
+        nueva_forma = [[0 for _ in range(filas)] for _ in range(columnas)]
+
+        # Apply rotation transformation: nueva_forma[j][filas-1-i] = forma[i][j]
+        for i in range(filas):
+            for j in range(columnas):
+                nueva_forma[j][filas-1-i] = self.forma[i][j]
+
+        return nueva_forma
+
+# ========================================
+# REFERENCE BOARD RULES
+# ========================================
+
+def crear_tablero():
+    """
+    Create an empty board: ALTO_TABLERO rows of ANCHO_TABLERO black cells.
+
+    Returns:
+        list: 2D array representing empty game board
+    """
+    return [[NEGRO for _ in range(ANCHO_TABLERO)] for _ in range(ALTO_TABLERO)]
+
+def hay_colision(tablero, pieza, offset_x=0, offset_y=0):
+    """
+    Check if a piece would collide with boundaries or existing blocks.
+
+    Args:
+        tablero (list): 2D array representing the game board
+        pieza (PiezaReferencia): The piece to test for collision
+        offset_x (int): Horizontal offset to test (for movement preview)
+        offset_y (int): Vertical offset to test (for movement preview)
+
+    Returns:
+        bool: True if collision detected, False if position is valid
+    """
+    # Check each filled block in the piece's current shape
+    for fila_idx, fila in enumerate(pieza.forma):
+        for col_idx, celda in enumerate(fila):
+            if celda:  # Only check filled blocks
+                # Calculate the absolute position with offsets
+                x = pieza.x + col_idx + offset_x
+                y = pieza.y + fila_idx + offset_y
+
+                # Check boundary collisions
+                if x < 0 or x >= ANCHO_TABLERO or y >= ALTO_TABLERO:
+                    return True
+
+                # Check collision with existing placed pieces
+                # Only check if y >= 0 to avoid checking above the visible board
+                if y >= 0 and tablero[y][x] != NEGRO:
+                    return True
+    return False
+
+def fijar_pieza(tablero, pieza):
+    """
+    Place a piece permanently on the game board and handle line clearing.
+
+    Args:
+        tablero (list): 2D array representing the game board
+        pieza (PiezaReferencia): The piece to place permanently
+
+    Returns:
+        int: Number of lines cleared
+    """
+    # Add each filled block of the piece to the board
+    for fila_idx, fila in enumerate(pieza.forma):
+        for col_idx, celda in enumerate(fila):
+            if celda:  # Only process filled blocks
+                x = pieza.x + col_idx
+                y = pieza.y + fila_idx
+                # Only place blocks that are within the visible board area
+                if y >= 0:
+                    tablero[y][x] = pieza.color
+
+    # Track number of lines cleared for scoring/statistics
+    lineas_completas = 0
+
+    # Start from bottom and work upward to handle multiple line clears
+    y = ALTO_TABLERO - 1
+    while y >= 0:
+        # Check if current row is completely filled
+        if all(celda != NEGRO for celda in tablero[y]):
+            # Move all rows above the cleared line down by one position
+            for y2 in range(y, 0, -1):
+                tablero[y2] = tablero[y2-1].copy()  # Copy row above into current row
+
+            # Fill the top row with empty blocks
+            tablero[0] = [NEGRO] * ANCHO_TABLERO
+
+            # Increment counter for cleared lines
+            lineas_completas += 1
+
+            # Don't increment y since we need to check this row again
+        else:
+            # Row is not complete, move to next row up
+            y -= 1
+
+    return lineas_completas
+
+def nueva_pieza(forma_idx):
+    """
+    Create a piece of the given type at the original spawn position.
+
+    Args:
+        forma_idx (int): Piece type (the caller draws it, so the reference
+            and the engine under test see the same sequence)
+
+    Returns:
+        PiezaReferencia: New piece at the top of the board
+    """
+    nueva_x = ANCHO_TABLERO // 2 - 1
+    if forma_idx == 0:  # I-piece index
+        nueva_x = ANCHO_TABLERO // 2 - 2
+    return PiezaReferencia(nueva_x, 0, forma_idx)
+
+# ========================================
+# REFERENCE GAME MODEL
+# ========================================
+
+class ModeloReferencia:
+    """
+    One game played with the reference rules, one action per step.
+
+    Each step applies the action (a move or rotation only if it does not
+    collide, a hard drop locks at once) and then one row of gravity: the
+    piece falls, or locks if it cannot. After a lock the next piece type is
+    taken from `siguiente_tipo`; the game is over when it collides on spawn.
+    """
+
+    def __init__(self, siguiente_tipo, tablero=None):
+        """
+        Start a game.
+
+        Args:
+            siguiente_tipo: Function returning the next piece type (0-6)
+            tablero (list): Optional starting board of color tuples
+        """
+        self.siguiente_tipo = siguiente_tipo
+        self.tablero = tablero if tablero is not None else crear_tablero()
+        self.lineas = 0
+        self.piezas = 0
+        self.terminado = False
+        self.pieza = nueva_pieza(siguiente_tipo())
+
+    def _fijar(self):
+        """Lock the piece, clear lines, spawn the next piece."""
+        self.lineas += fijar_pieza(self.tablero, self.pieza)
+        self.piezas += 1
+        self.pieza = nueva_pieza(self.siguiente_tipo())
+        if hay_colision(self.tablero, self.pieza):
+            self.terminado = True
+
+    def paso(self, accion):
+        """
+        Apply one action followed by one row of gravity.
+
+        Args:
+            accion (int): Action code (see ACCION_* constants)
+        """
+        pieza = self.pieza
+        if accion == ACCION_IZQUIERDA and not hay_colision(self.tablero, pieza, offset_x=-1):
+            pieza.x -= 1
+        elif accion == ACCION_DERECHA and not hay_colision(self.tablero, pieza, offset_x=1):
+            pieza.x += 1
+        elif accion == ACCION_ABAJO and not hay_colision(self.tablero, pieza, offset_y=1):
+            pieza.y += 1
+        elif accion == ACCION_ROTAR:
+            forma_original = pieza.forma
+            pieza.forma = pieza.rotar()
+            if hay_colision(self.tablero, pieza):
+                pieza.forma = forma_original
+            else:
+                pieza.rotacion = (pieza.rotacion + 1) % 4
+        elif accion == ACCION_CAIDA:
+            while not hay_colision(self.tablero, pieza, offset_y=1):
+                pieza.y += 1
+            self._fijar()
+            return
+
+        # Gravity: fall one row, or lock if the piece has landed
+        if hay_colision(self.tablero, pieza, offset_y=1):
+            self._fijar()
+        else:
+            pieza.y += 1
+
+    def estado(self):
+        """
+        Comparable state: cell ids with the piece stamped in, pose, statistics.
+
+        Returns:
+            tuple: (rows of ids, (type, rotation, x, y), lines, pieces)
+        """
+        filas = [[ID_COLOR[celda] for celda in fila] for fila in self.tablero]
+        pieza = self.pieza
+        for fila_idx, fila in enumerate(pieza.forma):
+            for col_idx, celda in enumerate(fila):
+                x, y = pieza.x + col_idx, pieza.y + fila_idx
+                if celda and 0 <= y < ALTO_TABLERO and 0 <= x < ANCHO_TABLERO:
+                    filas[y][x] = pieza.forma_idx + 1
+        return (tuple(map(tuple, filas)), (pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y),
+                self.lineas, self.piezas)
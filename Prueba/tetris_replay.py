@@ -0,0 +1,629 @@
+"""
+========================================
+KEYFRAMED TETRIS REPLAYS
+========================================
+
+This file records Tetris games as the stream of operations applied to the
+rules (player moves and gravity ticks) plus a full keyframe of the game
+state every PIEZAS_POR_KEYFRAME locked pieces. A replay is played back by
+running the same operations through JuegoTetris, so it is exact down to
+the piece generator.
+
+Seeking to any point restores the nearest keyframe before it and only
+simulates the operations after that keyframe, instead of replaying the
+whole session from the start. Seeking forward within the same keyframe
+interval simply continues from the current position, so scrubbing is
+cheap in both directions.
+
+File layout (little endian):
+- Header: b"TTRP", version (u8), rows (u16), columns (u16),
+  pieces per keyframe (u16)
+- Records: kind (u8), time in ms since the recording started (u32), payload
+  - OPERACION: operation code (u8), see OPERACIONES
+  - KEYFRAME: operations before it (u64), lines (u32), score (u32),
+    pieces (u32), game over (u8), piece pose, board bytes
+  - KEYFRAME_GENERADOR: the same with the piece generator state (2.5 KB)
+    between the pose and the board
+- Index (written by close()): per keyframe operations before it (u64),
+  time (u32), byte offset (u64); then the index offset (u64), keyframe
+  count (u32) and b"TTRI". A file without index (recording interrupted)
+  is scanned once when opened.
+
+Keyframes are also written when the game is reset or restored (undo in
+practice mode), so seeking never has to simulate across those.
+
+Those keyframes, the first one, and every KEYFRAMES_POR_GENERADOR-th
+periodic one carry the generator state; the other periodic keyframes
+leave it out. Every locked piece draws exactly one piece from the
+generator, so its state at a periodic keyframe is rebuilt from the last
+keyframe that has it by drawing the pieces locked in between, without
+simulating the board.
+
+Usage:
+    python tetris.py --replay game.ttrp                 # record
+    python tetris_replay.py game.ttrp --seek 3600000    # state at 1 h
+    python tetris_replay.py --bench --hours 3           # seek latency
+
+Author: Game Implementation
+Purpose: Scrub through hours of recorded play instantly in review tooling
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse     # Command line options
+import bisect       # Nearest keyframe lookup
+import io           # In-memory replays for the benchmark
+import json         # Command line output
+import random       # Benchmark seek targets and bot timing
+import struct       # Binary record packing
+import time         # Record timestamps and seek timing
+
+from input_latency import percentil
+from tetris import (COMANDOS, FORMAS_PIEZAS, EstadoTetris, JuegoTetris, Pieza,
+                    INTERVALO_CAIDA, crear_tablero, hash_fila, nueva_pieza, tabla_zobrist)
+
+# ========================================
+# REPLAY FORMAT CONSTANTS
+# ========================================
+
+MAGIA = b"TTRP"                 # File signature
+MAGIA_INDICE = b"TTRI"          # Trailer signature of the keyframe index
+VERSION = 2                     # Format version (1: every keyframe has the generator)
+PIEZAS_POR_KEYFRAME = 10        # Locked pieces between two periodic keyframes
+KEYFRAMES_POR_GENERADOR = 16    # Periodic keyframes between two with the generator state
+
+# Record kinds
+OPERACION = 1
+KEYFRAME = 2
+KEYFRAME_GENERADOR = 3
+
+# Operation codes: gravity first, then the simulation commands
+OPERACIONES = ("caer", "izquierda", "derecha", "abajo", "rotar", "caida")
+CODIGO_OPERACION = {nombre: codigo for codigo, nombre in enumerate(OPERACIONES)}
+
+# Operation code -> handler on the game (tetris.COMANDOS after gravity)
+APLICAR_OPERACION = (lambda juego: juego.caer(),) + tuple(COMANDOS[nombre] for nombre in OPERACIONES[1:])
+
+# Binary layouts
+CABECERA = struct.Struct("<4sBHHH")     # magic, version, rows, columns, pieces per keyframe
+REGISTRO = struct.Struct("<BI")         # kind, time (ms)
+CODIGO = struct.Struct("<B")            # operation code
+ESTADO = struct.Struct("<QIIIB")        # operations before, lines, score, pieces, game over
+POSE = struct.Struct("<BBhh")           # type, rotation, x, y
+GENERADOR = struct.Struct("<B625IBd")   # version, Mersenne Twister state, has gauss, gauss
+ENTRADA_INDICE = struct.Struct("<QIQ")  # operations before, time (ms), byte offset
+COLA_INDICE = struct.Struct("<QI4s")    # index offset, keyframe count, magic
+
+# ========================================
+# RECORDER
+# ========================================
+
+class GrabadorRepeticion:
+    """
+    Writes the operations applied to a JuegoTetris and periodic keyframes.
+
+    Usage (whoever applies operations to the game calls it afterwards):
+        grabador = GrabadorRepeticion(open("game.ttrp", "wb"))
+        grabador.keyframe(juego)               # initial state
+        if juego.mover(-1):
+            grabador.operacion(juego, "izquierda")
+        ...
+        grabador.close()
+    """
+
+    def __init__(self, destino, piezas_por_keyframe=PIEZAS_POR_KEYFRAME, reloj=time.monotonic):
+        """
+        Initialize the recorder.
+
+        Args:
+            destino: Binary file object (write(), tell(), close())
+            piezas_por_keyframe (int): Locked pieces between two keyframes
+            reloj: Function returning the current time in seconds
+        """
+        self.destino = destino
+        self.piezas_por_keyframe = piezas_por_keyframe
+        self.reloj = reloj
+        self._inicio = reloj()
+        self._operaciones = 0          # Operations written so far
+        self._piezas_keyframe = 0      # Piece count at the last keyframe
+        self._sin_generador = 0        # Periodic keyframes since the last generator state
+        self.indice = []               # (operations, time, offset) per keyframe
+        self._cabecera_escrita = False
+
+    @property
+    def operaciones(self):
+        """Number of operations recorded so far."""
+        return self._operaciones
+
+    def _tiempo(self):
+        """Milliseconds since the recording started."""
+        return int((self.reloj() - self._inicio) * 1000) & 0xFFFFFFFF
+
+    def operacion(self, juego, nombre):
+        """
+        Record an operation that changed the game (call it after applying).
+
+        Args:
+            juego (JuegoTetris): The game, already modified
+            nombre (str): One of OPERACIONES
+        """
+        self.destino.write(REGISTRO.pack(OPERACION, self._tiempo()) + CODIGO.pack(CODIGO_OPERACION[nombre]))
+        self._operaciones += 1
+        if juego.piezas - self._piezas_keyframe >= self.piezas_por_keyframe:
+            self.keyframe(juego, periodico=True)
+
+    def keyframe(self, juego, periodico=False):
+        """
+        Record the whole game state (start, reset, undo, every N pieces).
+
+        Args:
+            juego (JuegoTetris): The game
+            periodico (bool): Written by operacion() every N pieces; the
+                state then follows from the records before it, so the
+                generator state can be left out
+        """
+        con_generador = not periodico or self._sin_generador + 1 >= KEYFRAMES_POR_GENERADOR
+        self._sin_generador = 0 if con_generador else self._sin_generador + 1
+        alto, ancho = juego.tablero.shape
+        if not self._cabecera_escrita:
+            self.destino.write(CABECERA.pack(MAGIA, VERSION, alto, ancho, self.piezas_por_keyframe))
+            self._cabecera_escrita = True
+        tiempo = self._tiempo()
+        self.indice.append((self._operaciones, tiempo, self.destino.tell()))
+        self._piezas_keyframe = juego.piezas
+        self.destino.write(REGISTRO.pack(KEYFRAME_GENERADOR if con_generador else KEYFRAME, tiempo)
+                           + empaquetar_estado(juego, self._operaciones, con_generador))
+
+    def escribir_indice(self):
+        """Write the keyframe index trailer (the last thing in a replay)."""
+        posicion = self.destino.tell()
+        for entrada in self.indice:
+            self.destino.write(ENTRADA_INDICE.pack(*entrada))
+        self.destino.write(COLA_INDICE.pack(posicion, len(self.indice), MAGIA_INDICE))
+
+    def close(self):
+        """Write the keyframe index and close the file."""
+        self.escribir_indice()
+        self.destino.close()
+
+def empaquetar_estado(juego, operaciones, con_generador=True):
+    """
+    Pack the full state of a game (keyframe payload).
+
+    Args:
+        juego (JuegoTetris): The game
+        operaciones (int): Operations recorded before the keyframe
+        con_generador (bool): Include the piece generator state
+
+    Returns:
+        bytes: State, pose, generator state (optional) and board
+    """
+    pieza = juego.pieza_actual
+    partes = [
+        ESTADO.pack(operaciones, juego.lineas, juego.puntuacion, juego.piezas, juego.terminado),
+        POSE.pack(pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y),
+    ]
+    if con_generador:
+        version, estado_mt, gauss = juego.generador.getstate()
+        partes.append(GENERADOR.pack(version, *estado_mt, gauss is not None, gauss or 0.0))
+    partes.append(juego.tablero.tobytes())
+    return b"".join(partes)
+
+# ========================================
+# PLAYBACK AND SEEKING
+# ========================================
+
+def _formas_rotadas():
+    """Shape of every piece type in every rotation, as rotar() builds them."""
+    formas = []
+    for tipo in range(len(FORMAS_PIEZAS)):
+        pieza = Pieza(0, 0, tipo)
+        rotaciones = []
+        for _ in range(4):
+            rotaciones.append(pieza.forma)
+            pieza.forma = pieza.rotar()
+        formas.append(rotaciones)
+    return formas
+
+FORMAS_ROTADAS = _formas_rotadas()
+
+class Repeticion:
+    """
+    Random access to a recorded replay.
+
+    buscar_tiempo() and buscar_operacion() return the replay's own
+    JuegoTetris positioned at the requested point; it stays valid until
+    the next seek.
+    """
+
+    def __init__(self, datos):
+        """
+        Parse the header and the keyframe index.
+
+        Args:
+            datos: bytes-like object with the whole replay (a memoryview of
+                a mapped file works without copying)
+
+        Raises:
+            ValueError: If the data is not a replay
+        """
+        self._datos = memoryview(datos)
+        magia, version, self.alto, self.ancho, self.piezas_por_keyframe = CABECERA.unpack_from(self._datos, 0)
+        if magia != MAGIA or version not in (1, VERSION):
+            raise ValueError("not a Tetris replay")
+        # Version 1 stored the generator state in every keyframe
+        self._con_generador = {KEYFRAME: version == 1, KEYFRAME_GENERADOR: True}
+        tamano_estado = REGISTRO.size + ESTADO.size + POSE.size + self.alto * self.ancho
+        self._tamanos = {
+            OPERACION: REGISTRO.size + CODIGO.size,
+            KEYFRAME: tamano_estado + (GENERADOR.size if version == 1 else 0),
+            KEYFRAME_GENERADOR: tamano_estado + GENERADOR.size,
+        }
+
+        # Keyframe index: from the trailer, or rebuilt by scanning the records
+        self._fin_registros = len(self._datos)
+        indice = None
+        if len(self._datos) >= CABECERA.size + COLA_INDICE.size:
+            posicion, cantidad, magia = COLA_INDICE.unpack_from(self._datos, len(self._datos) - COLA_INDICE.size)
+            if magia == MAGIA_INDICE:
+                self._fin_registros = posicion
+                indice = [ENTRADA_INDICE.unpack_from(self._datos, posicion + i * ENTRADA_INDICE.size)
+                          for i in range(cantidad)]
+        if indice is None:
+            indice = self._escanear()
+        if not indice:
+            raise ValueError("replay has no keyframe")
+        self._ops_keyframe = [operaciones for operaciones, _, _ in indice]
+        self._tiempos_keyframe = [tiempo for _, tiempo, _ in indice]
+        self._posiciones_keyframe = [posicion for _, _, posicion in indice]
+
+        self.juego = JuegoTetris(tablero=crear_tablero(self.alto, self.ancho))
+        self._zobrist = tabla_zobrist(self.alto, self.ancho)
+        self._generador = random.Random()      # Rebuilds generator states of periodic keyframes
+        self._posicion = None          # Byte offset of the next record to apply
+        self._operaciones = 0          # Operations applied to reach the current state
+        self._tiempo = 0               # Time of the last record applied
+        self._keyframe = -1            # Index of the keyframe the state was built from
+
+    def _escanear(self):
+        """Rebuild the keyframe index of a file without one."""
+        indice = []
+        posicion = CABECERA.size
+        operaciones = 0
+        while posicion + REGISTRO.size <= len(self._datos):
+            tipo, tiempo = REGISTRO.unpack_from(self._datos, posicion)
+            avance = self._tamanos.get(tipo)
+            if avance is None or posicion + avance > len(self._datos):
+                break
+            if tipo == OPERACION:
+                operaciones += 1
+            else:
+                indice.append((operaciones, tiempo, posicion))
+            posicion += avance
+        self._fin_registros = posicion
+        return indice
+
+    @property
+    def duracion(self):
+        """Time of the last record in milliseconds."""
+        ultimo = self._posiciones_keyframe[-1]
+        tiempo = self._tiempos_keyframe[-1]
+        for _, tiempo_registro, _ in self._registros(ultimo):
+            tiempo = tiempo_registro
+        return tiempo
+
+    def _registros(self, posicion):
+        """Yield (kind, time, payload offset) from a byte offset on."""
+        datos = self._datos
+        fin = self._fin_registros
+        tamanos = self._tamanos
+        while posicion < fin:
+            tipo, tiempo = REGISTRO.unpack_from(datos, posicion)
+            yield tipo, tiempo, posicion + REGISTRO.size
+            posicion += tamanos[tipo]
+
+    def _leer_generador(self, numero):
+        """
+        Generator state stored in keyframe `numero`.
+
+        Returns:
+            tuple: random.Random state, or None if the keyframe has none
+        """
+        posicion = self._posiciones_keyframe[numero]
+        if not self._con_generador[self._datos[posicion]]:
+            return None
+        posicion += REGISTRO.size + ESTADO.size + POSE.size
+        generador = GENERADOR.unpack_from(self._datos, posicion)
+        version, estado_mt, tiene_gauss, gauss = generador[0], generador[1:626], generador[626], generador[627]
+        return (version, estado_mt, gauss if tiene_gauss else None)
+
+    def _piezas(self, numero):
+        """Piece count stored in keyframe `numero`."""
+        return ESTADO.unpack_from(self._datos, self._posiciones_keyframe[numero] + REGISTRO.size)[3]
+
+    def _generador_keyframe(self, numero):
+        """
+        Generator state at keyframe `numero`, stored or rebuilt.
+
+        A keyframe without it is rebuilt from the closest earlier keyframe
+        that has it (never across a reset or undo, which always store it)
+        by drawing one piece per piece locked in between.
+        """
+        origen = numero
+        estado = self._leer_generador(origen)
+        while estado is None:
+            origen -= 1
+            estado = self._leer_generador(origen)
+        if origen == numero:
+            return estado
+        self._generador.setstate(estado)
+        for _ in range(self._piezas(numero) - self._piezas(origen)):
+            nueva_pieza(self._generador, self.ancho)
+        return self._generador.getstate()
+
+    def _restaurar(self, numero):
+        """Restore keyframe `numero` into the replay's game."""
+        posicion = self._posiciones_keyframe[numero]
+        datos = self._datos
+        con_generador = self._con_generador[datos[posicion]]
+        posicion += REGISTRO.size
+        operaciones, lineas, puntuacion, piezas, terminado = ESTADO.unpack_from(datos, posicion)
+        posicion += ESTADO.size
+        tipo, rotacion, x, y = POSE.unpack_from(datos, posicion)
+        posicion += POSE.size
+        if con_generador:
+            posicion += GENERADOR.size
+        tablero = datos[posicion:posicion + self.alto * self.ancho]
+
+        # Rebuild what restore() expects: rows as bytes and their hashes
+        self.juego.tablero[:] = memoryview(tablero).cast("B", (self.alto, self.ancho))
+        filas = tuple(self.juego.tablero[fila].tobytes() for fila in range(self.alto))
+        hash_filas = tuple(hash_fila(self._zobrist, self.juego.tablero, fila) for fila in range(self.alto))
+        hash_tablero = 0
+        for valor in hash_filas:
+            hash_tablero ^= valor
+        self.juego.restore(EstadoTetris(
+            filas=filas,
+            pieza=(tipo, FORMAS_ROTADAS[tipo][rotacion], rotacion, x, y),
+            lineas=lineas, puntuacion=puntuacion, piezas=piezas, terminado=bool(terminado),
+            generador=self._generador_keyframe(numero),
+            hash_tablero=hash_tablero, hash_filas=hash_filas))
+
+        self._posicion = posicion + self.alto * self.ancho
+        self._operaciones = operaciones
+        self._tiempo = self._tiempos_keyframe[numero]
+        self._keyframe = numero
+
+    def _aplicar(self, codigo):
+        """Apply one recorded operation to the replay's game."""
+        APLICAR_OPERACION[codigo](self.juego)
+
+    def _avanzar(self, limite_operaciones, limite_tiempo):
+        """Apply records until either limit would be passed."""
+        datos = self._datos
+        for tipo, tiempo, carga in self._registros(self._posicion):
+            if tiempo > limite_tiempo:
+                break
+            if tipo == OPERACION:
+                if self._operaciones >= limite_operaciones:
+                    break
+                self._aplicar(datos[carga])
+                self._operaciones += 1
+                self._tiempo = tiempo
+                self._posicion = carga + CODIGO.size
+            elif tipo == KEYFRAME and not self._con_generador[KEYFRAME]:
+                # Periodic keyframes match the state already
+                self._keyframe = bisect.bisect_left(self._posiciones_keyframe, carga - REGISTRO.size)
+                self._tiempo = tiempo
+                self._posicion = carga - REGISTRO.size + self._tamanos[KEYFRAME]
+            else:
+                # Reset and undo keyframes replace it (version 1 files do not
+                # tell them apart from periodic ones)
+                self._restaurar(bisect.bisect_left(self._posiciones_keyframe, carga - REGISTRO.size))
+
+    def _buscar(self, numero, limite_operaciones, limite_tiempo):
+        """Position the game at the limits starting from keyframe `numero`."""
+        numero = max(numero, 0)
+        # Continue from the current state when it lies between the keyframe
+        # and the target: every record in between still has to be applied
+        continuar = (self._keyframe >= numero and self._operaciones <= limite_operaciones
+                     and self._tiempo <= limite_tiempo)
+        if not continuar:
+            self._restaurar(numero)
+        self._avanzar(limite_operaciones, limite_tiempo)
+        return self.juego
+
+    def buscar_operacion(self, operaciones):
+        """
+        Seek to the state after the first `operaciones` operations.
+
+        Returns:
+            JuegoTetris: The replay's game at that point
+        """
+        numero = bisect.bisect_right(self._ops_keyframe, operaciones) - 1
+        return self._buscar(numero, operaciones, 0xFFFFFFFF)
+
+    def buscar_tiempo(self, milisegundos):
+        """
+        Seek to the state at a time of the recording.
+
+        Returns:
+            JuegoTetris: The replay's game after every operation recorded
+                up to that time
+        """
+        numero = bisect.bisect_right(self._tiempos_keyframe, milisegundos) - 1
+        return self._buscar(numero, 1 << 64, milisegundos)
+
+def leer_archivo(ruta):
+    """
+    Open a recorded replay.
+
+    Args:
+        ruta (str): Path written by GrabadorRepeticion
+
+    Returns:
+        Repeticion: Seekable replay
+    """
+    with open(ruta, "rb") as archivo:
+        return Repeticion(archivo.read())
+
+# ========================================
+# SEEK LATENCY BENCHMARK
+# ========================================
+
+def sesion_sintetica(horas, semilla=0, piezas_por_keyframe=PIEZAS_POR_KEYFRAME):
+    """
+    Record a long session played by the search bot, on a simulated clock.
+
+    The bot places every piece with tetris_search.buscar_jugada() and sends
+    the rotations, moves and hard drop as separate inputs 0.1-0.4 s apart,
+    while gravity ticks every INTERVALO_CAIDA ms; lost games are restarted.
+
+    Args:
+        horas (float): Simulated session length
+        semilla (int): Seed for the pieces and the input timing
+        piezas_por_keyframe (int): Locked pieces between two keyframes
+
+    Returns:
+        bytes: The recorded replay
+    """
+    import tetris_search  # Placement bot
+    ahora = 0.0
+    destino = io.BytesIO()
+    grabador = GrabadorRepeticion(destino, piezas_por_keyframe, reloj=lambda: ahora)
+    juego = JuegoTetris(semilla)
+    generador = random.Random(semilla)
+    grabador.keyframe(juego)
+
+    def planear():
+        """Inputs that place the active piece where the bot wants it."""
+        _, jugada = tetris_search.buscar_jugada(juego)
+        rotaciones, columna = jugada or (0, juego.pieza_actual.x)
+        desplazamiento = columna - juego.pieza_actual.x
+        return (["rotar"] * rotaciones
+                + ["derecha" if desplazamiento > 0 else "izquierda"] * abs(desplazamiento)
+                + ["caida"])
+
+    plan = planear()
+    intervalo_caida = INTERVALO_CAIDA / 1000.0
+    siguiente_caida = intervalo_caida
+    siguiente_entrada = generador.uniform(0.1, 0.4)
+    while ahora < horas * 3600:
+        piezas = juego.piezas
+        if siguiente_caida <= siguiente_entrada:
+            ahora = siguiente_caida
+            siguiente_caida += intervalo_caida
+            juego.caer()
+            grabador.operacion(juego, "caer")
+        else:
+            ahora = siguiente_entrada
+            siguiente_entrada += generador.uniform(0.1, 0.4)
+            comando = plan.pop(0) if plan else "caida"
+            if COMANDOS[comando](juego):
+                grabador.operacion(juego, comando)
+
+        if juego.terminado:
+            juego.reiniciar()
+            grabador.keyframe(juego)
+        if juego.piezas != piezas:
+            plan = planear()
+
+    grabador.escribir_indice()
+    return destino.getvalue()
+
+def benchmark(horas=3, busquedas=500, semilla=0, piezas_por_keyframe=PIEZAS_POR_KEYFRAME):
+    """
+    Measure random seek latency on a synthetic multi-hour replay.
+
+    A few seeks are also done the slow way (from the first keyframe,
+    simulating everything) to show the difference and to check that both
+    reach the same state.
+
+    Args:
+        horas (float): Simulated session length
+        busquedas (int): Number of random seeks timed
+        semilla (int): Seed of the session and of the seek targets
+        piezas_por_keyframe (int): Locked pieces between two keyframes
+
+    Returns:
+        dict: Replay size and seek latency percentiles in milliseconds
+    """
+    inicio = time.perf_counter()
+    datos = sesion_sintetica(horas, semilla, piezas_por_keyframe)
+    grabacion_s = time.perf_counter() - inicio
+    repeticion = Repeticion(datos)
+    duracion = repeticion.duracion
+    generador = random.Random(semilla)
+
+    latencias = []
+    for _ in range(busquedas):
+        objetivo = generador.randrange(duracion + 1)
+        inicio = time.perf_counter()
+        repeticion.buscar_tiempo(objetivo)
+        latencias.append(time.perf_counter() - inicio)
+
+    # Reference: simulate from the start of the session
+    completas = []
+    coincide = True
+    for _ in range(3):
+        objetivo = generador.randrange(duracion + 1)
+        rapida = repeticion.buscar_tiempo(objetivo)
+        estado = (rapida.clave(), rapida.lineas, rapida.piezas)
+        inicio = time.perf_counter()
+        repeticion._restaurar(0)
+        lenta = repeticion._buscar(0, 1 << 64, objetivo)
+        completas.append(time.perf_counter() - inicio)
+        coincide = coincide and estado == (lenta.clave(), lenta.lineas, lenta.piezas)
+
+    return {
+        "horas": duracion / 3600000,
+        "bytes": len(datos),
+        "keyframes": len(repeticion._posiciones_keyframe),
+        "piezas_por_keyframe": piezas_por_keyframe,
+        "grabacion_s": grabacion_s,
+        "busquedas": busquedas,
+        "busqueda_p50_ms": percentil(latencias, 0.50) * 1000,
+        "busqueda_p99_ms": percentil(latencias, 0.99) * 1000,
+        "busqueda_max_ms": max(latencias) * 1000,
+        "desde_inicio_media_ms": sum(completas) / len(completas) * 1000,
+        "coincide": coincide,
+    }
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Inspect keyframed Tetris replays")
+    parser.add_argument("replay", nargs="?", help="replay file written by tetris.py --replay")
+    parser.add_argument("--seek", type=int, default=None, metavar="MS",
+                        help="print the game state at this time of the replay")
+    parser.add_argument("--bench", action="store_true", help="measure seek latency on a synthetic session")
+    parser.add_argument("--hours", type=float, default=3, help="length of the synthetic session")
+    parser.add_argument("--seeks", type=int, default=500, help="number of timed seeks")
+    parser.add_argument("--keyframe-pieces", type=int, default=PIEZAS_POR_KEYFRAME,
+                        help="locked pieces between two keyframes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic session")
+    opciones = parser.parse_args()
+
+    if opciones.bench:
+        print(json.dumps(benchmark(opciones.hours, opciones.seeks, opciones.seed,
+                                   opciones.keyframe_pieces), indent=2))
+    elif opciones.replay:
+        repeticion = leer_archivo(opciones.replay)
+        milisegundos = repeticion.duracion if opciones.seek is None else opciones.seek
+        juego = repeticion.buscar_tiempo(milisegundos)
+        print(json.dumps({
+            "tiempo_ms": milisegundos,
+            "duracion_ms": repeticion.duracion,
+            "lineas": juego.lineas,
+            "puntuacion": juego.puntuacion,
+            "piezas": juego.piezas,
+            "terminado": juego.terminado,
+            "tablero": ["".join(str(celda) if celda else "." for celda in fila)
+                        for fila in juego.tablero.tolist()],
+        }, indent=2))
+    else:
+        parser.print_help()
@@ -0,0 +1,256 @@
+"""
+========================================
+TETRIS LOOK-AHEAD SEARCH
+========================================
+
+This file implements a small placement search for Tetris bots:
+- Heuristic board evaluation (heights, holes, bumpiness, lines)
+- Enumeration of every placement (rotation + column) of the active piece
+- Depth-limited look-ahead using JuegoTetris.snapshot()/restore()
+- A bounded LRU transposition table keyed by the engine's Zobrist hash
+
+Different move orders often reach the same board, and so do symmetric
+rotations (an O piece looks the same in all four). The transposition table
+caches the evaluation and best move of every state already searched, so
+deeper searches fit inside a frame budget.
+
+Author: Game Implementation
+Purpose: Fast autoplayer / hint engine on top of the Tetris rules
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import collections  # OrderedDict for the LRU transposition table
+import numpy as np  # Vectorized board features
+from tetris import VACIO
+
+# ========================================
+# EVALUATION WEIGHTS
+# ========================================
+
+# Default heuristic weights (negative = penalty)
+PESOS_POR_DEFECTO = {
+    "altura": -0.51,         # Sum of column heights
+    "lineas": 0.76,          # Lines cleared by the placement
+    "huecos": -0.36,         # Empty cells below a filled cell
+    "irregularidad": -0.18,  # Sum of height differences of adjacent columns
+}
+
+# Value of a state where the game is over
+VALOR_DERROTA = -1e9
+
+# ========================================
+# BOARD EVALUATION
+# ========================================
+
+def caracteristicas(tablero):
+    """
+    Compute the heuristic features of a board in one vectorized pass.
+
+    Args:
+        tablero (numpy.ndarray): uint8 board plane
+
+    Returns:
+        tuple: (altura, huecos, irregularidad) as ints
+    """
+    ocupadas = tablero != VACIO
+    alto = tablero.shape[0]
+    # Height of a column = rows from its highest filled cell to the bottom
+    tiene_bloques = ocupadas.any(axis=0)
+    alturas = np.where(tiene_bloques, alto - ocupadas.argmax(axis=0), 0)
+    # Holes = empty cells under the top of their column
+    huecos = int(alturas.sum() - ocupadas.sum())
+    irregularidad = int(np.abs(np.diff(alturas)).sum())
+    return int(alturas.sum()), huecos, irregularidad
+
+def evaluar_tablero(tablero, lineas, pesos=PESOS_POR_DEFECTO):
+    """
+    Score a board after a placement (higher is better).
+
+    Args:
+        tablero (numpy.ndarray): uint8 board plane
+        lineas (int): Lines cleared by the placement
+        pesos (dict): Weights for "altura", "lineas", "huecos", "irregularidad"
+
+    Returns:
+        float: Heuristic value of the board
+    """
+    altura, huecos, irregularidad = caracteristicas(tablero)
+    return (pesos["altura"] * altura
+            + pesos["lineas"] * lineas
+            + pesos["huecos"] * huecos
+            + pesos["irregularidad"] * irregularidad)
+
+# ========================================
+# TRANSPOSITION TABLE
+# ========================================
+
+class TablaTransposicion:
+    """
+    Bounded LRU cache of search results keyed by clave_busqueda().
+
+    Games with different seeds can share a table: the key covers the
+    piece generator as well as the board. Each entry stores (profundidad, valor, jugada). A lookup only hits when
+    the stored result was searched at least as deep as requested; the least
+    recently used entry is evicted when the table is full.
+    """
+
+    def __init__(self, capacidad=1 << 16):
+        """
+        Initialize an empty table.
+
+        Args:
+            capacidad (int): Maximum number of entries kept
+        """
+        self.capacidad = capacidad
+        self._entradas = collections.OrderedDict()
+        self.aciertos = 0      # Lookups answered from the table
+        self.fallos = 0        # Lookups that had to search
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def buscar(self, clave, profundidad):
+        """
+        Look up a state.
+
+        Args:
+            clave: Key built by clave_busqueda()
+            profundidad (int): Minimum search depth required
+
+        Returns:
+            tuple: (valor, jugada) or None if not cached deep enough
+        """
+        entrada = self._entradas.get(clave)
+        if entrada is None or entrada[0] < profundidad:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[1], entrada[2]
+
+    def guardar(self, clave, profundidad, valor, jugada):
+        """
+        Store a search result, evicting the least recently used entry.
+
+        Args:
+            clave: Key built by clave_busqueda()
+            profundidad (int): Depth the state was searched to
+            valor (float): Best value found
+            jugada (tuple): Best (rotaciones, columna), or None
+        """
+        self._entradas[clave] = (profundidad, valor, jugada)
+        self._entradas.move_to_end(clave)
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+
+    def limpiar(self):
+        """Drop every entry and reset the statistics."""
+        self._entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+def clave_busqueda(juego):
+    """
+    Transposition key of a game state.
+
+    The search looks ahead through the pieces the game's generator will
+    draw, so the same board with a different generator state (another
+    seed, or the same seed after more draws) must not share an entry.
+
+    Returns:
+        tuple: (Zobrist key of board and piece, hash of the generator state)
+    """
+    return (juego.clave(), hash(juego.generador.getstate()))
+
+# ========================================
+# PLACEMENT ENUMERATION
+# ========================================
+
+def aplicar_jugada(juego, jugada):
+    """
+    Play a placement: rotate, shift to the column and hard drop.
+
+    Args:
+        juego (JuegoTetris): Game to modify
+        jugada (tuple): (rotaciones, columna) target placement
+
+    Returns:
+        int: Lines cleared, or None if the placement is not reachable
+    """
+    rotaciones, columna = jugada
+    for _ in range(rotaciones):
+        if not juego.rotar():
+            return None
+    paso = 1 if columna > juego.pieza_actual.x else -1
+    while juego.pieza_actual.x != columna:
+        if not juego.mover(paso):
+            return None
+    return juego.caida_libre()
+
+def jugadas_posibles(juego):
+    """
+    List every (rotaciones, columna) placement for the active piece.
+
+    Unreachable placements are filtered later by aplicar_jugada().
+
+    Returns:
+        list: Candidate placements
+    """
+    ancho = juego.tablero.shape[1]
+    return [(rotaciones, columna) for rotaciones in range(4) for columna in range(ancho)]
+
+# ========================================
+# LOOK-AHEAD SEARCH
+# ========================================
+
+def buscar_jugada(juego, profundidad=1, tabla=None, pesos=PESOS_POR_DEFECTO):
+    """
+    Find the best placement of the active piece.
+
+    Every placement is played on the engine and undone with restore().
+    With profundidad > 1 the following pieces (from the game's own seeded
+    generator) are searched too. The game state is left unchanged.
+
+    Args:
+        juego (JuegoTetris): Game to search from
+        profundidad (int): Number of pieces to look ahead (>= 1)
+        tabla (TablaTransposicion): Optional transposition table
+        pesos (dict): Evaluation weights
+
+    Returns:
+        tuple: (valor, jugada) with the best value and (rotaciones, columna)
+    """
+    if tabla is not None:
+        clave = clave_busqueda(juego)
+        guardado = tabla.buscar(clave, profundidad)
+        if guardado is not None:
+            return guardado
+
+    origen = juego.snapshot()
+    mejor_valor, mejor_jugada = VALOR_DERROTA, None
+
+    # Hypothetical moves must not reach recorders or streams attached to
+    # the game, so its hooks are detached while searching
+    oyentes, juego.oyentes = juego.oyentes, []
+    try:
+        for jugada in jugadas_posibles(juego):
+            lineas = aplicar_jugada(juego, jugada)
+            if lineas is not None:
+                if juego.terminado:
+                    valor = VALOR_DERROTA
+                else:
+                    valor = evaluar_tablero(juego.tablero, lineas, pesos)
+                    if profundidad > 1:
+                        valor += buscar_jugada(juego, profundidad - 1, tabla, pesos)[0]
+                if valor > mejor_valor:
+                    mejor_valor, mejor_jugada = valor, jugada
+            juego.restore(origen)
+    finally:
+        juego.oyentes = oyentes
+
+    if tabla is not None:
+        tabla.guardar(clave, profundidad, mejor_valor, mejor_jugada)
+    return mejor_valor, mejor_jugada
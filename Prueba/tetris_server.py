@@ -0,0 +1,350 @@
+"""
+========================================
+HEADLESS ASYNCIO TETRIS SERVER
+========================================
+
+This file hosts many Tetris sessions in one process without threads:
+- Every client connection gets its own JuegoTetris session
+- Each session's gravity is an asyncio task ticking every INTERVALO_CAIDA
+  milliseconds (scheduled on absolute deadlines, so it does not drift)
+- Clients talk over a Unix socket or a TCP socket bound to localhost
+
+Protocol (one JSON object per line in both directions):
+- Client -> server: {"accion": "izquierda" | "derecha" | "abajo" | "rotar"
+  | "caida" | "reiniciar" | "estado" | "stats"}
+- Server -> client: the session state after every change:
+  {"tablero": "<rows*cols digits>", "pieza": [tipo, rotacion, x, y],
+   "lineas": n, "puntuacion": n, "piezas": n, "terminado": bool}
+  or, for "stats", the server load report (see Servidor.estadisticas()),
+  or {"error": "..."} for a malformed message or an unknown action.
+  A line longer than the stream limit (64 KiB) is answered with an error
+  and the connection is closed, since the rest of it cannot be framed.
+
+A client that does not read its socket does not make the server buffer
+without bound: gravity updates are skipped while more than
+LIMITE_ESCRITURA bytes wait to be sent to it (every update carries the
+whole state, so the next one sent replaces the skipped ones).
+
+The server measures how late every gravity tick fires (tick latency) and
+how much CPU it burns, and reports sessions per busy core.
+
+Usage:
+    python tetris_server.py --unix /tmp/tetris.sock
+    python tetris_server.py --port 7777
+    python tetris_server.py --bench 500 --seconds 10 --interval 50
+
+Author: Game Implementation
+Purpose: Run many headless games (bots, remote cabinets) in one process
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse      # Command line options
+import asyncio       # Event loop, sockets and per-session tasks
+import json          # Line protocol encoding
+import os            # CPU count and socket cleanup
+import random        # Random actions for the load harness
+import tempfile      # Socket path for the load harness
+import time          # CPU time measurement
+from input_latency import percentil
+from tetris import COMANDOS, INTERVALO_CAIDA, JuegoTetris
+
+# ========================================
+# SERVER CONFIGURATION CONSTANTS
+# ========================================
+
+MUESTRAS_LATENCIA = 10000   # Tick latency samples kept for percentiles
+COLA_CONEXIONES = 4096      # Listen backlog (many clients may connect at once)
+LIMITE_ESCRITURA = 64 * 1024   # Unsent bytes above which gravity updates are skipped
+
+# Client action name -> handler on the game: the player moves of the game
+# (tetris.COMANDOS, hard drop included) plus restart
+ACCIONES = dict(COMANDOS, reiniciar=lambda juego: juego.reiniciar())
+
+# ========================================
+# HELPER FUNCTIONS
+# ========================================
+
+def estado_juego(juego):
+    """
+    Build the protocol representation of a game.
+
+    Returns:
+        dict: JSON-serializable session state
+    """
+    pieza = juego.pieza_actual
+    return {
+        "tablero": "".join(map(str, juego.tablero.ravel().tolist())),
+        "pieza": [pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y],
+        "lineas": juego.lineas,
+        "puntuacion": juego.puntuacion,
+        "piezas": juego.piezas,
+        "terminado": juego.terminado,
+    }
+
+# ========================================
+# SESSION CLASS
+# ========================================
+
+class Sesion:
+    """
+    One game hosted by the server, bound to one client connection.
+    """
+
+    def __init__(self, servidor, escritor, semilla=None):
+        """
+        Initialize the session.
+
+        Args:
+            servidor (Servidor): Owning server (for metrics)
+            escritor (asyncio.StreamWriter): Connection to the client
+            semilla (int): Seed of the game's piece generator
+        """
+        self.servidor = servidor
+        self.escritor = escritor
+        self.juego = JuegoTetris(semilla)
+        self.tarea_gravedad = None
+
+    def enviar(self, mensaje):
+        """Queue one JSON line for the client (never blocks the loop)."""
+        if not self.escritor.is_closing():
+            self.escritor.write(json.dumps(mensaje).encode() + b"\n")
+
+    async def gravedad(self):
+        """
+        Gravity task: one automatic fall every intervalo_caida milliseconds.
+
+        Deadlines are absolute (start + k * interval), so a late tick does
+        not push back the following ones; the lateness of every tick is
+        recorded as tick latency.
+        """
+        bucle = asyncio.get_running_loop()
+        intervalo = self.servidor.intervalo_caida / 1000.0
+        siguiente = bucle.time() + intervalo
+        while True:
+            await asyncio.sleep(max(0.0, siguiente - bucle.time()))
+            self.servidor.registrar_tick(bucle.time() - siguiente)
+            siguiente += intervalo
+            if not self.juego.terminado:
+                self.juego.caer()
+                # Slow reader: skip this update instead of queueing it
+                if self.escritor.transport.get_write_buffer_size() > LIMITE_ESCRITURA:
+                    self.servidor.descartados += 1
+                else:
+                    self.enviar(estado_juego(self.juego))
+
+    def accion(self, nombre):
+        """
+        Apply one client action and answer with the new state.
+
+        Args:
+            nombre (str): Action name (see ACCIONES), "estado" or "stats";
+                anything else is answered with an error
+        """
+        if nombre == "stats":
+            self.enviar(self.servidor.estadisticas())
+            return
+        if not isinstance(nombre, str) or (nombre not in ACCIONES and nombre != "estado"):
+            self.enviar({"error": "unknown action"})
+            return
+        manejador = ACCIONES.get(nombre)
+        if manejador is not None and (not self.juego.terminado or nombre == "reiniciar"):
+            manejador(self.juego)
+        self.enviar(estado_juego(self.juego))
+
+# ========================================
+# SERVER CLASS
+# ========================================
+
+class Servidor:
+    """
+    Asyncio server hosting one Sesion per connected client.
+    """
+
+    def __init__(self, intervalo_caida=INTERVALO_CAIDA):
+        """
+        Initialize the server.
+
+        Args:
+            intervalo_caida (int): Gravity interval of every session (ms)
+        """
+        self.intervalo_caida = intervalo_caida
+        self.sesiones = set()
+        self.sesiones_max = 0          # Peak number of concurrent sessions
+        self.latencias = []            # Recent tick latencies (seconds)
+        self.ticks = 0                 # Total gravity ticks served
+        self.descartados = 0           # Gravity updates skipped for slow readers
+        self._inicio_cpu = time.process_time()
+        self._inicio_reloj = time.perf_counter()
+        self._servidor = None
+
+    def registrar_tick(self, latencia):
+        """Record how late one gravity tick fired."""
+        self.ticks += 1
+        self.latencias.append(latencia)
+        if len(self.latencias) > MUESTRAS_LATENCIA:
+            del self.latencias[:len(self.latencias) - MUESTRAS_LATENCIA]
+
+    def estadisticas(self):
+        """
+        Build the load report.
+
+        Returns:
+            dict: Sessions (current and peak), ticks, updates skipped for
+                slow readers, tick latency percentiles (ms), CPU cores busy
+                and peak sessions per busy core
+        """
+        reloj = time.perf_counter() - self._inicio_reloj
+        nucleos = (time.process_time() - self._inicio_cpu) / reloj if reloj > 0 else 0.0
+        return {
+            "sesiones": len(self.sesiones),
+            "sesiones_max": self.sesiones_max,
+            "ticks": self.ticks,
+            "estados_descartados": self.descartados,
+            "latencia_p50_ms": percentil(self.latencias, 0.50) * 1000,
+            "latencia_p99_ms": percentil(self.latencias, 0.99) * 1000,
+            "latencia_max_ms": max(self.latencias, default=0.0) * 1000,
+            "nucleos_ocupados": nucleos,
+            "sesiones_por_nucleo": self.sesiones_max / nucleos if nucleos > 0 else None,
+            "nucleos_disponibles": os.cpu_count(),
+        }
+
+    async def atender(self, lector, escritor):
+        """Connection handler: run a session until the client disconnects."""
+        sesion = Sesion(self, escritor)
+        self.sesiones.add(sesion)
+        self.sesiones_max = max(self.sesiones_max, len(self.sesiones))
+        sesion.tarea_gravedad = asyncio.create_task(sesion.gravedad())
+        sesion.enviar(estado_juego(sesion.juego))
+        try:
+            async for linea in lector:
+                try:
+                    sesion.accion(json.loads(linea).get("accion"))
+                except (ValueError, AttributeError):
+                    sesion.enviar({"error": "invalid message"})
+                await escritor.drain()
+        except ValueError:
+            # Line over the stream limit (LimitOverrunError is wrapped in
+            # ValueError): answer and drop the client
+            sesion.enviar({"error": "message too long"})
+            try:
+                await escritor.drain()
+            except (ConnectionError, OSError):
+                pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            sesion.tarea_gravedad.cancel()
+            self.sesiones.discard(sesion)
+            escritor.close()
+
+    async def iniciar(self, ruta_unix=None, puerto=None):
+        """
+        Start listening on a Unix socket or on a localhost TCP port.
+
+        Args:
+            ruta_unix (str): Unix socket path (takes precedence)
+            puerto (int): TCP port on 127.0.0.1
+        """
+        if ruta_unix:
+            if os.path.exists(ruta_unix):
+                os.unlink(ruta_unix)
+            self._servidor = await asyncio.start_unix_server(
+                self.atender, path=ruta_unix, backlog=COLA_CONEXIONES)
+        else:
+            self._servidor = await asyncio.start_server(
+                self.atender, "127.0.0.1", puerto, backlog=COLA_CONEXIONES)
+        self._inicio_cpu = time.process_time()
+        self._inicio_reloj = time.perf_counter()
+
+    async def servir(self):
+        """Serve until cancelled."""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def cerrar(self):
+        """Stop accepting clients and end every session."""
+        self._servidor.close()
+        for sesion in list(self.sesiones):
+            sesion.tarea_gravedad.cancel()
+            sesion.escritor.close()
+        await self._servidor.wait_closed()
+
+# ========================================
+# LOCAL LOAD HARNESS
+# ========================================
+
+async def cliente_prueba(ruta_unix, duracion, acciones_por_segundo, semilla):
+    """
+    Local test client: send random actions and consume state updates.
+
+    Returns:
+        int: Number of state messages received
+    """
+    generador = random.Random(semilla)
+    lector, escritor = await asyncio.open_unix_connection(ruta_unix)
+    recibidos = 0
+
+    async def leer():
+        nonlocal recibidos
+        async for _ in lector:
+            recibidos += 1
+
+    tarea_lectura = asyncio.create_task(leer())
+    fin = asyncio.get_running_loop().time() + duracion
+    while asyncio.get_running_loop().time() < fin:
+        accion = generador.choice(list(ACCIONES))
+        escritor.write(json.dumps({"accion": accion}).encode() + b"\n")
+        await escritor.drain()
+        await asyncio.sleep(1.0 / acciones_por_segundo)
+
+    # Graceful shutdown: the server ends the session on EOF and closes its
+    # side, which in turn ends our reader
+    escritor.write_eof()
+    await tarea_lectura
+    escritor.close()
+    return recibidos
+
+async def prueba_carga(sesiones, duracion, intervalo_caida, acciones_por_segundo=5):
+    """
+    Run the server and `sesiones` local clients in one event loop.
+
+    Returns:
+        dict: The server load report at the end of the run
+    """
+    ruta = os.path.join(tempfile.mkdtemp(), "tetris.sock")
+    servidor = Servidor(intervalo_caida)
+    await servidor.iniciar(ruta_unix=ruta)
+    clientes = [cliente_prueba(ruta, duracion, acciones_por_segundo, semilla)
+                for semilla in range(sesiones)]
+    mensajes = await asyncio.gather(*clientes)
+    informe = servidor.estadisticas()
+    informe["mensajes_recibidos"] = sum(mensajes)
+    await servidor.cerrar()
+    os.unlink(ruta)
+    return informe
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Headless Tetris session server")
+    parser.add_argument("--unix", help="Unix socket path to listen on")
+    parser.add_argument("--port", type=int, default=7777, help="localhost TCP port (if no --unix)")
+    parser.add_argument("--interval", type=int, default=INTERVALO_CAIDA, help="gravity interval in ms")
+    parser.add_argument("--bench", type=int, metavar="N", help="run a load test with N local clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="load test duration")
+    opciones = parser.parse_args()
+
+    if opciones.bench:
+        informe = asyncio.run(prueba_carga(opciones.bench, opciones.seconds, opciones.interval))
+        print(json.dumps(informe, indent=2))
+    else:
+        async def ejecutar():
+            servidor = Servidor(opciones.interval)
+            await servidor.iniciar(opciones.unix, opciones.port)
+            await servidor.servir()
+        asyncio.run(ejecutar())
@@ -0,0 +1,356 @@
+"""
+========================================
+TETRIS MULTI-BOARD SPECTATOR VIEW
+========================================
+
+This file shows a grid of many live Tetris games in one pygame window,
+for example a whole bot tournament on one monitor.
+
+Rendering stays cheap no matter how many games are shown:
+- Each game has its own cached offscreen tile surface
+- A tile is only redrawn (with dibujar_tablero() from tetris.py) when the
+  game's Zobrist key changes, i.e. the board or the active piece moved
+- Only the changed tiles are blitted and passed to display.update()
+
+Bots do not search inside their own avanzar(): a bot whose piece just
+spawned waits in a Planificador queue, and the window spends at most
+PRESUPUESTO_PLANIFICACION_MS per frame on those searches (at least one per
+frame, so every bot eventually moves). A burst of spawns is spread over
+a few frames instead of stalling one.
+
+Games are provided by "sources" with a small interface:
+- avanzar(ahora): advance to time `ahora` (ms), return nothing
+- clave(): value that changes whenever the visible state changes
+- tablero_visible(): uint8 board plane including the active piece
+BotEspectado plays live games and RepeticionEspectada plays back recorded
+replays (tetris_replay.py); other sources (network games) only need the
+same three methods.
+
+Usage:
+    python tetris_spectator.py --games 36 --block 6 --tick 50
+    python tetris_spectator.py --games 0 --replay a.ttrp --replay b.ttrp
+
+Author: Game Implementation
+Purpose: Watch many concurrent games without the renderer being the bottleneck
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse      # Command line options
+import collections   # Planning queue
+import math          # Grid layout
+import pygame        # Window, surfaces and frame pacing
+import sys           # Clean exit
+import time          # Millisecond clock and planning budget
+from tetris import (ANCHO_TABLERO, ALTO_TABLERO, NEGRO, JuegoTetris,
+                    dibujar_tablero, iniciar_pygame, tablero_con_pieza)
+from tetris_replay import leer_archivo
+from tetris_search import buscar_jugada
+
+# ========================================
+# SPECTATOR CONFIGURATION CONSTANTS
+# ========================================
+
+FPS_ESPECTADOR = 60     # Target frame rate of the spectator window
+MARGEN_TILE = 4         # Pixels between two boards
+PRESUPUESTO_PLANIFICACION_MS = 4    # Bot search time allowed per frame
+
+# ========================================
+# BOT PLANNING QUEUE
+# ========================================
+
+class Planificador:
+    """
+    Runs queued bot searches within a time budget per frame.
+    """
+
+    def __init__(self, presupuesto_ms=PRESUPUESTO_PLANIFICACION_MS):
+        """
+        Initialize an empty queue.
+
+        Args:
+            presupuesto_ms (float): Search time allowed per call to ejecutar()
+        """
+        self.presupuesto = presupuesto_ms / 1000.0
+        self.cola = collections.deque()     # Bots waiting for a plan
+
+    def pedir(self, bot):
+        """Queue a bot whose new piece needs a placement."""
+        self.cola.append(bot)
+
+    def ejecutar(self):
+        """
+        Plan queued bots until the budget is spent.
+
+        The first bot is always planned, so the queue drains even when a
+        single search takes longer than the whole budget.
+        """
+        inicio = time.perf_counter()
+        while self.cola:
+            self.cola.popleft()._planificar()
+            if time.perf_counter() - inicio >= self.presupuesto:
+                break
+
+# ========================================
+# BOT GAME SOURCE
+# ========================================
+
+class BotEspectado:
+    """
+    A live game played by the search bot, one action per tick.
+
+    When a piece spawns the bot picks its placement with buscar_jugada(),
+    then plays it out visibly: rotations, horizontal moves and one row of
+    gravity per tick. Finished games restart automatically.
+
+    With a Planificador the search runs when the queue reaches the bot and
+    the game holds still until then; without one it runs immediately.
+    """
+
+    def __init__(self, semilla, intervalo_ms=50, planificador=None):
+        """
+        Initialize the bot game.
+
+        Args:
+            semilla (int): Seed of the game's piece generator
+            intervalo_ms (int): Milliseconds between two bot actions
+            planificador (Planificador): Shared planning queue (optional)
+        """
+        self.juego = JuegoTetris(semilla)
+        self.intervalo_ms = intervalo_ms
+        self.planificador = planificador
+        self.siguiente_accion = 0       # Time of the next action (ms)
+        self.plan = None                # Pending actions (None: waiting for a plan)
+        self._pedir_plan()
+
+    def _pedir_plan(self):
+        """Get a plan for the new piece, now or through the queue."""
+        self.plan = None
+        if self.planificador is None:
+            self._planificar()
+        else:
+            self.planificador.pedir(self)
+
+    def _planificar(self):
+        """Choose the placement of the new piece and queue its actions."""
+        _, jugada = buscar_jugada(self.juego)
+        if jugada is None:
+            self.plan = []
+            return
+        rotaciones, columna = jugada
+        desplazamiento = columna - self.juego.pieza_actual.x
+        paso = "derecha" if desplazamiento > 0 else "izquierda"
+        self.plan = ["rotar"] * rotaciones + [paso] * abs(desplazamiento)
+
+    def avanzar(self, ahora):
+        """
+        Play every action due up to time `ahora`.
+
+        Args:
+            ahora (int): Current time in milliseconds
+        """
+        while self.siguiente_accion <= ahora:
+            if self.plan is None:
+                # Waiting in the planning queue: resume one tick after the plan
+                self.siguiente_accion = ahora + self.intervalo_ms
+                return
+            self.siguiente_accion += self.intervalo_ms
+            juego = self.juego
+            if self.plan:
+                accion = self.plan.pop(0)
+                if accion == "rotar":
+                    juego.rotar()
+                else:
+                    juego.mover(1 if accion == "derecha" else -1)
+            elif juego.caer():
+                if juego.terminado:
+                    juego.reiniciar()
+                self._pedir_plan()
+
+    def clave(self):
+        """Zobrist key of the board and active piece (changes on any move)."""
+        return self.juego.clave()
+
+    def tablero_visible(self):
+        """Board plane with the active piece stamped in."""
+        return tablero_con_pieza(self.juego.tablero, self.juego.pieza_actual)
+
+# ========================================
+# REPLAY GAME SOURCE
+# ========================================
+
+class RepeticionEspectada:
+    """
+    A recorded replay played back in real time, looping at the end.
+
+    Every frame seeks the replay to the elapsed time; seeking forward
+    continues from the current position, so playback only simulates the
+    operations recorded since the previous frame.
+    """
+
+    def __init__(self, repeticion, velocidad=1.0):
+        """
+        Initialize the playback.
+
+        Args:
+            repeticion (Repeticion): Replay from tetris_replay
+            velocidad (float): Playback speed (2.0 = twice as fast)
+        """
+        self.repeticion = repeticion
+        self.velocidad = velocidad
+        self.duracion = repeticion.duracion     # Replay length (ms)
+        self.inicio = None                      # Clock time of replay time 0
+        self.juego = repeticion.buscar_tiempo(0)
+
+    def avanzar(self, ahora):
+        """
+        Seek the replay to the time elapsed since playback started.
+
+        Args:
+            ahora (int): Current time in milliseconds
+        """
+        if self.inicio is None:
+            self.inicio = ahora
+        tiempo = (ahora - self.inicio) * self.velocidad
+        if tiempo > self.duracion:
+            self.inicio = ahora
+            tiempo = 0
+        self.juego = self.repeticion.buscar_tiempo(int(tiempo))
+
+    def clave(self):
+        """Zobrist key of the board and active piece at the current time."""
+        return self.juego.clave()
+
+    def tablero_visible(self):
+        """Board plane with the active piece stamped in."""
+        return tablero_con_pieza(self.juego.tablero, self.juego.pieza_actual)
+
+# ========================================
+# SPECTATOR WINDOW
+# ========================================
+
+class Espectador:
+    """
+    Grid of cached board tiles blitted into one window.
+    """
+
+    def __init__(self, fuentes, tamano_bloque=6, columnas=None, planificador=None):
+        """
+        Lay out the grid and create the window and tile surfaces.
+
+        Args:
+            fuentes (list): Game sources (see module docstring)
+            tamano_bloque (int): Pixel size of one board cell in a tile
+            columnas (int): Tiles per row (default: as square as possible)
+            planificador (Planificador): Planning queue of the bot sources,
+                run once per frame
+        """
+        self.fuentes = fuentes
+        self.planificador = planificador
+        self.columnas = columnas or math.ceil(math.sqrt(len(fuentes)))
+        filas = math.ceil(len(fuentes) / self.columnas)
+
+        # Tile geometry
+        self.tamano_tile = (ANCHO_TABLERO * tamano_bloque, ALTO_TABLERO * tamano_bloque)
+        ancho_ventana = self.columnas * (self.tamano_tile[0] + MARGEN_TILE) + MARGEN_TILE
+        alto_ventana = filas * (self.tamano_tile[1] + MARGEN_TILE) + MARGEN_TILE
+
+        self.pantalla = pygame.display.set_mode((ancho_ventana, alto_ventana))
+        pygame.display.set_caption("Tetris - Spectator")
+
+        # One cached offscreen surface and screen rect per game
+        self.tiles = [pygame.Surface(self.tamano_tile, 0, self.pantalla) for _ in fuentes]
+        self.rects = [pygame.Rect(self._posicion(i), self.tamano_tile) for i in range(len(fuentes))]
+        self.claves = [None] * len(fuentes)   # Last rendered key per game
+
+    def _posicion(self, indice):
+        """Top-left pixel of tile `indice` in the window."""
+        fila, columna = divmod(indice, self.columnas)
+        return (MARGEN_TILE + columna * (self.tamano_tile[0] + MARGEN_TILE),
+                MARGEN_TILE + fila * (self.tamano_tile[1] + MARGEN_TILE))
+
+    def actualizar(self, ahora):
+        """
+        Advance every game and redraw only the tiles that changed.
+
+        Args:
+            ahora (int): Current time in milliseconds
+
+        Returns:
+            list: Screen rects that were redrawn
+        """
+        if self.planificador is not None:
+            self.planificador.ejecutar()
+        sucios = []
+        for indice, fuente in enumerate(self.fuentes):
+            fuente.avanzar(ahora)
+            clave = fuente.clave()
+            if clave == self.claves[indice]:
+                continue
+            self.claves[indice] = clave
+            dibujar_tablero(self.tiles[indice], fuente.tablero_visible())
+            sucios.append(self.pantalla.blit(self.tiles[indice], self.rects[indice]))
+        return sucios
+
+    def redibujar_todo(self):
+        """Blit every cached tile (after the window was exposed)."""
+        self.pantalla.fill(NEGRO)
+        for tile, rect in zip(self.tiles, self.rects):
+            self.pantalla.blit(tile, rect)
+        pygame.display.flip()
+
+    def ejecutar(self):
+        """Run the spectator loop until the window is closed."""
+        reloj = pygame.time.Clock()
+        self.redibujar_todo()
+        ultimo_titulo = 0
+        ejecutando = True
+        while ejecutando:
+            for evento in pygame.event.get():
+                if evento.type == pygame.QUIT:
+                    ejecutando = False
+                elif evento.type in (pygame.VIDEOEXPOSE, pygame.WINDOWSHOWN):
+                    self.redibujar_todo()
+
+            # Milliseconds from perf_counter(): only the display is initialized,
+            # so there is no SDL timer behind pygame.time.get_ticks()
+            ahora = int(time.perf_counter() * 1000)
+            sucios = self.actualizar(ahora)
+            if sucios:
+                pygame.display.update(sucios)
+
+            # Show the real frame rate in the title once per second
+            if ahora - ultimo_titulo >= 1000:
+                ultimo_titulo = ahora
+                pygame.display.set_caption(
+                    f"Tetris - Spectator ({len(self.fuentes)} games, {reloj.get_fps():.0f} FPS)")
+
+            reloj.tick(FPS_ESPECTADOR)
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Watch many Tetris bot games at once")
+    parser.add_argument("--games", type=int, default=36, help="number of bot games shown")
+    parser.add_argument("--block", type=int, default=6, help="pixel size of a board cell")
+    parser.add_argument("--tick", type=int, default=50, help="milliseconds between bot actions")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--replay", action="append", default=[],
+                        help="recorded replay to show next to the bots (repeatable)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay playback speed")
+    opciones = parser.parse_args()
+
+    iniciar_pygame()
+    planificador = Planificador()
+    fuentes = [RepeticionEspectada(leer_archivo(ruta), opciones.speed) for ruta in opciones.replay]
+    fuentes += [BotEspectado(opciones.seed + i, opciones.tick, planificador)
+                for i in range(opciones.games)]
+    if not fuentes:
+        parser.error("nothing to show: use --games or --replay")
+    Espectador(fuentes, opciones.block, planificador=planificador).ejecutar()
+    pygame.quit()
+    sys.exit()
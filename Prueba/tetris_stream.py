@@ -0,0 +1,266 @@
+"""
+========================================
+DELTA-ENCODED BINARY BOARD STREAM
+========================================
+
+This file records Tetris games as a compact binary stream instead of
+full boards per frame. The encoder is attached to a JuegoTetris as a hook
+(see JuegoTetris.oyentes) and only writes what changed:
+- A keyframe (whole board + active piece) at the start, on every reset
+  and every INTERVALO_KEYFRAME records so a stream can be joined late
+- The active piece pose whenever it moves, rotates or spawns
+- The cells written by a lock and the rows cleared by it
+
+Stream layout (little endian):
+- Header: b"TTRS", version (u8), rows (u16), columns (u16)
+- Records: kind (u8), time in ms since the stream started (u32), payload
+  - KEYFRAME: rows*columns cell bytes, then a piece pose
+  - PIEZA: piece pose = type (u8), rotation (u8), x (i16), y (i16)
+  - CELDAS: count (u16), then count × (y (u16), x (u16), id (u8))
+  - LINEAS: count (u8), then count × row (u16), rows removed top-down
+
+The decoder rebuilds every frame from the stream; GrabadorArchivo is the
+file sink used for recording. tetris.py --record PATH records a game.
+
+Author: Game Implementation
+Purpose: Record hours of cabinet play and feed spectators cheaply
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import struct        # Binary record packing
+import time          # Record timestamps
+import numpy as np   # Board mirror and keyframes
+
+# ========================================
+# STREAM FORMAT CONSTANTS
+# ========================================
+
+MAGIA = b"TTRS"                 # File signature
+VERSION = 1                     # Format version
+INTERVALO_KEYFRAME = 500        # Records between two periodic keyframes
+
+# Record kinds
+KEYFRAME = 1
+PIEZA = 2
+CELDAS = 3
+LINEAS = 4
+
+# Binary layouts
+CABECERA = struct.Struct("<4sBHH")     # magic, version, rows, columns
+REGISTRO = struct.Struct("<BI")        # kind, time (ms)
+POSE = struct.Struct("<BBhh")          # type, rotation, x, y
+CONTADOR_CELDAS = struct.Struct("<H")
+CELDA = struct.Struct("<HHB")          # y, x, id
+CONTADOR_LINEAS = struct.Struct("<B")
+FILA = struct.Struct("<H")
+
+# ========================================
+# SINKS
+# ========================================
+
+class GrabadorArchivo:
+    """
+    Buffered file sink for the encoder (anything with write()/close()).
+    """
+
+    def __init__(self, ruta, tamano_buffer=1 << 16):
+        """
+        Open the output file.
+
+        Args:
+            ruta (str): Path of the recording
+            tamano_buffer (int): Bytes buffered before hitting the disk
+        """
+        self._archivo = open(ruta, "wb", buffering=tamano_buffer)
+
+    def write(self, datos):
+        """Append encoded bytes."""
+        self._archivo.write(datos)
+
+    def close(self):
+        """Flush and close the file."""
+        self._archivo.close()
+
+# ========================================
+# ENCODER
+# ========================================
+
+class CodificadorTablero:
+    """
+    Hook that turns JuegoTetris events into delta-encoded records.
+
+    Usage:
+        codificador = CodificadorTablero(GrabadorArchivo("game.ttrs"))
+        codificador.conectar(juego)
+    """
+
+    def __init__(self, destino, reloj=time.monotonic):
+        """
+        Initialize the encoder.
+
+        Args:
+            destino: Sink with a write(bytes) method (file, socket wrapper)
+            reloj: Function returning the current time in seconds
+        """
+        self.destino = destino
+        self.reloj = reloj
+        self._inicio = reloj()
+        self._registros = 0          # Records since the last keyframe
+        self._cabecera_escrita = False
+
+    def conectar(self, juego):
+        """
+        Attach to a game and write the first keyframe.
+
+        Args:
+            juego (JuegoTetris): Game to record
+        """
+        juego.oyentes.append(self)
+        self._keyframe(juego)
+
+    def desconectar(self, juego):
+        """Stop recording a game."""
+        juego.oyentes.remove(self)
+
+    def _tiempo(self):
+        """Milliseconds since the stream started."""
+        return int((self.reloj() - self._inicio) * 1000) & 0xFFFFFFFF
+
+    def _escribir(self, tipo, carga):
+        """Write one record."""
+        self.destino.write(REGISTRO.pack(tipo, self._tiempo()) + carga)
+        self._registros += 1
+
+    def _keyframe(self, juego):
+        """Write the whole board and piece (and the header the first time)."""
+        if not self._cabecera_escrita:
+            alto, ancho = juego.tablero.shape
+            self.destino.write(CABECERA.pack(MAGIA, VERSION, alto, ancho))
+            self._cabecera_escrita = True
+        self._escribir(KEYFRAME, juego.tablero.tobytes() + self._pose(juego))
+        self._registros = 0
+
+    @staticmethod
+    def _pose(juego):
+        """Pack the active piece pose."""
+        pieza = juego.pieza_actual
+        return POSE.pack(pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y)
+
+    def __call__(self, evento, juego, datos):
+        """
+        JuegoTetris hook: encode one event.
+
+        Args:
+            evento (str): "pieza", "fijacion" or "reinicio"
+            juego (JuegoTetris): Game that produced the event
+            datos: Event data (see JuegoTetris docstring)
+        """
+        if evento == "reinicio" or self._registros >= INTERVALO_KEYFRAME:
+            self._keyframe(juego)
+        elif evento == "pieza":
+            self._escribir(PIEZA, self._pose(juego))
+        elif evento == "fijacion":
+            celdas, filas = datos
+            carga = [CONTADOR_CELDAS.pack(len(celdas))]
+            carga.extend(CELDA.pack(y, x, valor) for y, x, valor in celdas)
+            self._escribir(CELDAS, b"".join(carga))
+            if filas:
+                carga = [CONTADOR_LINEAS.pack(len(filas))]
+                carga.extend(FILA.pack(fila) for fila in filas)
+                self._escribir(LINEAS, b"".join(carga))
+
+# ========================================
+# DECODER
+# ========================================
+
+class DecodificadorTablero:
+    """
+    Rebuilds frames from a stream produced by CodificadorTablero.
+
+    Attributes after each record:
+        tablero: uint8 board plane
+        pieza: (type, rotation, x, y) of the active piece
+        tiempo: Record time in milliseconds
+    """
+
+    def __init__(self, datos):
+        """
+        Parse the stream header.
+
+        Args:
+            datos: bytes-like object with the whole stream (a memoryview of
+                a mapped file works without copying)
+
+        Raises:
+            ValueError: If the data is not a board stream
+        """
+        self._datos = memoryview(datos)
+        magia, version, alto, ancho = CABECERA.unpack_from(self._datos, 0)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError("not a Tetris board stream")
+        self.alto, self.ancho = alto, ancho
+        self._posicion = CABECERA.size
+        self.tablero = np.zeros((alto, ancho), dtype=np.uint8)
+        self.pieza = None
+        self.tiempo = 0
+
+    def __iter__(self):
+        """
+        Apply the records one by one.
+
+        Yields:
+            tuple: (kind, time, tablero, pieza) after each record; the board
+                is updated in place, copy it to keep a frame
+        """
+        datos = self._datos
+        tamano_tablero = self.alto * self.ancho
+        while self._posicion < len(datos):
+            tipo, self.tiempo = REGISTRO.unpack_from(datos, self._posicion)
+            posicion = self._posicion + REGISTRO.size
+
+            if tipo == KEYFRAME:
+                celdas = np.frombuffer(datos, np.uint8, tamano_tablero, posicion)
+                self.tablero[:] = celdas.reshape(self.alto, self.ancho)
+                posicion += tamano_tablero
+                self.pieza = POSE.unpack_from(datos, posicion)
+                posicion += POSE.size
+            elif tipo == PIEZA:
+                self.pieza = POSE.unpack_from(datos, posicion)
+                posicion += POSE.size
+            elif tipo == CELDAS:
+                (cantidad,) = CONTADOR_CELDAS.unpack_from(datos, posicion)
+                posicion += CONTADOR_CELDAS.size
+                for _ in range(cantidad):
+                    y, x, valor = CELDA.unpack_from(datos, posicion)
+                    self.tablero[y, x] = valor
+                    posicion += CELDA.size
+            elif tipo == LINEAS:
+                (cantidad,) = CONTADOR_LINEAS.unpack_from(datos, posicion)
+                posicion += CONTADOR_LINEAS.size
+                filas = [FILA.unpack_from(datos, posicion + i * FILA.size)[0] for i in range(cantidad)]
+                posicion += cantidad * FILA.size
+                # Same shift as fijar_pieza(): keep the other rows in order
+                restantes = np.delete(self.tablero, filas, axis=0)
+                self.tablero[cantidad:] = restantes
+                self.tablero[:cantidad] = 0
+            else:
+                raise ValueError(f"unknown record kind {tipo} at byte {self._posicion}")
+
+            self._posicion = posicion
+            yield tipo, self.tiempo, self.tablero, self.pieza
+
+def leer_archivo(ruta):
+    """
+    Decode a recorded file.
+
+    Args:
+        ruta (str): Path written by GrabadorArchivo
+
+    Returns:
+        DecodificadorTablero: Iterable over the recorded records
+    """
+    with open(ruta, "rb") as archivo:
+        return DecodificadorTablero(archivo.read())
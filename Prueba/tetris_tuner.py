@@ -0,0 +1,302 @@
+"""
+========================================
+TETRIS BOT WEIGHT TUNER
+========================================
+
+This file searches the heuristic weights of the placement search in
+tetris_search.py (heights, holes, bumpiness, lines, see PESOS_POR_DEFECTO)
+by letting the bot play:
+
+- Population-based optimizer (cross-entropy method): each generation
+  samples candidate weight vectors from a Gaussian, plays them and moves
+  the Gaussian towards the best ones (the elite)
+- Fitness = mean lines cleared over seeded games played by buscar_jugada()
+  on the real engine, so every board is built by fijar_pieza(). All
+  candidates of a generation play the same seeds, so they are compared on
+  the same piece sequences
+- Games run on a process pool (one worker per core by default)
+- Early termination (racing): games are played in rounds; after each round
+  the candidates whose mean is below CORTE_CARRERA times the current elite
+  cutoff stop playing
+- A JSON checkpoint is written after every generation; running again with
+  the same --checkpoint resumes where the previous run stopped. The
+  checkpoint records the search settings (seed, population, games, round
+  games, max pieces) and resuming with different ones is refused
+
+Weights are compared by direction only (every feature is scaled by the same
+weight vector), so each candidate is normalized to unit length.
+
+Usage:
+    python tetris_tuner.py --generations 20 --checkpoint tuner.json
+    python tetris_tuner.py --generations 40 --checkpoint tuner.json   (resumes)
+
+Author: Game Implementation
+Purpose: Tune bot weights on every core instead of days of hand tuning
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse                  # Command line options
+import concurrent.futures        # Process pool for the games
+import json                      # Checkpoints and results
+import math                      # Vector norms
+import os                        # Core count and atomic checkpoint writes
+import random                    # Candidate sampling and game seeds
+import time                      # Generation timings
+from tetris import JuegoTetris
+from tetris_search import PESOS_POR_DEFECTO, aplicar_jugada, buscar_jugada
+
+# ========================================
+# TUNER CONFIGURATION CONSTANTS
+# ========================================
+
+NOMBRES_PESOS = tuple(PESOS_POR_DEFECTO)   # Order of the weight vector
+POBLACION = 24             # Candidates per generation
+FRACCION_ELITE = 0.25      # Share of the population that updates the Gaussian
+PARTIDAS = 12              # Seeded games per candidate
+PARTIDAS_POR_RONDA = 3     # Games played between two early-termination checks
+PIEZAS_MAXIMAS = 400       # Pieces per game (good weights would never lose)
+CORTE_CARRERA = 0.5        # Stop candidates below this fraction of the elite cutoff
+DESVIACION_INICIAL = 0.5   # Initial standard deviation of every weight
+DESVIACION_MINIMA = 0.02   # Noise floor, keeps the search from collapsing
+
+# ========================================
+# GAME EVALUATION (WORKER PROCESSES)
+# ========================================
+
+def jugar_partida(pesos, semilla, piezas_maximas=PIEZAS_MAXIMAS):
+    """
+    Play one seeded game with the look-ahead bot.
+
+    Runs in the worker processes, so it only takes picklable arguments.
+
+    Args:
+        pesos (dict): Evaluation weights for buscar_jugada()
+        semilla (int): Piece generator seed
+        piezas_maximas (int): Pieces after which the game is stopped
+
+    Returns:
+        int: Lines cleared
+    """
+    juego = JuegoTetris(semilla)
+    while not juego.terminado and juego.piezas < piezas_maximas:
+        _, jugada = buscar_jugada(juego, pesos=pesos)
+        if jugada is None or aplicar_jugada(juego, jugada) is None:
+            break
+    return juego.lineas
+
+# ========================================
+# WEIGHT VECTORS
+# ========================================
+
+def normalizar(vector):
+    """Scale a weight vector to unit length."""
+    norma = math.sqrt(sum(valor * valor for valor in vector)) or 1.0
+    return [valor / norma for valor in vector]
+
+def a_pesos(vector):
+    """Weight vector -> dict accepted by buscar_jugada()."""
+    return dict(zip(NOMBRES_PESOS, vector))
+
+# ========================================
+# TUNER CLASS
+# ========================================
+
+class Afinador:
+    """
+    Cross-entropy weight search with raced evaluation on a process pool.
+
+    The whole search state (settings, Gaussian, best candidate, history) is
+    a plain dict, so it is written to and read back from the checkpoint as
+    is. Generation g draws its candidates and game seeds from
+    random.Random("<semilla>:<g>"), so a resumed run continues exactly like
+    an uninterrupted one.
+    """
+
+    def __init__(self, semilla=0, poblacion=POBLACION, partidas=PARTIDAS,
+                 partidas_por_ronda=PARTIDAS_POR_RONDA, piezas_maximas=PIEZAS_MAXIMAS,
+                 procesos=None, checkpoint=None):
+        """
+        Prepare the search (nothing runs until ejecutar()).
+
+        Args:
+            semilla (int): Seed of the whole search
+            poblacion (int): Candidates per generation
+            partidas (int): Seeded games per candidate
+            partidas_por_ronda (int): Games between two early-termination checks
+            piezas_maximas (int): Pieces per game
+            procesos (int): Worker processes (None = one per core)
+            checkpoint (str): Optional checkpoint path, resumed if it exists
+
+        Raises:
+            ValueError: If the checkpoint was written with other settings
+        """
+        self.poblacion = poblacion
+        self.partidas = partidas
+        self.partidas_por_ronda = partidas_por_ronda
+        self.piezas_maximas = piezas_maximas
+        self.procesos = procesos or os.cpu_count()
+        self.checkpoint = checkpoint
+        # Everything that changes the results; a resume must use the same
+        ajustes = {
+            "semilla": semilla,
+            "poblacion": poblacion,
+            "partidas": partidas,
+            "partidas_por_ronda": partidas_por_ronda,
+            "piezas_maximas": piezas_maximas,
+        }
+        self.estado = {
+            "ajustes": ajustes,
+            "generacion": 0,
+            "media": normalizar([PESOS_POR_DEFECTO[nombre] for nombre in NOMBRES_PESOS]),
+            "desviacion": [DESVIACION_INICIAL] * len(NOMBRES_PESOS),
+            "mejor": None,             # {"pesos", "lineas", "generacion"}
+            "historial": [],           # One summary per generation
+        }
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as archivo:
+                guardado = json.load(archivo)
+            if guardado.get("ajustes") != ajustes:
+                raise ValueError("checkpoint %s was written with settings %s, not %s"
+                                 % (checkpoint, guardado.get("ajustes"), ajustes))
+            self.estado = guardado
+
+    # ========================================
+    # RACED EVALUATION
+    # ========================================
+
+    def evaluar(self, ejecutor, candidatos, semillas):
+        """
+        Play every candidate on the same seeds, cutting off hopeless ones.
+
+        Args:
+            ejecutor (concurrent.futures.Executor): Pool running the games
+            candidatos (list): Weight vectors
+            semillas (list): Game seeds shared by every candidate
+
+        Returns:
+            tuple: (mean lines per candidate, games played per candidate)
+        """
+        lineas = [[] for _ in candidatos]
+        activos = list(range(len(candidatos)))
+        elite = max(1, int(len(candidatos) * FRACCION_ELITE))
+        for inicio in range(0, len(semillas), self.partidas_por_ronda):
+            ronda = semillas[inicio:inicio + self.partidas_por_ronda]
+            futuros = {ejecutor.submit(jugar_partida, a_pesos(candidatos[indice]), semilla,
+                                       self.piezas_maximas): indice
+                       for indice in activos for semilla in ronda}
+            for futuro in concurrent.futures.as_completed(futuros):
+                lineas[futuros[futuro]].append(futuro.result())
+
+            # Racing: drop the candidates far below the elite cutoff
+            medias = {indice: sum(lineas[indice]) / len(lineas[indice]) for indice in activos}
+            corte = sorted(medias.values(), reverse=True)[min(elite, len(medias)) - 1]
+            activos = [indice for indice in activos if medias[indice] >= CORTE_CARRERA * corte]
+
+        return ([sum(valores) / len(valores) for valores in lineas],
+                [len(valores) for valores in lineas])
+
+    # ========================================
+    # GENERATIONS
+    # ========================================
+
+    def generacion(self, ejecutor):
+        """
+        Run one generation: sample, evaluate, update the Gaussian.
+
+        Returns:
+            dict: Summary of the generation (also appended to the history)
+        """
+        estado = self.estado
+        inicio = time.perf_counter()
+        generador = random.Random("%d:%d" % (estado["ajustes"]["semilla"], estado["generacion"]))
+        candidatos = [normalizar([generador.gauss(media, desviacion)
+                                  for media, desviacion in zip(estado["media"], estado["desviacion"])])
+                      for _ in range(self.poblacion)]
+        candidatos[0] = list(estado["media"])   # The current mean is always re-evaluated
+        semillas = [generador.getrandbits(32) for _ in range(self.partidas)]
+
+        medias, jugadas = self.evaluar(ejecutor, candidatos, semillas)
+
+        # Only fully evaluated candidates can join the elite
+        orden = sorted(range(len(candidatos)),
+                       key=lambda indice: (jugadas[indice] == self.partidas, medias[indice]),
+                       reverse=True)
+        elite = [candidatos[indice] for indice in orden[:max(1, int(self.poblacion * FRACCION_ELITE))]]
+        dimensiones = range(len(NOMBRES_PESOS))
+        estado["media"] = normalizar([sum(vector[d] for vector in elite) / len(elite) for d in dimensiones])
+        estado["desviacion"] = [max(DESVIACION_MINIMA, math.sqrt(
+            sum((vector[d] - estado["media"][d]) ** 2 for vector in elite) / len(elite)))
+            for d in dimensiones]
+
+        ganador = orden[0]
+        if estado["mejor"] is None or medias[ganador] > estado["mejor"]["lineas"]:
+            estado["mejor"] = {"pesos": a_pesos(candidatos[ganador]), "lineas": medias[ganador],
+                               "generacion": estado["generacion"]}
+
+        resumen = {
+            "generacion": estado["generacion"],
+            "mejor_lineas": medias[ganador],
+            "media_elite_lineas": sum(medias[indice] for indice in orden[:len(elite)]) / len(elite),
+            "partidas": sum(jugadas),
+            "partidas_ahorradas": self.partidas * self.poblacion - sum(jugadas),
+            "segundos": time.perf_counter() - inicio,
+        }
+        estado["historial"].append(resumen)
+        estado["generacion"] += 1
+        return resumen
+
+    def guardar(self):
+        """Write the checkpoint atomically (a crash never leaves half a file)."""
+        if not self.checkpoint:
+            return
+        temporal = self.checkpoint + ".tmp"
+        with open(temporal, "w") as archivo:
+            json.dump(self.estado, archivo, indent=2)
+        os.replace(temporal, self.checkpoint)
+
+    def ejecutar(self, generaciones, informar=print):
+        """
+        Run until `generaciones` generations are done (counting resumed ones).
+
+        Args:
+            generaciones (int): Total number of generations
+            informar: Called with the summary of every generation
+
+        Returns:
+            dict: Best candidate found {"pesos", "lineas", "generacion"}
+        """
+        with concurrent.futures.ProcessPoolExecutor(self.procesos) as ejecutor:
+            while self.estado["generacion"] < generaciones:
+                informar(self.generacion(ejecutor))
+                self.guardar()
+        return self.estado["mejor"]
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tune the Tetris bot evaluation weights")
+    parser.add_argument("--generations", type=int, default=20, help="total generations")
+    parser.add_argument("--population", type=int, default=POBLACION, help="candidates per generation")
+    parser.add_argument("--games", type=int, default=PARTIDAS, help="seeded games per candidate")
+    parser.add_argument("--round-games", type=int, default=PARTIDAS_POR_RONDA,
+                        help="games between two early-termination checks")
+    parser.add_argument("--max-pieces", type=int, default=PIEZAS_MAXIMAS, help="pieces per game")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the search")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="JSON checkpoint written every generation and resumed if present")
+    opciones = parser.parse_args()
+
+    try:
+        afinador = Afinador(opciones.seed, opciones.population, opciones.games, opciones.round_games,
+                            opciones.max_pieces, opciones.workers, opciones.checkpoint)
+    except ValueError as error:
+        parser.error(str(error))
+    mejor = afinador.ejecutar(opciones.generations,
+                              informar=lambda resumen: print(json.dumps(resumen), flush=True))
+    print(json.dumps(mejor, indent=2))
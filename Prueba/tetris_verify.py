@@ -0,0 +1,447 @@
+"""
+========================================
+DIFFERENTIAL VERIFICATION HARNESS
+========================================
+
+This file checks optimized Tetris engines against the original list-based
+rules kept in tetris_reference.py:
+
+- Random sequences are generated from a seed (one seed per sequence, so any
+  sequence can be regenerated on its own): piece types, actions and a few
+  rows of "garbage" (full rows with one hole) at the bottom of the starting
+  board, so line clears happen often even with random play
+- Each sequence is played step by step by the reference and by the engine
+  under test, fed the same piece types
+- After every step the full state is compared: board with the active piece
+  stamped in, piece pose (type, rotation, x, y), lines, pieces, game over
+- The first divergence is shrunk to a minimal action list (removing actions
+  while the engines still disagree) and reported with both boards and a
+  --replay argument that reproduces it
+
+Engines:
+- juego: JuegoTetris from tetris.py (uint8 board, NumPy line clearing)
+- lote: BatchedTetris from tetris_batch.py (all sequences of a round in one
+  batch; lost games are reset automatically, as in training)
+
+A new engine is added by writing an adapter with the same three methods as
+MotorJuego (see MOTORES).
+
+Usage:
+    python tetris_verify.py --sequences 100000 --steps 300
+    python tetris_verify.py --engine lote --batch 512 --seed 7
+    python tetris_verify.py --replay '{"motor": "juego", "tipos": [...], ...}'
+
+Author: Game Implementation
+Purpose: Trust optimized engines only after they match the reference rules
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import argparse     # Command line options
+import collections  # Sequence records
+import json         # Reproducer input and output
+import random       # Seeded action and piece sequences
+import sys          # Exit status
+import time         # Throughput report
+
+import numpy as np  # Batch actions
+from tetris import (ALTO_TABLERO, ANCHO_TABLERO, FORMAS_PIEZAS, COLORES_PIEZAS, NEGRO,
+                    JuegoTetris, tablero_con_pieza, tabla_zobrist, hash_fila)
+from tetris_batch import BatchedTetris, NOMBRES_ACCIONES, NUM_ACCIONES, aplicar_accion
+from tetris_reference import ModeloReferencia
+
+# ========================================
+# VERIFICATION CONFIGURATION CONSTANTS
+# ========================================
+
+PASOS_POR_SECUENCIA = 200    # Default actions per sequence
+TAMANO_LOTE = 256            # Default sequences per BatchedTetris round
+FILAS_BASURA_MAX = ALTO_TABLERO // 2   # Most garbage rows on a starting board
+
+# ========================================
+# SEEDED SEQUENCES
+# ========================================
+
+# One test case, JSON-serializable as is (used by --replay):
+# - tipos: piece types in spawn order
+# - basura: starting bottom rows (lists of cell ids, top to bottom)
+# - acciones: one action code per step
+Secuencia = collections.namedtuple("Secuencia", ["tipos", "basura", "acciones"])
+
+def generar_secuencia(semilla, pasos):
+    """
+    Build one random sequence.
+
+    Every step spawns at most two pieces (a lock, then an automatic reset
+    if the game is lost), so 2 * pasos + 1 types are always enough.
+
+    Args:
+        semilla (int): Sequence seed
+        pasos (int): Number of actions
+
+    Returns:
+        Secuencia: Piece types, garbage rows and actions
+    """
+    generador = random.Random(semilla)
+    tipos = [generador.randrange(len(FORMAS_PIEZAS)) for _ in range(2 * pasos + 1)]
+    basura = []
+    for _ in range(generador.randint(0, FILAS_BASURA_MAX)):
+        fila = [generador.randint(1, len(FORMAS_PIEZAS)) for _ in range(ANCHO_TABLERO)]
+        fila[generador.randrange(ANCHO_TABLERO)] = 0
+        basura.append(fila)
+    acciones = [generador.randrange(NUM_ACCIONES) for _ in range(pasos)]
+    return Secuencia(tipos, basura, acciones)
+
+def tablero_referencia(basura):
+    """Starting board for ModeloReferencia: color tuples with garbage at the bottom."""
+    colores = [NEGRO] + COLORES_PIEZAS
+    vacias = ALTO_TABLERO - len(basura)
+    return ([[NEGRO] * ANCHO_TABLERO for _ in range(vacias)]
+            + [[colores[celda] for celda in fila] for fila in basura])
+
+class SecuenciaTipos:
+    """
+    Piece generator that replays a fixed list of types.
+
+    Has the randint() method nueva_pieza() expects from its generator, so
+    it can replace JuegoTetris.generador.
+    """
+
+    def __init__(self, tipos):
+        self.tipos = tipos
+        self.usados = 0      # Types handed out so far
+
+    def siguiente(self):
+        """Return the next piece type."""
+        tipo = self.tipos[self.usados]
+        self.usados += 1
+        return tipo
+
+    def randint(self, inicio, fin):
+        """random.randint() replacement: ignore the range, replay the list."""
+        return self.siguiente()
+
+    def getstate(self):
+        """random.Random.getstate() replacement (used by snapshot())."""
+        return self.usados
+
+    def setstate(self, estado):
+        """random.Random.setstate() replacement (used by restore())."""
+        self.usados = estado
+
+# ========================================
+# ENGINE ADAPTERS
+# ========================================
+
+# Every adapter plays several sequences at once:
+# - __init__(secuencias): list of Secuencia, only tipos and basura are used
+# - paso(acciones): one action per sequence, returns a game over flag per
+#   sequence (lost games are reset when `reinicia_al_perder`, left finished
+#   otherwise)
+# - estado(i): state of sequence i in the format of ModeloReferencia.estado()
+
+class MotorJuego:
+    """One JuegoTetris per sequence."""
+
+    reinicia_al_perder = False
+
+    def __init__(self, secuencias):
+        self.juegos = []
+        for secuencia in secuencias:
+            juego = JuegoTetris()
+            juego.generador = SecuenciaTipos(secuencia.tipos)
+            juego.reiniciar()               # Spawn the first piece from the list
+            if secuencia.basura:
+                poner_basura(juego, secuencia.basura)
+            self.juegos.append(juego)
+
+    def paso(self, acciones):
+        terminados = []
+        for juego, accion in zip(self.juegos, acciones):
+            if not juego.terminado:
+                aplicar_accion(juego, accion)
+            terminados.append(juego.terminado)
+        return terminados
+
+    def estado(self, i):
+        juego = self.juegos[i]
+        pieza = juego.pieza_actual
+        filas = tablero_con_pieza(juego.tablero, pieza)
+        return (tuple(map(tuple, filas.tolist())), (pieza.forma_idx, pieza.rotacion, pieza.x, pieza.y),
+                juego.lineas, juego.piezas)
+
+def poner_basura(juego, basura):
+    """
+    Write garbage rows into a JuegoTetris through restore(), so its row
+    cache and Zobrist hashes stay consistent with the board.
+    """
+    tablero = juego.tablero.copy()
+    tablero[len(tablero) - len(basura):] = basura
+    zobrist = tabla_zobrist(*tablero.shape)
+    hash_filas = tuple(hash_fila(zobrist, tablero, fila) for fila in range(len(tablero)))
+    hash_tablero = 0
+    for valor in hash_filas:
+        hash_tablero ^= valor
+    estado = juego.snapshot()._replace(filas=tuple(fila.tobytes() for fila in tablero),
+                                       hash_tablero=hash_tablero, hash_filas=hash_filas,
+                                       tope=None)
+    juego.restore(estado)
+
+class MotorLote:
+    """All sequences in one BatchedTetris, one game per sequence."""
+
+    reinicia_al_perder = True
+
+    def __init__(self, secuencias):
+        self.secuencias = [SecuenciaTipos(secuencia.tipos) for secuencia in secuencias]
+        self.lote = BatchedTetris(len(secuencias))
+
+        # Spawns draw from each sequence's own list instead of the batch rng
+        generar = self.lote._generar
+        def generar_desde_listas(indices):
+            generar(indices)
+            tipos = np.array([self.secuencias[i].siguiente() for i in indices], dtype=np.int16)
+            self.lote.tipos[indices] = tipos
+            self.lote.xs[indices] = self.lote._x_inicial[tipos]
+        self.lote._generar = generar_desde_listas
+        self.lote.reset()
+        for i, secuencia in enumerate(secuencias):
+            if secuencia.basura:
+                self.lote.tableros[i, self.lote.alto - len(secuencia.basura):] = secuencia.basura
+
+    def paso(self, acciones):
+        _, _, terminados, _ = self.lote.step(np.asarray(acciones))
+        return terminados.tolist()
+
+    def estado(self, i):
+        lote = self.lote
+        indice = np.array([i])
+        filas = lote.tableros[i].copy()
+        bloques_y, bloques_x = lote._celdas(indice)
+        visibles = (bloques_y >= 0) & (bloques_y < lote.alto)
+        filas[bloques_y[visibles], bloques_x[visibles]] = lote.tipos[i] + 1
+        return (tuple(map(tuple, filas.tolist())),
+                (int(lote.tipos[i]), int(lote.rotaciones[i]), int(lote.xs[i]), int(lote.ys[i])),
+                int(lote.lineas[i]), int(lote.piezas[i]))
+
+MOTORES = {
+    "juego": MotorJuego,
+    "lote": MotorLote,
+}
+
+# ========================================
+# LOCKSTEP COMPARISON
+# ========================================
+
+def comparar(nombre_motor, secuencias):
+    """
+    Play sequences on the reference and on an engine and compare every step.
+
+    Args:
+        nombre_motor (str): Key of MOTORES
+        secuencias (list): Secuencia records (actions all the same length)
+
+    Returns:
+        dict: First divergence (sequence index, step, field, expected and
+            actual values), or None when the engine matched everywhere
+    """
+    clase_motor = MOTORES[nombre_motor]
+    motor = clase_motor(secuencias)
+    tipos = [SecuenciaTipos(secuencia.tipos) for secuencia in secuencias]
+    referencias = [ModeloReferencia(tipos[i].siguiente, tablero_referencia(secuencia.basura))
+                   for i, secuencia in enumerate(secuencias)]
+    activas = set(range(len(secuencias)))
+
+    divergencia = verificar_estados(motor, referencias, activas, paso=-1)
+    pasos = len(secuencias[0].acciones) if secuencias else 0
+    for paso in range(pasos):
+        if divergencia or not activas:
+            break
+        acciones = [secuencia.acciones[paso] for secuencia in secuencias]
+        for i in activas:
+            referencias[i].paso(acciones[i])
+        terminados = motor.paso(acciones)
+
+        for i in sorted(activas):
+            if terminados[i] != referencias[i].terminado:
+                return {"secuencia": i, "paso": paso, "campo": "terminado",
+                        "esperado": referencias[i].terminado, "obtenido": terminados[i]}
+            if referencias[i].terminado:
+                if clase_motor.reinicia_al_perder:
+                    referencias[i] = ModeloReferencia(tipos[i].siguiente)
+                else:
+                    activas.discard(i)
+        divergencia = verificar_estados(motor, referencias, activas, paso)
+    return divergencia
+
+def verificar_estados(motor, referencias, activas, paso):
+    """Compare every active sequence; return the first difference or None."""
+    campos = ("tablero", "pieza", "lineas", "piezas")
+    for i in sorted(activas):
+        esperado = referencias[i].estado()
+        obtenido = motor.estado(i)
+        for campo, valor_esperado, valor_obtenido in zip(campos, esperado, obtenido):
+            if valor_esperado != valor_obtenido:
+                return {"secuencia": i, "paso": paso, "campo": campo,
+                        "esperado": esperado, "obtenido": obtenido}
+    return None
+
+# ========================================
+# SHRINKING AND REPORTING
+# ========================================
+
+def reducir(nombre_motor, secuencia):
+    """
+    Shrink a diverging sequence to a minimal one.
+
+    Drops every action after the divergence, then removes chunks of actions
+    (halving the chunk size down to single actions) and garbage rows as
+    long as the engine still disagrees with the reference. Piece types stay
+    the same list.
+
+    Args:
+        nombre_motor (str): Key of MOTORES
+        secuencia (Secuencia): Diverging sequence
+
+    Returns:
+        tuple: (minimal Secuencia, its divergence), divergence None when the
+            sequence only diverges next to other sequences of its batch
+    """
+    divergencia = comparar(nombre_motor, [secuencia])
+    if divergencia is None:
+        return secuencia, None
+
+    def probar(candidata):
+        """Keep the candidate (cut after its divergence) if it still diverges."""
+        nonlocal secuencia, divergencia
+        resultado = comparar(nombre_motor, [candidata])
+        if resultado is None:
+            return False
+        secuencia = candidata._replace(acciones=candidata.acciones[:resultado["paso"] + 1])
+        divergencia = resultado
+        return True
+
+    probar(secuencia)
+    trozo = max(1, len(secuencia.acciones) // 2)
+    while True:
+        inicio = 0
+        while inicio < len(secuencia.acciones):
+            acciones = secuencia.acciones
+            if not probar(secuencia._replace(acciones=acciones[:inicio] + acciones[inicio + trozo:])):
+                inicio += trozo
+        if trozo == 1:
+            break
+        trozo //= 2
+
+    # Garbage rows, topmost first
+    while secuencia.basura and probar(secuencia._replace(basura=secuencia.basura[1:])):
+        pass
+    return secuencia, divergencia
+
+def texto_tablero(filas):
+    """Board rows as text: '.' for empty cells, piece id otherwise."""
+    return ["".join(str(celda) if celda else "." for celda in fila) for fila in filas]
+
+def informe_divergencia(nombre_motor, semilla, secuencia, divergencia):
+    """
+    Shrink a divergence and describe it.
+
+    Returns:
+        dict: JSON-serializable report with the reproducer
+    """
+    minima, reducida = reducir(nombre_motor, secuencia)
+    if reducida is not None:
+        divergencia = reducida
+    minima = minima._replace(tipos=minima.tipos[:2 * len(minima.acciones) + 1])
+    informe = {
+        "motor": nombre_motor,
+        "semilla": semilla,
+        "paso": divergencia["paso"],
+        "campo": divergencia["campo"],
+        "acciones": [NOMBRES_ACCIONES[accion] for accion in minima.acciones],
+        "basura": texto_tablero(minima.basura),
+        "reproducir": json.dumps(dict(minima._asdict(), motor=nombre_motor)),
+    }
+    esperado, obtenido = divergencia["esperado"], divergencia["obtenido"]
+    if divergencia["campo"] == "terminado":
+        informe["esperado"], informe["obtenido"] = esperado, obtenido
+    else:
+        informe["esperado"] = {"tablero": texto_tablero(esperado[0]), "pieza": esperado[1],
+                               "lineas": esperado[2], "piezas": esperado[3]}
+        informe["obtenido"] = {"tablero": texto_tablero(obtenido[0]), "pieza": obtenido[1],
+                               "lineas": obtenido[2], "piezas": obtenido[3]}
+    return informe
+
+# ========================================
+# VERIFICATION RUN
+# ========================================
+
+def verificar(nombre_motor, secuencias, pasos=PASOS_POR_SECUENCIA, semilla=0, lote=TAMANO_LOTE):
+    """
+    Run seeded random sequences until the first divergence.
+
+    Sequence n uses seed `semilla + n`. JuegoTetris sequences are compared
+    one at a time, BatchedTetris sequences `lote` at a time in one batch.
+
+    Args:
+        nombre_motor (str): Key of MOTORES
+        secuencias (int): Number of sequences
+        pasos (int): Actions per sequence
+        semilla (int): Seed of the first sequence
+        lote (int): Sequences per round for batched engines
+
+    Returns:
+        dict: Summary with "secuencias", "pasos", "segundos" and, when the
+            engine diverged, "divergencia" (see informe_divergencia())
+    """
+    por_ronda = lote if MOTORES[nombre_motor].reinicia_al_perder else 1
+    inicio = time.perf_counter()
+    resumen = {"motor": nombre_motor, "secuencias": 0, "pasos": 0}
+    for primera in range(semilla, semilla + secuencias, por_ronda):
+        semillas = list(range(primera, min(primera + por_ronda, semilla + secuencias)))
+        generadas = [generar_secuencia(s, pasos) for s in semillas]
+        divergencia = comparar(nombre_motor, generadas)
+        if divergencia is not None:
+            i = divergencia["secuencia"]
+            resumen["divergencia"] = informe_divergencia(nombre_motor, semillas[i], generadas[i],
+                                                         divergencia)
+            break
+        resumen["secuencias"] += len(semillas)
+        resumen["pasos"] += len(semillas) * pasos
+    resumen["segundos"] = time.perf_counter() - inicio
+    return resumen
+
+# ========================================
+# PROGRAM ENTRY POINT
+# ========================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare optimized Tetris engines with the reference rules")
+    parser.add_argument("--engine", choices=sorted(MOTORES) + ["all"], default="all",
+                        help="engine to verify")
+    parser.add_argument("--sequences", type=int, default=1000, help="random sequences per engine")
+    parser.add_argument("--steps", type=int, default=PASOS_POR_SECUENCIA, help="actions per sequence")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first sequence")
+    parser.add_argument("--batch", type=int, default=TAMANO_LOTE, help="sequences per batched round")
+    parser.add_argument("--replay", metavar="JSON", help="replay one reported reproducer")
+    opciones = parser.parse_args()
+
+    if opciones.replay:
+        caso = json.loads(opciones.replay)
+        secuencia = Secuencia(caso["tipos"], caso["basura"], caso["acciones"])
+        divergencia = comparar(caso["motor"], [secuencia])
+        if divergencia is None:
+            print("no divergence")
+            sys.exit(0)
+        print(json.dumps(informe_divergencia(caso["motor"], None, secuencia, divergencia), indent=2))
+        sys.exit(1)
+
+    motores = sorted(MOTORES) if opciones.engine == "all" else [opciones.engine]
+    fallo = False
+    for nombre in motores:
+        resumen = verificar(nombre, opciones.sequences, opciones.steps, opciones.seed, opciones.batch)
+        print(json.dumps(resumen, indent=2))
+        fallo = fallo or "divergencia" in resumen
+    sys.exit(1 if fallo else 0)
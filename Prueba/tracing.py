@@ -0,0 +1,203 @@
+"""
+========================================
+CROSS-PROCESS TRACE-EVENT TIMELINE
+========================================
+
+This module records spans (named intervals) in the Chrome trace-event JSON
+format, so the launcher and the games it starts can be looked at as one
+timeline in chrome://tracing or https://ui.perfetto.dev:
+
+- Every process appends its events to the same file. The file uses the
+  JSON array format without the closing "]", which the trace viewers
+  accept, so processes never have to rewrite what others wrote
+- All timestamps come from the wall clock (time.time()), shared by every
+  process on the machine, so the spans of the launcher (click, spawn, spin
+  ticks) and of the game (imports, pygame init, first frame, logic and
+  render of every frame) line up without any merging step
+- Built on telemetry.py's buffered sink: recording only touches memory; a
+  background thread appends the buffered events every ARCADE_TRACE_FLUSH
+  seconds
+
+Tracing is disabled unless ARCADE_TRACE is set. get_tracer() then returns
+None and callers only pay for an `if traza:` check.
+
+Configuration:
+- ARCADE_TRACE: Trace file path (shared by the launcher and the games)
+- ARCADE_TRACE_FLUSH: Seconds between two background flushes (default 1)
+
+Usage:
+    ARCADE_TRACE=arcade-trace.json python main.py
+    (then open arcade-trace.json in https://ui.perfetto.dev)
+
+Author: Game Implementation
+Purpose: See where the time goes from a launcher click to a playable frame
+"""
+
+# ========================================
+# IMPORT STATEMENTS
+# ========================================
+
+import contextlib   # Span context manager
+import json         # Trace event serialization
+import os           # Process id and atomic file creation
+import threading    # Thread ids and names
+import time         # Shared wall clock
+import telemetry    # Buffered file sink shared with the telemetry
+
+# ========================================
+# TRACE CONFIGURATION CONSTANTS
+# ========================================
+
+CAPACIDAD_BUFFER = 65536     # Events kept in memory between two flushes
+INTERVALO_VACIADO = 1.0      # Default seconds between two flushes
+
+def ahora():
+    """
+    Current time on the clock shared by every traced process.
+
+    Returns:
+        float: Seconds since the epoch (time.time())
+    """
+    return time.time()
+
+# ========================================
+# TRACE CLASS
+# ========================================
+
+class Traza(telemetry.SalidaBuffer):
+    """
+    Buffer of trace events for one process, appended to a shared file.
+
+    completo(), tramo() and instante() only touch memory and are safe to
+    call from any thread; the file is written by a background thread.
+    """
+
+    def __init__(self, nombre, ruta, capacidad=CAPACIDAD_BUFFER, intervalo=INTERVALO_VACIADO):
+        """
+        Initialize the buffer and start the flush thread.
+
+        Args:
+            nombre (str): Process name shown on the timeline
+            ruta (str): Trace file shared by every process
+            capacidad (int): Buffer size in events
+            intervalo (float): Seconds between two background flushes
+        """
+        self.nombre = nombre
+        self.pid = os.getpid()
+        self._hilos = set()            # Threads whose name was already recorded
+        super().__init__(ruta, capacidad, intervalo, "trace")
+        self._registrar({"name": "process_name", "ph": "M", "args": {"name": nombre}})
+
+    # ========================================
+    # RECORDING (HOT PATH)
+    # ========================================
+
+    def _registrar(self, evento):
+        """Buffer one event for the current thread (naming the thread once)."""
+        tid = threading.get_native_id()
+        if tid not in self._hilos:
+            self._hilos.add(tid)
+            self._agregar({"name": "thread_name", "ph": "M", "tid": tid,
+                           "args": {"name": threading.current_thread().name}})
+        evento["tid"] = tid
+        self._agregar(evento)
+
+    def completo(self, nombre, inicio, fin=None, categoria="arcade", **argumentos):
+        """
+        Record a span that has already ended.
+
+        Args:
+            nombre (str): Span name, e.g. "render"
+            inicio (float): Start time from ahora()
+            fin (float): End time from ahora() (None = now)
+            categoria (str): Trace category (used to filter in the viewer)
+            **argumentos: JSON-serializable values shown with the span
+        """
+        if fin is None:
+            fin = ahora()
+        evento = {"name": nombre, "cat": categoria, "ph": "X", "ts": inicio * 1e6,
+                  "dur": (fin - inicio) * 1e6}
+        if argumentos:
+            evento["args"] = argumentos
+        self._registrar(evento)
+
+    @contextlib.contextmanager
+    def tramo(self, nombre, categoria="arcade", **argumentos):
+        """Context manager that records its block as a span."""
+        inicio = ahora()
+        try:
+            yield
+        finally:
+            self.completo(nombre, inicio, categoria=categoria, **argumentos)
+
+    def instante(self, nombre, categoria="arcade", **argumentos):
+        """
+        Record a point in time (a marker on the timeline).
+
+        Args:
+            nombre (str): Marker name, e.g. "first_frame"
+            categoria (str): Trace category
+            **argumentos: JSON-serializable values shown with the marker
+        """
+        evento = {"name": nombre, "cat": categoria, "ph": "i", "s": "p", "ts": ahora() * 1e6}
+        if argumentos:
+            evento["args"] = argumentos
+        self._registrar(evento)
+
+    # ========================================
+    # FLUSHING (BACKGROUND THREAD)
+    # ========================================
+
+    def _linea(self, evento):
+        """Serialize one event as an element of the JSON array."""
+        evento["pid"] = self.pid
+        return json.dumps(evento, default=str) + ",\n"
+
+    def _abrir(self):
+        """Open the trace file for appending, creating it with its "[" first."""
+        # The first process to write opens the JSON array: the file appears
+        # already holding "[" (linked into place), so no other process can
+        # append before it
+        if not os.path.exists(self.ruta):
+            temporal = "%s.%d.tmp" % (self.ruta, self.pid)
+            with open(temporal, "w") as archivo:
+                archivo.write("[\n")
+            try:
+                os.link(temporal, self.ruta)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(temporal)
+        return open(self.ruta, "a")
+
+    def close(self):
+        """Stop the flush thread and flush what is left."""
+        self.detener()
+        if self.descartados:
+            self.instante("trace_events_dropped", count=self.descartados)
+        self.vaciar()
+
+# ========================================
+# PROCESS-WIDE TRACE
+# ========================================
+
+_SIN_CREAR = object()                # get_tracer() has not run yet
+_traza_global = _SIN_CREAR
+
+def get_tracer(nombre):
+    """
+    Return the process-wide trace, creating it from the environment.
+
+    ARCADE_TRACE is only looked up on the first call; when tracing is off
+    that None answer is remembered like an enabled trace would be.
+
+    Args:
+        nombre (str): Process name shown on the timeline
+
+    Returns:
+        Traza: The trace, or None when ARCADE_TRACE is not set
+    """
+    global _traza_global
+    if _traza_global is _SIN_CREAR:
+        _traza_global = telemetry.desde_entorno(Traza, nombre, "ARCADE_TRACE", INTERVALO_VACIADO)
+    return _traza_global